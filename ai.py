@@ -0,0 +1,178 @@
+# ai.py
+
+"""
+Search-based move selection for wild monsters ("hard mode").
+
+ExpectimaxPolicy plugs into BattleEngine as a wild_policy. It searches
+the battle state (both HPs and PP per move slot) with depth-limited
+expectimax: the wild monster maximizes its win chance, critical hits
+are chance nodes, and the trainer is modeled as random_attack_policy (a
+uniformly random usable move). Damage uses the same formula as
+Monster.attack with the shared TYPE_MATRIX.
+
+Search runs with iterative deepening under a per-decision time budget
+and reuses results through a transposition table keyed on the state
+tuple, which is kept across turns of the same matchup.
+"""
+
+from typing import Dict, List, Tuple
+import time
+
+from move import Move, TYPE_MATRIX
+from monster import STRUGGLE
+
+# Crit damage multiplier used by Monster.attack
+CRIT_MULTIPLIER = 1.5
+# Nodes between deadline checks
+_CHECK_EVERY = 64
+
+State = Tuple[int, int, Tuple[int, ...], Tuple[int, ...]]
+
+
+class _Timeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+
+class ExpectimaxPolicy:
+    """
+    Wild move policy running expectimax with iterative deepening.
+
+    One depth level is a wild move followed by the trainer's reply. Leaf
+    states are scored by the HP ratio difference, mapped to [0, 1].
+    """
+
+    def __init__(self, max_depth: int = 8, time_budget: float = 0.003,
+                 table_size: int = 500_000):
+        """
+        Initialize the policy.
+
+        Args:
+            max_depth (int): Deepest iteration to attempt.
+            time_budget (float): Seconds allowed per decision.
+            table_size (int): Transposition entries kept before clearing.
+        """
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        self.table_size = table_size
+        self.table: Dict[State, Tuple[int, float]] = {}
+        self.last_depth = 0
+        self._matchup = None
+        self._deadline = 0.0
+        self._nodes = 0
+
+    def __call__(self, engine) -> Move:
+        """
+        Choose the wild monster's move for the current engine state.
+
+        Args:
+            engine (BattleEngine): Engine asking for the wild move.
+
+        Returns:
+            Move: One of the wild monster's moves, or Struggle when no
+                move has PP left.
+        """
+        wild, player = engine.wild_monster, engine.player_monster
+        usable = [k for k, mv in enumerate(wild.moves) if mv.is_usable()]
+        if len(usable) <= 1:
+            self.last_depth = 0
+            return wild.moves[usable[0]] if usable else Move.from_spec(STRUGGLE)
+        self._prepare(wild, player, engine.crit_chance)
+        state = (wild.current_hp, player.current_hp,
+                 tuple(mv.current_pp for mv in wild.moves),
+                 tuple(mv.current_pp for mv in player.moves))
+        self._deadline = time.perf_counter() + self.time_budget
+        self._nodes = 0
+        best = usable[0]
+        self.last_depth = 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                best = self._root(state, depth, best)
+            except _Timeout:
+                break
+            self.last_depth = depth
+        return wild.moves[best]
+
+    def _prepare(self, wild, player, crit_chance: float):
+        """Build damage tables, resetting the table if the matchup changed."""
+        w_specs = tuple(mv.spec for mv in wild.moves)
+        p_specs = tuple(mv.spec for mv in player.moves)
+        matchup = (wild.spec, player.spec, wild.max_hp, player.max_hp, w_specs, p_specs, crit_chance)
+        if matchup != self._matchup or len(self.table) > self.table_size:
+            self.table.clear()
+            self._matchup = matchup
+        self._crit = crit_chance
+        self._w_max, self._p_max = wild.max_hp, player.max_hp
+        # Slot -1 (the last entry) is Struggle for the wild side
+        self._w_dmg = [_damage(ms.power, ms.type_id, player.type_id)
+                       for ms in w_specs + (STRUGGLE,)]
+        self._p_dmg = [_damage(ms.power, ms.type_id, wild.type_id) for ms in p_specs]
+
+    def _root(self, state: State, depth: int, first: int) -> int:
+        """Return the best wild slot at the root, searching first first."""
+        w_pp = state[2]
+        slots = [first] + [k for k, pp in enumerate(w_pp) if pp > 0 and k != first]
+        best, best_value = first, -1.0
+        for k in slots:
+            value = self._after_wild(state, k, depth)
+            if value > best_value:
+                best, best_value = k, value
+        return best
+
+    def _decide(self, state: State, depth: int) -> float:
+        """Value (wild win chance) of a state where the wild monster moves."""
+        w_hp, p_hp, w_pp, _ = state
+        self._nodes += 1
+        if self._nodes % _CHECK_EVERY == 0 and time.perf_counter() > self._deadline:
+            raise _Timeout
+        if depth == 0:
+            return 0.5 + 0.5 * (w_hp / self._w_max - p_hp / self._p_max)
+        hit = self.table.get(state)
+        if hit is not None and hit[0] >= depth:
+            return hit[1]
+        slots = [k for k, pp in enumerate(w_pp) if pp > 0] or [-1]
+        value = max(self._after_wild(state, k, depth) for k in slots)
+        self.table[state] = (depth, value)
+        return value
+
+    def _after_wild(self, state: State, slot: int, depth: int) -> float:
+        """Expected value after the wild monster uses slot (-1: Struggle)."""
+        w_hp, p_hp, w_pp, p_pp = state
+        if slot >= 0:
+            w_pp = w_pp[:slot] + (w_pp[slot] - 1,) + w_pp[slot + 1:]
+        normal, crit = self._w_dmg[slot]
+        total = 0.0
+        for dmg, prob in _outcomes(normal, crit, self._crit):
+            hp = p_hp - dmg
+            total += prob * (1.0 if hp <= 0 else self._player_turn((w_hp, hp, w_pp, p_pp), depth))
+        return total
+
+    def _player_turn(self, state: State, depth: int) -> float:
+        """Expected value of the trainer's random reply, then the next wild turn."""
+        w_hp, p_hp, w_pp, p_pp = state
+        slots = [k for k, pp in enumerate(p_pp) if pp > 0]
+        if not slots:
+            # random_attack_policy wastes the turn when nothing has PP
+            return self._decide(state, depth - 1)
+        total = 0.0
+        for k in slots:
+            pp = p_pp[:k] + (p_pp[k] - 1,) + p_pp[k + 1:]
+            normal, crit = self._p_dmg[k]
+            for dmg, prob in _outcomes(normal, crit, self._crit):
+                hp = w_hp - dmg
+                total += prob * (0.0 if hp <= 0 else self._decide((hp, p_hp, w_pp, pp), depth - 1))
+        return total / len(slots)
+
+
+def _damage(power: int, move_type: int, defender_type: int) -> Tuple[int, int]:
+    """Return (normal, critical) damage as computed by Monster.attack."""
+    if power <= 0:
+        return (0, 0)
+    mult = TYPE_MATRIX[move_type][defender_type]
+    return (int(power * mult * 1.0), int(power * mult * CRIT_MULTIPLIER))
+
+
+def _outcomes(normal: int, crit: int, crit_chance: float) -> List[Tuple[int, float]]:
+    """Damage outcomes with probabilities, merged when a crit changes nothing."""
+    if normal == crit:
+        return [(normal, 1.0)]
+    return [(normal, 1.0 - crit_chance), (crit, crit_chance)]
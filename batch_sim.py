@@ -0,0 +1,252 @@
+# batch_sim.py
+
+"""
+Vectorized batch battle simulator for Monster Trainer Game.
+
+Runs many auto-battles at once as NumPy arrays (HP and PP per move slot
+for every encounter) using the same rules as BattleEngine driven by
+random_attack_policy: the player attacks with a random usable move, the
+wild monster answers with choose_move_random (Struggle when out of PP),
+damage is int(power * type multiplier * crit multiplier).
+
+NumPy is an optional dependency; importing this module works without it,
+but constructing a simulator raises ImportError.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from monster import Monster
+from move import Move, type_matrix_array
+from battle import CRITICAL_CHANCE
+from rng import GameRNG
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# Struggle fallback used by Monster.choose_move_random
+STRUGGLE_POWER = 4
+STRUGGLE_TYPE = "Normal"
+CRIT_MULTIPLIER = 1.5
+DEFAULT_MAX_TURNS = 1000
+
+_STRUGGLE = Move("Struggle", power=STRUGGLE_POWER, max_pp=1, type_=STRUGGLE_TYPE)
+
+
+class _Side:
+    """
+    Static per-pair tables for one attacking side of the batch.
+
+    Damage only depends on (pair, move slot, critical), so it is computed
+    once per matchup from move power, interned type IDs and the shared
+    type matrix; the extra last slot holds the Struggle fallback.
+    """
+
+    def __init__(self, attackers: Sequence[Monster], defenders: Sequence[Monster]):
+        slots = max(1, max(len(m.get_moves()) for m in attackers))
+        n = len(attackers)
+        self.slots = slots
+        self.max_hp = np.array([m.max_hp for m in attackers], dtype=np.int32)
+        self.max_pp = np.zeros((n, slots), dtype=np.int32)
+        power = np.zeros((n, slots + 1), dtype=np.float64)
+        move_type = np.full((n, slots + 1), _STRUGGLE.type_id, dtype=np.intp)
+        power[:, slots] = STRUGGLE_POWER
+        for i, att in enumerate(attackers):
+            for k, mv in enumerate(att.get_moves()):
+                self.max_pp[i, k] = mv.max_pp
+                power[i, k] = max(0, mv.power)
+                move_type[i, k] = mv.type_id
+        defender_type = np.array([m.type_id for m in defenders], dtype=np.intp)
+        mult = type_matrix_array()[move_type, defender_type[:, None]]
+        # Same evaluation order as Monster.attack: int(base * type_mult * crit_mult)
+        self.damage = np.stack([np.trunc(power * mult * 1.0),
+                                np.trunc(power * mult * CRIT_MULTIPLIER)],
+                               axis=2).astype(np.int32)
+
+
+class BatchBattleSimulator:
+    """
+    Simulates many wild encounters concurrently with NumPy arrays.
+
+    Each pair (player_monster, wild_monster) is played trials times;
+    encounters always start from full HP/PP like BattleEngine does.
+    """
+
+    def __init__(self, pairs: Sequence[Tuple[Monster, Monster]],
+                 crit_chance: float = CRITICAL_CHANCE):
+        """
+        Initialize the simulator.
+
+        Args:
+            pairs (Sequence[Tuple[Monster, Monster]]): Matchups to simulate.
+            crit_chance (float): Critical hit probability for both sides.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            ValueError: If pairs is empty.
+        """
+        if np is None:
+            raise ImportError("BatchBattleSimulator requires NumPy (pip install numpy)")
+        if not pairs:
+            raise ValueError("pairs must not be empty")
+        self.pairs = list(pairs)
+        self.crit_chance = float(crit_chance)
+        players = [p for p, _ in self.pairs]
+        wilds = [w for _, w in self.pairs]
+        self._player = _Side(players, wilds)
+        self._wild = _Side(wilds, players)
+
+    def run(self, trials: int, seed: Optional[int] = None,
+            max_turns: int = DEFAULT_MAX_TURNS) -> List[Dict]:
+        """
+        Run trials encounters for every pair.
+
+        Args:
+            trials (int): Encounters per pair.
+            seed (int | GameRNG): Optional seed for the NumPy generator, or a
+                GameRNG stream whose NumPy generator is used.
+            max_turns (int): Turn cap; unfinished encounters count as timeouts.
+
+        Returns:
+            List[Dict]: One result per pair with keys:
+                - trials, wins, losses, timeouts (int)
+                - win_rate, mean_turns (float)
+                - turns (np.ndarray): histogram of finishing turn numbers
+        """
+        trials = int(trials)
+        rng = seed.numpy() if isinstance(seed, GameRNG) else np.random.default_rng(seed)
+        n_pairs = len(self.pairs)
+        ps, ws = self._player, self._wild
+        # Random draws are 32-bit integers; a crit is a draw below this threshold
+        crit_threshold = np.uint32(min((1 << 32) - 1, round(self.crit_chance * (1 << 32))))
+
+        # State of the encounters still in the arrays; PP is stored slot-major
+        # (slots x encounters) so per-slot work stays contiguous.
+        ids = np.arange(n_pairs * trials)
+        rows = np.repeat(np.arange(n_pairs), trials)
+        p_hp = ps.max_hp[rows]
+        w_hp = ws.max_hp[rows]
+        p_pp = np.ascontiguousarray(ps.max_pp[rows].T)
+        w_pp = np.ascontiguousarray(ws.max_pp[rows].T)
+        p_dmg = ps.damage.ravel()
+        w_dmg = ws.damage.ravel()
+        p_base = (rows * (2 * (ps.slots + 1))).astype(np.int32)
+        w_base = (rows * (2 * (ws.slots + 1))).astype(np.int32)
+        running = np.ones(ids.size, dtype=bool)
+        n_running = ids.size
+
+        outcome = np.zeros(ids.size, dtype=np.int8)   # 1 win, -1 loss, 0 unfinished
+        finish_turn = np.zeros(ids.size, dtype=np.int64)
+
+        turn = 1
+        while n_running and turn <= max_turns:
+            draws = rng.bit_generator.random_raw(2 * ids.size).view(np.uint32).reshape(4, -1)
+
+            # Player attack with a random usable move (slot 0 if none: wasted turn)
+            slot, has_pp = _use_random_slot(p_pp, draws[0], None)
+            crit = draws[1] < crit_threshold
+            w_hp -= p_dmg[p_base + 2 * slot + crit] * has_pp
+            won = w_hp <= 0
+
+            # Wild reply: random usable move, Struggle when out of PP
+            slot, has_pp = _use_random_slot(w_pp, draws[2], won)
+            slot = np.where(has_pp, slot, ws.slots)
+            crit = draws[3] < crit_threshold
+            p_hp -= w_dmg[w_base + 2 * slot + crit] * ~won
+            lost = p_hp <= 0
+
+            # Finished encounters stay in the arrays (inert) until enough of
+            # them pile up to make compaction worthwhile.
+            done = (won | lost) & running
+            if done.any():
+                finished = ids[done]
+                outcome[finished] = np.where(won[done], 1, -1)
+                finish_turn[finished] = turn
+                running &= ~done
+                n_running -= finished.size
+                if n_running < 0.75 * ids.size:
+                    keep = running
+                    ids, running = ids[keep], running[keep]
+                    p_base, w_base = p_base[keep], w_base[keep]
+                    p_hp, w_hp = p_hp[keep], w_hp[keep]
+                    p_pp, w_pp = p_pp[:, keep], w_pp[:, keep]
+            turn += 1
+
+        results = []
+        for i in range(n_pairs):
+            # Encounters of pair i occupy one contiguous block of ids
+            out = outcome[i * trials:(i + 1) * trials]
+            done = finish_turn[i * trials:(i + 1) * trials][out != 0]
+            wins = int((out == 1).sum())
+            losses = int((out == -1).sum())
+            results.append({
+                "trials": trials,
+                "wins": wins,
+                "losses": losses,
+                "timeouts": trials - wins - losses,
+                "win_rate": wins / max(1, trials),
+                "mean_turns": float(done.mean()) if done.size else 0.0,
+                "turns": np.bincount(done, minlength=1),
+            })
+        return results
+
+
+def _use_random_slot(pp: "np.ndarray", draw: "np.ndarray",
+                     skip) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Pick a uniformly random usable slot per encounter and spend 1 PP on it.
+
+    Args:
+        pp (np.ndarray): Slot-major PP table, updated in place.
+        draw (np.ndarray): Uniform 32-bit draws, one per encounter.
+        skip (np.ndarray): Optional mask of encounters that do not act.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (slot index, encounter had a usable move).
+    """
+    usable = pp > 0
+    if usable.all():
+        # Fast path while every slot still has PP: k is the slot itself
+        slot = ((draw >> 8) * np.uint32(pp.shape[0]) >> 24).astype(np.int32)
+        for s in range(pp.shape[0]):
+            hit = slot == s
+            pp[s] -= hit if skip is None else hit & ~skip
+        return slot, np.ones(pp.shape[1], dtype=bool)
+    count = usable[0].astype(np.int8)
+    for s in range(1, pp.shape[0]):
+        count += usable[s]
+    # Top 24 bits scaled by count give k uniform in [0, count)
+    k = (((draw >> 8) * count.astype(np.uint32)) >> 24).astype(np.int8)
+    has_pp = count > 0
+    spend = has_pp if skip is None else has_pp & ~skip
+    slot = np.zeros(pp.shape[1], dtype=np.int32)
+    seen = np.zeros(pp.shape[1], dtype=np.int8)
+    for s in range(pp.shape[0]):
+        # Slot s is chosen when it is the k-th usable slot
+        hit = usable[s] & (seen == k)
+        if s:
+            slot += hit * s
+        pp[s] -= hit & spend
+        seen += usable[s]
+    return slot, has_pp
+
+
+def simulate_matchup(player_monster: Monster, wild_monster: Monster, trials: int,
+                     seed: Optional[int] = None,
+                     crit_chance: float = CRITICAL_CHANCE) -> Dict:
+    """
+    Convenience wrapper simulating a single matchup.
+
+    Args:
+        player_monster (Monster): Player side.
+        wild_monster (Monster): Wild side.
+        trials (int): Number of encounters.
+        seed (int | GameRNG): Optional RNG seed or stream.
+        crit_chance (float): Critical hit probability.
+
+    Returns:
+        Dict: Result dict as returned by BatchBattleSimulator.run.
+    """
+    sim = BatchBattleSimulator([(player_monster, wild_monster)], crit_chance=crit_chance)
+    return sim.run(trials, seed=seed)[0]
@@ -0,0 +1,263 @@
+# battle.py
+
+"""
+Headless battle engine for Monster Trainer Game.
+
+Resolves wild encounters turn by turn without any terminal I/O and
+reports what happened as structured event dicts, so battles can be
+simulated in bulk or rendered by the interactive game loop.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+import random
+
+from monster import Monster
+from move import Move
+from item import Item
+
+# Constants for gameplay mechanics
+CRITICAL_CHANCE = 0.10
+RUN_SUCCESS_BASE = 0.70
+
+# Action kinds accepted by BattleEngine.step
+ATTACK = "attack"
+ITEM = "item"
+RUN = "run"
+
+# Encounter results
+WIN = "win"
+LOSS = "loss"
+RAN_AWAY = "ran_away"
+CAPTURED = "captured"
+
+# Side labels used in events
+PLAYER_SIDE = "player"
+WILD_SIDE = "wild"
+
+
+def try_to_run(player_monster: Monster, wild_monster: Monster, rng=None) -> bool:
+    """Compute run success using base and level modifier (rng defaults to random)."""
+    base = RUN_SUCCESS_BASE
+    level_diff = wild_monster.level - player_monster.level
+    modifier = 0.05 * level_diff
+    chance = max(0.1, min(0.95, base - modifier))
+    return (random if rng is None else rng).random() < chance
+
+
+def calculate_capture_chance(wild: Monster, used_item: Item) -> float:
+    """Calculate simple capture probability depending on HP ratio and item."""
+    hp_ratio = wild.effective_hp_ratio()
+    base_chance = 0.35
+    chance = base_chance + (1.0 - hp_ratio) * 0.50
+    if not used_item.is_capture_item():
+        chance *= 0.1
+    return max(0.01, min(0.95, chance))
+
+
+def random_attack_policy(engine: "BattleEngine") -> Tuple:
+    """
+    Action policy that attacks with a random usable move.
+
+    Falls back to the first move slot when nothing has PP left, which
+    wastes the turn exactly like an interactive player would.
+
+    Args:
+        engine (BattleEngine): Engine asking for the next action.
+
+    Returns:
+        Tuple: An ATTACK action.
+    """
+    moves = engine.player_monster.get_moves()
+    usable = [i for i, mv in enumerate(moves) if mv.is_usable()]
+    if not usable:
+        return (ATTACK, 0)
+    return (ATTACK, engine.rng.choice(usable))
+
+
+def random_wild_policy(engine: "BattleEngine") -> Move:
+    """
+    Default wild move policy: a random usable move, Struggle when out of PP.
+
+    Args:
+        engine (BattleEngine): Engine asking for the wild monster's move.
+
+    Returns:
+        Move: Move the wild monster uses this turn.
+    """
+    return engine.wild_monster.choose_move_random(engine.rng)
+
+
+class BattleEngine:
+    """
+    Resolves a single wild encounter without printing or prompting.
+
+    Actions are tuples:
+        (ATTACK, move_index)
+        (ITEM, item_index, monster_index)
+        (RUN,)
+    Anything else wastes the player's turn.
+
+    Each call to step() returns a list of event dicts, each with a "type"
+    key ("attack", "item", "capture", "run", "invalid" or "faint").
+    """
+
+    def __init__(self, player_monster: Monster, wild_monster: Monster,
+                 player=None, crit_chance: float = CRITICAL_CHANCE, rng=None,
+                 wild_policy: Optional[Callable[["BattleEngine"], Move]] = None):
+        """
+        Initialize an encounter and reset both combatants.
+
+        Args:
+            player_monster (Monster): Monster sent out by the player.
+            wild_monster (Monster): Wild opponent.
+            player (Player): Owner of the inventory and team, if any.
+            crit_chance (float): Critical hit probability for both sides.
+            rng: Random source for every roll of the encounter (e.g. a
+                rng.GameRNG stream); defaults to the global random module.
+            wild_policy (Callable): Called with the engine, returns the wild
+                monster's Move; defaults to random_wild_policy.
+        """
+        self.player = player
+        self.rng = random if rng is None else rng
+        self.wild_policy = random_wild_policy if wild_policy is None else wild_policy
+        self.player_monster = player_monster
+        self.wild_monster = wild_monster
+        self.crit_chance = crit_chance
+        self.turn = 1
+        self.result: Optional[str] = None
+        wild_monster.reset_stats()
+        player_monster.reset_stats()
+
+    def is_over(self) -> bool:
+        """Return True once the encounter has a result."""
+        return self.result is not None
+
+    def step(self, action: Tuple) -> List[Dict]:
+        """
+        Resolve one turn: the player's action followed by the wild reply.
+
+        Args:
+            action (Tuple): Player action (see class docstring).
+
+        Returns:
+            List[Dict]: Events produced during the turn, in order.
+        """
+        if self.result is not None:
+            return []
+        events: List[Dict] = []
+        kind = action[0] if action else None
+
+        if kind == ATTACK:
+            self._player_attack(action[1], events)
+        elif kind == ITEM:
+            monster_index = action[2] if len(action) > 2 else -1
+            self._use_item(action[1], monster_index, events)
+            if self.result is not None:
+                return events
+        elif kind == RUN:
+            escaped = try_to_run(self.player_monster, self.wild_monster, self.rng)
+            events.append({"type": "run", "success": escaped})
+            if escaped:
+                self.result = RAN_AWAY
+                return events
+        else:
+            events.append({"type": "invalid", "message": "Invalid action; turn wasted."})
+
+        wild = self.wild_monster
+        if wild.is_fainted():
+            events.append({"type": "faint", "side": WILD_SIDE, "monster": wild.name})
+            self.result = WIN
+            return events
+
+        opp_move = self.wild_policy(self)
+        outcome = wild.attack(self.player_monster, opp_move, crit_chance=self.crit_chance,
+                              rng=self.rng)
+        events.append(self._attack_event(WILD_SIDE, wild, opp_move, outcome))
+
+        if self.player_monster.is_fainted():
+            events.append({"type": "faint", "side": PLAYER_SIDE,
+                           "monster": self.player_monster.name})
+            self.result = LOSS
+            return events
+
+        self.turn += 1
+        return events
+
+    def run(self, policy: Callable[["BattleEngine"], Tuple],
+            max_turns: Optional[int] = None,
+            on_events: Optional[Callable[[List[Dict]], None]] = None) -> Optional[str]:
+        """
+        Play the encounter to completion using an action policy.
+
+        Args:
+            policy (Callable): Called with the engine, returns an action.
+            max_turns (int): Optional turn cap; result stays None if hit.
+            on_events (Callable): Optional callback receiving each turn's events.
+
+        Returns:
+            Optional[str]: WIN, LOSS, RAN_AWAY, CAPTURED, or None if capped.
+        """
+        while self.result is None:
+            if max_turns is not None and self.turn > max_turns:
+                break
+            events = self.step(policy(self))
+            if on_events is not None:
+                on_events(events)
+        self.finish()
+        return self.result
+
+    def finish(self):
+        """Post encounter reset of both combatants."""
+        self.player_monster.reset_stats()
+        self.wild_monster.reset_stats()
+
+    def _player_attack(self, move_index: int, events: List[Dict]):
+        """Resolve the player's attack action."""
+        moves = self.player_monster.get_moves()
+        if move_index is None or not 0 <= move_index < len(moves):
+            events.append({"type": "invalid", "message": "Invalid move; turn wasted."})
+            return
+        mv = moves[move_index]
+        outcome = self.player_monster.attack(self.wild_monster, mv, crit_chance=self.crit_chance,
+                                             rng=self.rng)
+        events.append(self._attack_event(PLAYER_SIDE, self.player_monster, mv, outcome))
+
+    def _use_item(self, item_index: int, monster_index: int, events: List[Dict]):
+        """Resolve the player's item action (capture or team item)."""
+        player = self.player
+        if player is None or not player.inventory:
+            events.append({"type": "invalid", "message": "You have no items."})
+            return
+        if item_index is None or not 0 <= item_index < len(player.inventory):
+            events.append({"type": "invalid", "message": "Invalid item selection."})
+            return
+
+        item_obj = player.inventory[item_index]
+        if item_obj.is_capture_item():
+            chance = calculate_capture_chance(self.wild_monster, item_obj)
+            roll = self.rng.random()
+            item_obj.use()
+            success = roll < chance
+            events.append({"type": "capture", "item": item_obj.name,
+                           "monster": self.wild_monster.name,
+                           "chance": chance, "success": success})
+            if success:
+                player.add_monster_deepcopy(self.wild_monster)
+                self.result = CAPTURED
+            return
+
+        if not player.team:
+            events.append({"type": "invalid", "message": "You have no monsters to use that on."})
+            return
+        if monster_index is None or not 0 <= monster_index < len(player.team):
+            events.append({"type": "invalid", "message": "Invalid monster selection."})
+            return
+        success, msg = player.use_item_on_monster(item_index, monster_index)
+        events.append({"type": "item", "item": item_obj.name, "success": success, "message": msg})
+
+    @staticmethod
+    def _attack_event(side: str, attacker: Monster, move, outcome: Dict) -> Dict:
+        """Build an attack event from a Monster.attack outcome."""
+        event = {"type": "attack", "side": side, "monster": attacker.name, "move": move.name}
+        event.update(outcome)
+        return event
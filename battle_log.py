@@ -0,0 +1,624 @@
+# battle_log.py
+
+"""
+Compact binary battle log with a verifying replayer.
+
+A log file is the magic b"MTGL", a version byte, then one record per
+encounter: a varint byte length followed by the record body. Integers
+are LEB128 varints (signed ones zigzag-encoded); optional indices are
+stored as 0 for None, else zigzag + 1.
+
+Record body (version 1):
+
+    seed          varint, the encounter's GameRNG seed
+    crit_chance   8-byte little-endian double
+    flags         varint, bit 0 set when a custom wild policy was used
+    strings       count, then per string: length + UTF-8 bytes
+    team          count, then per monster (see below)
+    active        team index of the player's monster; == team count
+                  means a monster record follows (not on the team)
+    wild          monster record
+    inventory     count, then per item: name, heal, restore_pp,
+                  quantity, is_capture
+    turns         count, then per turn:
+                      action   kind (0 attack, 1 item, 2 run, 3 other)
+                               + move index, or item and monster index
+                      flags    bit 0/1 player/wild critical hit,
+                               bit 2 run/capture/item success,
+                               bit 3 the wild monster attacked
+                      wild     move index (== move count for Struggle),
+                               only when flag bit 3 is set
+                      hp       player HP, wild HP after the turn
+    result        0 none, 1 win, 2 loss, 3 ran away, 4 captured
+
+Monster records are name, type, level, max_hp, current_hp and moves
+(name, type, power, max_pp, current_pp), with names and types indexing
+the record's string table. Single-byte fields (codes, flags) are below
+0x80, so everything after the string table is one varint stream that
+read_varints() decodes in a single pass. A turn typically takes 5-8
+bytes.
+
+Records are built in memory while the encounter runs and appended to a
+buffered file when it finishes. replay() rebuilds the starting state,
+re-runs every action through BattleEngine from the logged seed and
+raises ReplayMismatch at the first turn whose outcome differs.
+"""
+
+from struct import Struct
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+import os
+
+from battle import (ATTACK, ITEM, RUN, WIN, LOSS, RAN_AWAY, CAPTURED,
+                    PLAYER_SIDE, BattleEngine, random_wild_policy)
+from item import Item
+from monster import Monster, STRUGGLE
+from move import Move
+from player import Player
+from rng import GameRNG
+
+MAGIC = b"MTGL"
+VERSION = 1
+
+_DOUBLE = Struct("<d")
+
+_ACTION_CODES = {ATTACK: 0, ITEM: 1, RUN: 2}
+_RESULT_CODES = {None: 0, WIN: 1, LOSS: 2, RAN_AWAY: 3, CAPTURED: 4}
+_RESULTS = {code: result for result, code in _RESULT_CODES.items()}
+
+# Record flags
+_CUSTOM_WILD_POLICY = 1
+
+# Turn flags
+_PLAYER_CRIT = 1
+_WILD_CRIT = 2
+_SUCCESS = 4
+_WILD_ATTACKED = 8
+
+PathOrFile = Union[str, os.PathLike, BinaryIO]
+
+
+class BattleLogError(ValueError):
+    """Raised when a battle log is malformed or has an unsupported version."""
+
+
+class ReplayMismatch(BattleLogError):
+    """Raised when a replayed encounter diverges from its log."""
+
+
+def write_varint(buf: bytearray, n: int):
+    """Append unsigned int n to buf as a LEB128 varint."""
+    while n > 0x7F:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def encode_varints(values: List[int]) -> bytes:
+    """Return unsigned ints encoded back to back as LEB128 varints."""
+    if not values or max(values) < 0x80:
+        # Common case: every value fits in one byte
+        return bytes(values)
+    buf = bytearray()
+    for n in values:
+        write_varint(buf, n)
+    return bytes(buf)
+
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """
+    Read a LEB128 varint.
+
+    Args:
+        data (bytes): Buffer.
+        pos (int): Offset of the varint.
+
+    Returns:
+        Tuple[int, int]: Value and the offset just past it.
+
+    Raises:
+        BattleLogError: If the buffer ends inside the varint.
+    """
+    n = shift = 0
+    try:
+        while True:
+            b = data[pos]
+            pos += 1
+            n |= (b & 0x7F) << shift
+            if b < 0x80:
+                return n, pos
+            shift += 7
+    except IndexError:
+        raise BattleLogError("Truncated varint") from None
+
+
+def _zigzag(n: int) -> int:
+    return n << 1 if n >= 0 else (-n << 1) - 1
+
+
+def _unzigzag(n: int) -> int:
+    return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+
+def _opt(n) -> int:
+    """Encode an optional index (None -> 0)."""
+    return 0 if n is None else _zigzag(int(n)) + 1
+
+
+def _unopt(n: int):
+    return None if n == 0 else _unzigzag(n - 1)
+
+
+def read_varints(data: bytes, pos: int = 0) -> List[int]:
+    """
+    Decode every varint from pos to the end of data.
+
+    Args:
+        data (bytes): Buffer holding only varints from pos on.
+        pos (int): Offset of the first varint.
+
+    Returns:
+        List[int]: Decoded values.
+
+    Raises:
+        BattleLogError: If the buffer ends inside a varint.
+    """
+    chunk = data[pos:]
+    if not chunk or max(chunk) < 0x80:
+        # Common case: every value fits in one byte
+        return list(chunk)
+    values = []
+    append = values.append
+    n = shift = 0
+    for b in chunk:
+        if b < 0x80:
+            append(n | (b << shift))
+            n = shift = 0
+        else:
+            n |= (b & 0x7F) << shift
+            shift += 7
+    if shift:
+        raise BattleLogError("Truncated varint")
+    return values
+
+
+def _turn_flags(events: List[Dict]) -> int:
+    flags = 0
+    for event in events:
+        kind = event["type"]
+        if kind == "attack":
+            if event["side"] == PLAYER_SIDE:
+                flags |= _PLAYER_CRIT if event["critical"] else 0
+            else:
+                flags |= _WILD_ATTACKED | (_WILD_CRIT if event["critical"] else 0)
+        elif kind in ("run", "capture", "item") and event["success"]:
+            flags |= _SUCCESS
+    return flags
+
+
+def _encode_action(out: List[int], action: Tuple):
+    kind = action[0] if action else None
+    code = _ACTION_CODES.get(kind, 3)
+    out.append(code)
+    if code == 0:
+        out.append(_opt(action[1]))
+    elif code == 1:
+        out.append(_opt(action[1]))
+        out.append(_opt(action[2] if len(action) > 2 else -1))
+
+
+class BattleRecorder:
+    """
+    Records one BattleEngine encounter as a log record.
+
+    Create it right after the engine (before the first step); the
+    engine's rng must be a fresh rng.GameRNG so its seed reproduces
+    every roll. Drive the encounter through step() or run() instead of
+    the engine's own methods. Actions are logged rather than re-chosen
+    on replay, so run() lets the action policy draw from a separate
+    child stream; callers of step() must not draw from engine.rng
+    between turns.
+    """
+
+    def __init__(self, engine: BattleEngine, log: Optional["BattleLogWriter"] = None):
+        """
+        Snapshot the starting state of engine.
+
+        Args:
+            engine (BattleEngine): Encounter to record (not yet stepped).
+            log (BattleLogWriter): Log the record is appended to on finish().
+
+        Raises:
+            ValueError: If the engine has no seeded GameRNG or already started.
+        """
+        if not isinstance(engine.rng, GameRNG):
+            raise ValueError("Recorded encounters need a GameRNG stream")
+        if engine.turn != 1 or engine.is_over():
+            raise ValueError("Encounter already started")
+        self.engine = engine
+        self.log = log
+        self.finished = False
+        self._wild_index: Optional[int] = None
+        self._turns: List[int] = []
+        self._turn_count = 0
+        self._policy = engine.wild_policy
+        self._header = self._snapshot()
+        self._rng = engine.rng
+        engine.wild_policy = self._record_wild_move
+
+    def _snapshot(self) -> bytes:
+        """Encode everything before the turns: seed, flags, strings, state."""
+        engine = self.engine
+        strings: List[str] = []
+        string_ids: Dict[str, int] = {}
+        values: List[int] = []
+        put = values.append
+
+        def string(s: str):
+            sid = string_ids.get(s)
+            if sid is None:
+                sid = string_ids[s] = len(strings)
+                strings.append(s)
+            put(sid)
+
+        def monster(mon: Monster):
+            string(mon.name)
+            string(mon.type)
+            values.extend((mon.level, mon.max_hp, mon.current_hp, len(mon.moves)))
+            for mv in mon.moves:
+                string(mv.name)
+                string(mv.type)
+                values.extend((_zigzag(mv.power), mv.max_pp, mv.current_pp))
+
+        player = engine.player
+        team = player.team if player is not None else []
+        inventory = player.inventory if player is not None else []
+        put(len(team))
+        for mon in team:
+            monster(mon)
+        active = next((i for i, mon in enumerate(team) if mon is engine.player_monster), len(team))
+        put(active)
+        if active == len(team):
+            monster(engine.player_monster)
+        monster(engine.wild_monster)
+        put(len(inventory))
+        for it in inventory:
+            string(it.name)
+            values.extend((_zigzag(it.heal), _zigzag(it.restore_pp), _zigzag(it.quantity),
+                           1 if it.is_capture else 0))
+
+        header = bytearray()
+        write_varint(header, engine.rng.seed)
+        header += _DOUBLE.pack(engine.crit_chance)
+        write_varint(header, 0 if self._policy is random_wild_policy else _CUSTOM_WILD_POLICY)
+        write_varint(header, len(strings))
+        for s in strings:
+            raw = s.encode("utf-8")
+            write_varint(header, len(raw))
+            header += raw
+        return bytes(header) + encode_varints(values)
+
+    def _record_wild_move(self, engine: BattleEngine) -> Move:
+        mv = self._policy(engine)
+        moves = engine.wild_monster.moves
+        self._wild_index = next((i for i, m in enumerate(moves) if m is mv), len(moves))
+        return mv
+
+    def step(self, action: Tuple) -> List[Dict]:
+        """
+        Resolve and record one turn.
+
+        Args:
+            action (Tuple): Player action (see BattleEngine).
+
+        Returns:
+            List[Dict]: The turn's events.
+
+        Raises:
+            ValueError: If engine.rng was replaced since recording started.
+        """
+        engine = self.engine
+        if engine.is_over():
+            return []
+        if engine.rng is not self._rng:
+            raise ValueError("engine.rng was replaced; the log could not be replayed")
+        self._wild_index = None
+        events = engine.step(action)
+        out = self._turns
+        _encode_action(out, action)
+        flags = _turn_flags(events)
+        out.append(flags)
+        if flags & _WILD_ATTACKED:
+            out.append(self._wild_index)
+        out.append(engine.player_monster.current_hp)
+        out.append(engine.wild_monster.current_hp)
+        self._turn_count += 1
+        return events
+
+    def run(self, policy: Callable[[BattleEngine], Tuple], max_turns: Optional[int] = None,
+            on_events: Optional[Callable[[List[Dict]], None]] = None) -> Optional[str]:
+        """Play to completion like BattleEngine.run, recording every turn."""
+        engine = self.engine
+        policy_rng = self._rng.child("policy")
+        while not engine.is_over():
+            if max_turns is not None and engine.turn > max_turns:
+                break
+            engine.rng = policy_rng
+            try:
+                action = policy(engine)
+            finally:
+                engine.rng = self._rng
+            events = self.step(action)
+            if on_events is not None:
+                on_events(events)
+        self.finish()
+        return engine.result
+
+    def to_bytes(self) -> bytes:
+        """Return the record body for the turns recorded so far."""
+        values = [self._turn_count]
+        values += self._turns
+        values.append(_RESULT_CODES[self.engine.result])
+        return self._header + encode_varints(values)
+
+    def finish(self):
+        """Finish the encounter and append its record to the log (once)."""
+        if self.finished:
+            return
+        self.finished = True
+        self.engine.wild_policy = self._policy
+        self.engine.finish()
+        if self.log is not None:
+            self.log.append(self.to_bytes())
+
+
+class BattleLogWriter:
+    """
+    Appends encounter records to a log file through a write buffer.
+    """
+
+    def __init__(self, target: PathOrFile, buffer_size: int = 1 << 16):
+        """
+        Open a log for appending, writing the file header if it is new.
+
+        Args:
+            target (PathOrFile): Path or writable binary file.
+            buffer_size (int): Write buffer size in bytes (paths only).
+        """
+        if hasattr(target, "write"):
+            self._file = target
+            self._owns_file = False
+        else:
+            self._file = open(target, "ab", buffering=buffer_size)
+            self._owns_file = True
+        if self._file.tell() == 0:
+            self._file.write(MAGIC + bytes([VERSION]))
+        self.records = 0
+
+    def record(self, engine: BattleEngine) -> BattleRecorder:
+        """Return a recorder for engine that appends to this log."""
+        return BattleRecorder(engine, self)
+
+    def append(self, record: bytes):
+        """Append one record body."""
+        prefix = bytearray()
+        write_varint(prefix, len(record))
+        self._file.write(bytes(prefix) + record)
+        self.records += 1
+
+    def flush(self):
+        """Flush buffered records to the file."""
+        self._file.flush()
+
+    def close(self):
+        """Flush and close the log (file objects passed in stay open)."""
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self) -> "BattleLogWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_records(source: PathOrFile) -> Iterator[bytes]:
+    """
+    Yield every record body in a log.
+
+    Args:
+        source (PathOrFile): Path or readable binary file.
+
+    Raises:
+        BattleLogError: On a bad header or truncated record.
+    """
+    if hasattr(source, "read"):
+        data = source.read()
+    else:
+        with open(source, "rb") as f:
+            data = f.read()
+    if data[:4] != MAGIC:
+        raise BattleLogError("Not a battle log (bad magic)")
+    if len(data) < 5 or data[4] != VERSION:
+        raise BattleLogError(f"Unsupported battle log version {data[4:5]!r}")
+    view = memoryview(data)
+    pos = 5
+    while pos < len(data):
+        n, pos = read_varint(data, pos)
+        if pos + n > len(data):
+            raise BattleLogError("Truncated record")
+        yield bytes(view[pos:pos + n])
+        pos += n
+
+
+def decode_record(body: bytes) -> Dict:
+    """
+    Decode a record body into plain data.
+
+    Returns:
+        Dict: seed, crit_chance, custom_wild_policy, team, active, player_monster,
+        wild_monster (Monster objects at their starting state), inventory
+        (Items), turns (list of (action, flags, wild_move, player_hp,
+        wild_hp)) and result.
+
+    Raises:
+        BattleLogError: If the record is truncated or holds bad indices,
+            strings or type names.
+    """
+    seed, pos = read_varint(body, 0)
+    if pos + 8 > len(body):
+        raise BattleLogError("Truncated record")
+    crit_chance = _DOUBLE.unpack_from(body, pos)[0]
+    flags, pos = read_varint(body, pos + 8)
+    count, pos = read_varint(body, pos)
+    strings = []
+    for _ in range(count):
+        n, pos = read_varint(body, pos)
+        try:
+            strings.append(bytes(body[pos:pos + n]).decode("utf-8"))
+        except UnicodeDecodeError as exc:
+            raise BattleLogError(f"Bad string in record: {exc}") from None
+        pos += n
+    # Everything after the string table is a plain varint stream
+    nxt = iter(read_varints(body, pos)).__next__
+
+    def string() -> str:
+        sid = nxt()
+        if sid >= len(strings):
+            raise BattleLogError(f"Bad string index {sid}")
+        return strings[sid]
+
+    def monster() -> Monster:
+        name, type_ = string(), string()
+        level, max_hp, current_hp = nxt(), nxt(), nxt()
+        moves, pps = [], []
+        for _ in range(nxt()):
+            mv_name, mv_type = string(), string()
+            power, max_pp = _unzigzag(nxt()), nxt()
+            moves.append(Move(mv_name, power, max_pp, mv_type))
+            pps.append(nxt())
+        mon = Monster(name, type_, max_hp, moves, level)
+        mon.current_hp = current_hp
+        for mv, pp in zip(mon.moves, pps):
+            mv.current_pp = pp
+        return mon
+
+    try:
+        team = [monster() for _ in range(nxt())]
+        active = nxt()
+        player_monster = team[active] if active < len(team) else monster()
+        wild_monster = monster()
+        inventory = []
+        for _ in range(nxt()):
+            name = string()
+            heal, restore_pp, quantity = _unzigzag(nxt()), _unzigzag(nxt()), _unzigzag(nxt())
+            inventory.append(Item(name, heal, restore_pp, quantity, bool(nxt())))
+
+        turns = []
+        for _ in range(nxt()):
+            code = nxt()
+            if code == 0:
+                action = (ATTACK, _unopt(nxt()))
+            elif code == 1:
+                action = (ITEM, _unopt(nxt()), _unopt(nxt()))
+            elif code == 2:
+                action = (RUN,)
+            else:
+                action = (None,)
+            turn_flags = nxt()
+            wild_move = nxt() if turn_flags & _WILD_ATTACKED else None
+            turns.append((action, turn_flags, wild_move, nxt(), nxt()))
+        result_code = nxt()
+    except StopIteration:
+        raise BattleLogError("Truncated record") from None
+    except BattleLogError:
+        raise
+    except ValueError as exc:
+        # e.g. a type name missing from the type chart
+        raise BattleLogError(f"Bad record: {exc}") from None
+    if result_code not in _RESULTS:
+        raise BattleLogError(f"Bad result code {result_code}")
+    return {"seed": seed, "crit_chance": crit_chance,
+            "custom_wild_policy": bool(flags & _CUSTOM_WILD_POLICY),
+            "team": team, "active": active, "player_monster": player_monster,
+            "wild_monster": wild_monster, "inventory": inventory,
+            "turns": turns, "result": _RESULTS[result_code]}
+
+
+def replay(body: bytes) -> Dict:
+    """
+    Re-run a logged encounter through BattleEngine and verify every turn.
+
+    Encounters recorded with the default wild policy re-roll the wild
+    move from the seed and check it against the log; custom policies
+    (e.g. ai.ExpectimaxPolicy) are replayed from the logged wild moves.
+
+    Args:
+        body (bytes): Record body from iter_records().
+
+    Returns:
+        Dict: result (str or None) and turns (int).
+
+    Raises:
+        ReplayMismatch: At the first turn whose outcome differs.
+    """
+    rec = decode_record(body)
+    player = Player("Replay")
+    player.team = rec["team"]
+    player.inventory = rec["inventory"]
+    wild_monster = rec["wild_monster"]
+    logged: List[Optional[int]] = [None]
+    chosen: List[Optional[int]] = [None]
+
+    def wild_policy(engine: BattleEngine) -> Move:
+        moves = wild_monster.moves
+        if rec["custom_wild_policy"]:
+            index = logged[0]
+            if index is None:
+                raise ReplayMismatch(f"Turn {engine.turn}: wild monster attacked but no move was logged")
+            return moves[index] if index < len(moves) else Move.from_spec(STRUGGLE)
+        mv = random_wild_policy(engine)
+        chosen[0] = next((i for i, m in enumerate(moves) if m is mv), len(moves))
+        return mv
+
+    engine = BattleEngine(rec["player_monster"], wild_monster, player=player,
+                          crit_chance=rec["crit_chance"], rng=GameRNG(rec["seed"]),
+                          wild_policy=wild_policy)
+    for turn, (action, flags, wild_move, player_hp, wild_hp) in enumerate(rec["turns"], 1):
+        if engine.is_over():
+            raise ReplayMismatch(f"Turn {turn}: encounter already ended with {engine.result}")
+        logged[0] = wild_move
+        chosen[0] = None
+        events = engine.step(action)
+        got = (_turn_flags(events), engine.player_monster.current_hp, wild_monster.current_hp)
+        if got != (flags, player_hp, wild_hp):
+            raise ReplayMismatch(f"Turn {turn}: replayed (flags, player HP, wild HP) {got} "
+                                 f"!= logged {(flags, player_hp, wild_hp)}")
+        if chosen[0] is not None and chosen[0] != wild_move:
+            raise ReplayMismatch(f"Turn {turn}: wild move {chosen[0]} != logged {wild_move}")
+    if engine.result != rec["result"]:
+        raise ReplayMismatch(f"Result {engine.result!r} != logged {rec['result']!r}")
+    return {"result": engine.result, "turns": len(rec["turns"])}
+
+
+def verify_log(source: PathOrFile) -> Dict:
+    """
+    Replay every record of a log.
+
+    Args:
+        source (PathOrFile): Path or readable binary file.
+
+    Returns:
+        Dict: battles (int), turns (int) and mismatches (list of
+        (record index, message)).
+    """
+    battles = turns = 0
+    mismatches: List[Tuple[int, str]] = []
+    for i, body in enumerate(iter_records(source)):
+        battles += 1
+        try:
+            turns += replay(body)["turns"]
+        except BattleLogError as e:
+            mismatches.append((i, str(e)))
+    return {"battles": battles, "turns": turns, "mismatches": mismatches}
@@ -0,0 +1,5 @@
+"""
+Benchmark scripts for Monster Trainer Game.
+
+Run from the repository root, e.g. python -m benchmarks.bench_batch_sim
+"""
@@ -0,0 +1,62 @@
+# benchmarks/bench_batch_sim.py
+
+"""
+Compare the scalar BattleEngine loop against BatchBattleSimulator.
+
+Plays Flareon against every prototype from main.create_monsters and
+reports encounters per second for both paths plus the speedup.
+
+Usage:
+    python -m benchmarks.bench_batch_sim [--scalar N] [--batch N]
+"""
+
+import argparse
+import copy
+import random
+import time
+
+from battle import BattleEngine, random_attack_policy, WIN
+from batch_sim import BatchBattleSimulator
+from main import create_default_moves, create_monsters
+
+
+def scalar_rate(player_monster, wild_monster, trials: int):
+    """Return (encounters/sec, win rate) of looping the scalar engine."""
+    wins = 0
+    start = time.perf_counter()
+    for _ in range(trials):
+        engine = BattleEngine(player_monster, wild_monster)
+        wins += engine.run(random_attack_policy) == WIN
+    elapsed = time.perf_counter() - start
+    return trials / elapsed, wins / trials
+
+
+def main():
+    """Run the comparison and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scalar", type=int, default=20_000, help="scalar trials per matchup")
+    parser.add_argument("--batch", type=int, default=1_000_000, help="batch trials per matchup")
+    parser.add_argument("--seed", type=int, default=326)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    protos = create_monsters(create_default_moves())
+    hero = protos[0]
+    print(f"{'matchup':<22}{'scalar/s':>12}{'batch/s':>14}{'speedup':>10}{'win% s/b':>16}")
+    for wild_proto in protos:
+        player_mon = copy.deepcopy(hero)
+        wild_mon = copy.deepcopy(wild_proto)
+        s_rate, s_win = scalar_rate(player_mon, wild_mon, args.scalar)
+
+        sim = BatchBattleSimulator([(player_mon, wild_mon)])
+        start = time.perf_counter()
+        result = sim.run(args.batch, seed=args.seed)[0]
+        b_rate = args.batch / (time.perf_counter() - start)
+
+        label = f"{hero.name} vs {wild_proto.name}"
+        print(f"{label:<22}{s_rate:>12,.0f}{b_rate:>14,.0f}{b_rate / s_rate:>9.0f}x"
+              f"{s_win * 100:>8.1f}/{result['win_rate'] * 100:.1f}")
+
+
+if __name__ == "__main__":
+    main()
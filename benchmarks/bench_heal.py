@@ -0,0 +1,81 @@
+# benchmarks/bench_heal.py
+
+"""
+Compare per-monster reset_stats with the bulk healing paths.
+
+Damages `count` monsters (catalog species, cycled) held as a list of
+Monsters, a MonsterStore and a PCBox, then times restoring them all
+(best of three passes) and reports monsters healed per second.
+
+Usage:
+    python -m benchmarks.bench_heal [--count N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from healing import heal_all, heal_monsters
+from main import create_default_moves, create_monsters
+from monster_store import MonsterStore
+from pc_box import PCBox
+
+
+def timed(fn, repeat: int = 3) -> float:
+    """Return the best of repeat timings of fn() in seconds (warm caches and imports)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def damaged(protos, count: int):
+    """Return count spawned monsters with 1 HP and no PP."""
+    mons = []
+    for i in range(count):
+        mon = protos[i % len(protos)].spawn()
+        mon.current_hp = 1
+        for mv in mon.moves:
+            mv.current_pp = 0
+        mons.append(mon)
+    return mons
+
+
+def main():
+    """Run the comparison and print monsters healed per second."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+    n = args.count
+
+    protos = create_monsters(create_default_moves())
+    mons = damaged(protos, n)
+    rows = [("reset_stats per monster", timed(lambda: [m.reset_stats() for m in mons]))]
+    mons = damaged(protos, n)
+    rows.append(("heal_monsters(list)", timed(lambda: heal_monsters(mons))))
+    store = MonsterStore()
+    store.extend(damaged(protos, n))
+    del mons
+    rows.append(("heal_all(MonsterStore)", timed(lambda: heal_all(store))))
+    assert store[n - 1].current_hp == store[n - 1].max_hp
+    with tempfile.TemporaryDirectory() as tmp:
+        with PCBox(os.path.join(tmp, "box.dat"), initial_capacity=n) as box:
+            for i in range(n):
+                box.deposit(protos[i % len(protos)])
+                box.set_hp(i, 1)
+            rows.append(("PCBox.set_hp per record", timed(
+                lambda: [box.set_hp(i, box.hp(i)[1]) for i in range(n)], repeat=1)))
+            rows.append(("heal_all(PCBox)", timed(lambda: heal_all(box))))
+            assert box.hp(n - 1)[0] == box.hp(n - 1)[1]
+
+    baseline = rows[0][1]
+    print(f"{n:,} monsters")
+    for label, seconds in rows:
+        print(f"{label:<26}{n / seconds:>16,.0f} monsters/s{baseline / seconds:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
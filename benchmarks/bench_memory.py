@@ -0,0 +1,87 @@
+# benchmarks/bench_memory.py
+
+"""
+Measure bytes per stored monster for each representation.
+
+Compares the old dict-backed layout (reconstructed here, since Move,
+Monster and Item now use __slots__), slotted Monster objects sharing
+MoveSpec/SpeciesSpec flyweights, and the struct-of-arrays MonsterStore.
+
+Usage:
+    python -m benchmarks.bench_memory [--count N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from monster import Monster
+from monster_store import MonsterStore
+from move import Move
+from main import create_default_moves, create_monsters
+
+
+class _DictMove:
+    """Pre-__slots__ Move attribute layout."""
+
+    def __init__(self, mv: Move):
+        self.name = mv.name
+        self.power = mv.power
+        self.max_pp = mv.max_pp
+        self.current_pp = mv.current_pp
+        self.type = mv.type
+
+
+class _DictMonster:
+    """Pre-__slots__ Monster attribute layout."""
+
+    def __init__(self, m: Monster):
+        self.name = m.name
+        self.type = m.type
+        self.max_hp = m.max_hp
+        self.current_hp = m.current_hp
+        self.level = m.level
+        self.moves = [_DictMove(mv) for mv in m.moves]
+
+
+def measure(build, count: int) -> float:
+    """Return traced bytes per monster for the structure build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return (after - before) / count
+
+
+def main():
+    """Run the measurements and print bytes per monster."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+    n = args.count
+    protos = create_monsters(create_default_moves())
+    roster = [protos[i % len(protos)] for i in range(n)]
+
+    def build_store():
+        store = MonsterStore()
+        store.extend(roster)
+        return store
+
+    rows = [
+        ("dict-backed objects (before)", lambda: [_DictMonster(m) for m in roster]),
+        ("__slots__ + shared specs", lambda: [m.spawn() for m in roster]),
+        ("MonsterStore columns", build_store),
+    ]
+    print(f"{n:,} monsters")
+    baseline = None
+    for label, build in rows:
+        per = measure(build, n)
+        baseline = baseline or per
+        print(f"{label:<30}{per:>10.1f} B/monster{baseline / per:>8.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/bench_save.py
+
+"""
+Compare the binary save format against pickle and JSON.
+
+Saves a Player holding a large team and reports file size, save time,
+full load time and streaming iteration time for each format.
+
+Usage:
+    python -m benchmarks.bench_save [--count N]
+"""
+
+import argparse
+import io
+import json
+import pickle
+import time
+
+from item import Item
+from main import create_default_moves, create_monsters
+from monster import Monster
+from move import Move
+from player import Player
+import savegame
+
+
+def to_json(player: Player) -> bytes:
+    """Encode a player as plain JSON (the obvious hand-rolled format)."""
+    return json.dumps({
+        "name": player.name,
+        "team": [{"name": m.name, "type": m.type, "level": m.level, "max_hp": m.max_hp,
+                  "current_hp": m.current_hp,
+                  "moves": [[mv.name, mv.power, mv.max_pp, mv.current_pp, mv.type]
+                            for mv in m.moves]} for m in player.team],
+        "inventory": [[it.name, it.heal, it.restore_pp, it.quantity, it.is_capture]
+                      for it in player.inventory],
+    }).encode("utf-8")
+
+
+def from_json(data: bytes) -> Player:
+    """Decode to_json output back into a Player."""
+    raw = json.loads(data)
+    player = Player(raw["name"])
+    for m in raw["team"]:
+        moves = []
+        for name, power, max_pp, current_pp, type_ in m["moves"]:
+            mv = Move(name, power, max_pp, type_)
+            mv.current_pp = current_pp
+            moves.append(mv)
+        mon = Monster(m["name"], m["type"], m["max_hp"], moves, m["level"])
+        mon.current_hp = m["current_hp"]
+        player.team.append(mon)
+    player.inventory = [Item(n, heal=h, restore_pp=r, quantity=q, is_capture=c)
+                        for n, h, r, q, c in raw["inventory"]]
+    return player
+
+
+def timed(fn):
+    """Return (result, seconds) of calling fn."""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def binary_save(player: Player) -> bytes:
+    buf = io.BytesIO()
+    savegame.save_player(player, buf)
+    return buf.getvalue()
+
+
+def main():
+    """Run the comparison and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    protos = create_monsters(create_default_moves())
+    player = Player("Bench")
+    for i in range(args.count):
+        mon = protos[i % len(protos)].spawn()
+        mon.take_damage(i % 7)
+        player.team.append(mon)
+
+    formats = [
+        ("binary", binary_save, lambda d: savegame.load_player(io.BytesIO(d)),
+         lambda d: sum(1 for _ in savegame.iter_team(io.BytesIO(d)))),
+        ("pickle", lambda p: pickle.dumps(p, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads, None),
+        ("json", to_json, from_json, None),
+    ]
+    print(f"{args.count:,} monsters")
+    print(f"{'format':<8}{'size MB':>10}{'B/monster':>11}{'save s':>9}{'load s':>9}{'stream s':>10}")
+    for label, dump, load, stream in formats:
+        data, t_save = timed(lambda: dump(player))
+        loaded, t_load = timed(lambda: load(data))
+        assert len(loaded.team) == args.count
+        t_stream = timed(lambda: stream(data))[1] if stream else float("nan")
+        print(f"{label:<8}{len(data) / 1e6:>10.2f}{len(data) / args.count:>11.1f}"
+              f"{t_save:>9.3f}{t_load:>9.3f}{t_stream:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# benchmarks/bench_spawn.py
+
+"""
+Compare spawn rates of copy.deepcopy against Monster.spawn/clone.
+
+Usage:
+    python -m benchmarks.bench_spawn [--count N]
+"""
+
+import argparse
+import copy
+import time
+
+from main import create_default_moves, create_monsters
+from species import SpeciesRegistry
+
+
+def rate(fn, count: int) -> float:
+    """Return calls per second of fn over count calls."""
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    """Run the comparison and print spawns per second."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    protos = create_monsters(create_default_moves())
+    registry = SpeciesRegistry(protos)
+    proto = protos[0]
+    rows = [
+        ("copy.deepcopy(proto)", lambda: copy.deepcopy(proto)),
+        ("proto.clone()", proto.clone),
+        ("proto.spawn()", proto.spawn),
+        ("registry.spawn(name)", lambda: registry.spawn("Flareon")),
+    ]
+    baseline = None
+    for label, fn in rows:
+        per_sec = rate(fn, args.count)
+        baseline = baseline or per_sec
+        print(f"{label:<24}{per_sec:>14,.0f} spawns/s{per_sec / baseline:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
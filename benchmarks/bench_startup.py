@@ -0,0 +1,97 @@
+# benchmarks/bench_startup.py
+
+"""
+Measure game startup time as the species catalog grows.
+
+Writes synthetic catalogs of each size to a temporary directory and
+times `python main.py` from launch to the "Enter your name" prompt,
+first without a snapshot (cold: sources parsed, validated and
+compiled) and then with it (warm), plus the in-process Catalog.load
+time for each.
+
+Usage:
+    python -m benchmarks.bench_startup [--sizes 4 400 4000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from catalog import SNAPSHOT_NAME, Catalog, DATA_DIR
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = b"Enter your name"
+
+
+def write_catalog(path: str, species: int, seed: int = 0):
+    """Write a synthetic catalog with `species` species (and species // 2 + 7 moves)."""
+    rng = random.Random(seed)
+    with open(os.path.join(DATA_DIR, "types.json"), encoding="utf-8") as fh:
+        chart = json.load(fh)
+    types = list(chart)
+    moves = [{"name": f"Move {i}", "power": rng.randint(4, 14), "max_pp": rng.randint(5, 25),
+              "type": rng.choice(types)} for i in range(species // 2 + 7)]
+    entries = [{"name": "Flareon", "type": "Fire", "base_hp": 60, "moves": ["Move 0", "Move 1"]}]
+    entries += [{"name": f"Species {i}", "type": rng.choice(types), "base_hp": rng.randint(30, 90),
+                 "moves": [m["name"] for m in rng.sample(moves, 3)]} for i in range(species - 1)]
+    for fname, data in (("types.json", chart), ("moves.json", moves), ("species.json", entries)):
+        with open(os.path.join(path, fname), "w", encoding="utf-8") as fh:
+            json.dump(data, fh)
+
+
+def time_to_prompt(data_dir: str) -> float:
+    """Return seconds from launching main.py until it prints the name prompt."""
+    env = dict(os.environ, MTG_CATALOG_DIR=data_dir)
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "main.py"], cwd=ROOT, env=env,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    seen = b""
+    while PROMPT not in seen:
+        chunk = proc.stdout.read1(4096)
+        if not chunk:
+            raise RuntimeError("main.py exited before prompting")
+        seen += chunk
+    elapsed = time.perf_counter() - start
+    proc.kill()
+    proc.communicate()
+    return elapsed
+
+
+def main():
+    """Run the measurement and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="*", default=[4, 400, 4000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'species':>8}{'cold load':>12}{'warm load':>12}{'cold prompt':>14}{'warm prompt':>14}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_catalog(tmp, size)
+            snapshot = os.path.join(tmp, SNAPSHOT_NAME)
+            cold_load, warm_load, cold_prompt, warm_prompt = [], [], [], []
+            for _ in range(args.repeat):
+                if os.path.exists(snapshot):
+                    os.remove(snapshot)
+                start = time.perf_counter()
+                Catalog.load(tmp)
+                cold_load.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                Catalog.load(tmp)
+                warm_load.append(time.perf_counter() - start)
+                os.remove(snapshot)
+                cold_prompt.append(time_to_prompt(tmp))
+                warm_prompt.append(time_to_prompt(tmp))
+            print(f"{size:>8}" + "".join(f"{statistics.median(t) * 1000:>{w}.1f}ms"
+                                         for t, w in ((cold_load, 10), (warm_load, 10),
+                                                      (cold_prompt, 12), (warm_prompt, 12))))
+
+
+if __name__ == "__main__":
+    main()
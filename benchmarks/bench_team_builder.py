@@ -0,0 +1,61 @@
+# benchmarks/bench_team_builder.py
+
+"""
+Time team-builder queries against a large box.
+
+Builds a synthetic catalog (see bench_startup), fills a box with
+`count` monsters of random species and levels, and times best_team for
+zones of several sizes: the first query computes the score columns,
+repeats reuse them.
+
+Usage:
+    python -m benchmarks.bench_team_builder [--count N] [--zones 4 8 12] [--species S]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+from benchmarks.bench_startup import write_catalog
+from catalog import Catalog
+from spawn_table import SpawnEntry, SpawnTable
+from team_builder import TeamBuilder
+
+
+def main():
+    """Run the queries and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--zones", type=int, nargs="*", default=[4, 8, 12])
+    parser.add_argument("--species", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        write_catalog(tmp, args.species)
+        registry = Catalog.load(tmp, snapshot=False).registry()
+    names = registry.names()
+    box = SpawnTable([SpawnEntry(n, 1.0, 1, 60) for n in names], registry).spawn_many(args.count, rng)
+    start = time.perf_counter()
+    builder = TeamBuilder(box)
+    print(f"{args.count:,} monsters, {len(builder._profiles):,} distinct profiles, "
+          f"indexed in {(time.perf_counter() - start) * 1000:.0f}ms")
+    print(f"{'zone size':>10}{'first query':>14}{'repeat':>10}{'nodes':>8}")
+    for size in args.zones:
+        opponents = []
+        for name in rng.sample(names, size):
+            mon = registry.spawn(name)
+            mon.level_up(rng.randint(10, 60) - 1)
+            opponents.append((mon, rng.random() + 0.1))
+        times = []
+        for _ in range(1 + args.repeat):
+            start = time.perf_counter()
+            result = builder.best_team(opponents)
+            times.append(time.perf_counter() - start)
+        print(f"{size:>10}{times[0] * 1000:>12.0f}ms{min(times[1:]) * 1000:>8.0f}ms{result['nodes']:>8}")
+
+
+if __name__ == "__main__":
+    main()
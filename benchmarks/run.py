@@ -0,0 +1,269 @@
+# benchmarks/run.py
+
+"""
+Benchmark suite for the game's hot paths with JSON baselines.
+
+Times Monster.attack, Move.get_multiplier, spawning (Monster.spawn and
+copy.deepcopy), inventory operations (Player.add_item, find_item_by_name
+and remove/re-add churn) and BattleEngine turns at several scales
+(number of monsters, items or battles involved), reporting ops/sec and
+the memory allocated by each benchmark's setup. Benchmarks too slow or
+too large for a scale run at their own limit instead (copy.deepcopy at
+1k, battle.turn at 100k).
+
+With --save the results become the baseline; otherwise, if a baseline
+exists, every result is compared against it and the run exits with
+status 1 when any path is slower than baseline by more than --threshold.
+
+Usage:
+    python -m benchmarks.run [--scales 1,1000,10000,1000000] [--only NAME ...]
+                             [--baseline FILE] [--save] [--threshold 0.25]
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from battle import BattleEngine, random_attack_policy
+from item import Item
+from main import create_default_moves, create_monsters
+from move import TYPE_NAMES
+from player import Player
+from rng import GameRNG
+
+DEFAULT_SCALES = (1, 1_000, 10_000, 1_000_000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# setup(n) -> (fn, ops per fn call)
+Setup = Callable[[int], Tuple[Callable[[], None], int]]
+
+
+def _protos():
+    return create_monsters(create_default_moves())
+
+
+def setup_attack(n: int):
+    """n monsters, each attacking the next once per call."""
+    team = [p.spawn() for p in _protos() for _ in range(-(-n // 4))][:n]
+    for m in team:
+        m.max_hp = m.current_hp = 10 ** 9
+    pairs = [(m, team[(i + 1) % n], m.moves[0]) for i, m in enumerate(team)]
+
+    def fn():
+        for attacker, target, mv in pairs:
+            mv.current_pp = 1
+            attacker.attack(target, mv)
+    return fn, n
+
+
+def setup_multiplier(n: int):
+    """n moves, each checked against one defender type per call."""
+    protos = list(create_default_moves().values())
+    moves = [protos[i % len(protos)].spawn() for i in range(n)]
+    pairs = [(mv, TYPE_NAMES[i % len(TYPE_NAMES)]) for i, mv in enumerate(moves)]
+
+    def fn():
+        for mv, defender in pairs:
+            mv.get_multiplier(defender)
+    return fn, n
+
+
+def setup_spawn(n: int):
+    """Spawn n monsters from a prototype with Monster.spawn per call."""
+    proto = _protos()[0]
+
+    def fn():
+        spawn = proto.spawn
+        for _ in range(n):
+            spawn()
+    return fn, n
+
+
+def setup_deepcopy(n: int):
+    """Spawn n monsters with copy.deepcopy (the pre-spawn approach) per call."""
+    proto = _protos()[0]
+
+    def fn():
+        for _ in range(n):
+            copy.deepcopy(proto)
+    return fn, n
+
+
+def setup_add_item(n: int):
+    """Merge one item into an inventory of n item types per call."""
+    player = Player("Bench")
+    player.inventory = [Item(f"Item {i}", heal=1) for i in range(n)]
+    last = player.inventory[-1].name
+
+    def fn():
+        player.add_item(Item(last, heal=1))
+    return fn, 1
+
+
+def setup_find_item(n: int):
+    """Look up the last of n item types by name (any case) per call."""
+    player = Player("Bench")
+    player.inventory = [Item(f"Item {i}", heal=1) for i in range(n)]
+    last = player.inventory[-1].name.upper()
+
+    def fn():
+        player.find_item_by_name(last)
+    return fn, 1
+
+
+def setup_item_churn(n: int):
+    """Remove the first of n item types and add it back (merge lookup) per call."""
+    player = Player("Bench")
+    player.inventory = [Item(f"Item {i}", heal=1) for i in range(n)]
+
+    def fn():
+        item = player.inventory[0]
+        player.remove_item_by_index(0)
+        player.add_item(item)
+        player.find_item_by_name(item.name)
+    return fn, 1
+
+
+def setup_battle_turn(n: int):
+    """Advance n concurrent encounters by one turn each per call."""
+    protos = _protos()
+    rng = GameRNG(0)
+    engines = [BattleEngine(protos[i % 4].spawn(), protos[(i + 1) % 4].spawn(), rng=rng)
+               for i in range(n)]
+
+    def fn():
+        for i, engine in enumerate(engines):
+            if engine.is_over():
+                engine = engines[i] = BattleEngine(engine.player_monster,
+                                                   engine.wild_monster, rng=rng)
+            engine.step(random_attack_policy(engine))
+    return fn, n
+
+
+# name -> (setup, largest scale worth running)
+BENCHMARKS: Dict[str, Tuple[Setup, int]] = {
+    "monster.attack": (setup_attack, 1_000_000),
+    "move.get_multiplier": (setup_multiplier, 1_000_000),
+    "monster.spawn": (setup_spawn, 1_000_000),
+    "copy.deepcopy": (setup_deepcopy, 1_000),
+    "player.add_item": (setup_add_item, 1_000_000),
+    "player.find_item": (setup_find_item, 1_000_000),
+    "player.item_churn": (setup_item_churn, 1_000_000),
+    "battle.turn": (setup_battle_turn, 100_000),
+}
+
+
+def measure(setup: Setup, n: int, min_time: float = 0.2) -> Dict:
+    """
+    Time one benchmark at scale n.
+
+    Args:
+        setup (Setup): Benchmark setup function.
+        n (int): Scale passed to setup.
+        min_time (float): Minimum seconds of timed calls.
+
+    Returns:
+        Dict: ops_per_sec (float), setup_bytes (int) and calls (int).
+    """
+    tracemalloc.start()
+    fn, ops = setup(n)
+    setup_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    fn()  # warm-up
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+    return {"ops_per_sec": ops * calls / elapsed, "setup_bytes": setup_bytes, "calls": calls}
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict],
+            threshold: float) -> List[str]:
+    """
+    Return descriptions of results slower than baseline by more than threshold.
+
+    Args:
+        results (Dict[str, Dict]): Current results keyed by "name@scale".
+        baseline (Dict[str, Dict]): Baseline results with the same keys.
+        threshold (float): Allowed relative slowdown (0.25 = 25%).
+
+    Returns:
+        List[str]: One line per regression (empty if none).
+    """
+    regressions = []
+    for key, res in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        ratio = res["ops_per_sec"] / base["ops_per_sec"]
+        if ratio < 1.0 - threshold:
+            regressions.append(f"{key}: {res['ops_per_sec']:,.0f} ops/s vs baseline "
+                               f"{base['ops_per_sec']:,.0f} ({(1 - ratio) * 100:.0f}% slower)")
+    return regressions
+
+
+def run(names: List[str], scales: List[int], min_time: float, out=None) -> Dict[str, Dict]:
+    """Run the selected benchmarks and print a table; return results by key."""
+    out = out or sys.stdout
+    results = {}
+    print(f"{'benchmark':<22}{'scale':>10}{'ops/s':>16}{'setup MB':>11}{'B/elem':>9}", file=out)
+    for name in names:
+        setup, max_scale = BENCHMARKS[name]
+        # Scales above a benchmark's limit run once at the limit instead
+        for n in sorted({min(n, max_scale) for n in scales}):
+            res = measure(setup, n, min_time)
+            results[f"{name}@{n}"] = res
+            print(f"{name:<22}{n:>10,}{res['ops_per_sec']:>16,.0f}"
+                  f"{res['setup_bytes'] / 1e6:>11.1f}{res['setup_bytes'] / n:>9.0f}", file=out)
+            out.flush()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the suite; return the process exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="comma-separated scales")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), default=None)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="store results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before failing (fraction)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per measurement")
+    args = parser.parse_args(argv)
+
+    scales = [int(s) for s in args.scales.split(",") if s]
+    results = run(args.only or list(BENCHMARKS), scales, args.min_time)
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --save to create one.")
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
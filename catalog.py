@@ -0,0 +1,437 @@
+# catalog.py
+
+"""
+Data-driven species and move catalog for Monster Trainer Game.
+
+The type chart, moves and species are read from JSON files in a data
+directory (data/ by default):
+
+    types.json    {attacker: {defender: multiplier}}  (same shape as TYPE_CHART)
+    moves.json    [{"name", "power", "max_pp", "type"}, ...]
+    species.json  [{"name", "type", "base_hp", "moves": [move names]}, ...]
+
+Sources are validated once and compiled into a binary snapshot
+(catalog.snapshot, marshal-encoded behind a magic and format version)
+stamped with the size and modification time of each source file, the
+way .pyc files are. Later loads read only the snapshot while the
+sources are unchanged; a stale, corrupt or foreign snapshot is rebuilt.
+
+Nothing is materialized at load: MoveSpecs, SpeciesSpecs and prototype
+Monsters are created the first time a species is spawned, so startup
+cost stays flat as the catalog grows.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import json
+import marshal
+import os
+import random
+
+from move import Move, MoveSpec, TYPE_CHART, build_type_tables, move_spec, type_id, validate_type_chart
+from monster import Monster, SpeciesSpec
+from species import SpeciesRegistry
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SOURCE_FILES = ("types.json", "moves.json", "species.json")
+SNAPSHOT_NAME = "catalog.snapshot"
+
+MAGIC = b"MTGC"
+FORMAT_VERSION = 1
+_HEADER = MAGIC + bytes([FORMAT_VERSION, marshal.version])
+
+# Chart currently applied to move.TYPE_NAMES / TYPE_MATRIX
+_applied_chart: Dict[str, Dict[str, float]] = TYPE_CHART
+# data_dir -> loaded Catalog (see load_catalog)
+_loaded: Dict[str, "Catalog"] = {}
+
+
+class CatalogError(ValueError):
+    """Raised when catalog sources are missing or invalid."""
+
+
+def validate_catalog(chart: Dict, moves: List, species: List) -> List[str]:
+    """
+    Return a list of problems found in catalog sources (empty if valid).
+
+    Args:
+        chart (Dict): Parsed types.json.
+        moves (List): Parsed moves.json.
+        species (List): Parsed species.json.
+
+    Returns:
+        List[str]: Human-readable problem descriptions.
+    """
+    if not isinstance(chart, dict):
+        return ["types.json must be an object"]
+    problems = validate_type_chart(chart)
+    types = set(chart).union(*(row for row in chart.values() if isinstance(row, dict)))
+
+    def bad_int(value, minimum):
+        return isinstance(value, bool) or not isinstance(value, int) or value < minimum
+
+    move_names = set()
+    if not isinstance(moves, list):
+        problems.append("moves.json must be a list")
+        moves = []
+    for i, mv in enumerate(moves):
+        if not isinstance(mv, dict):
+            problems.append(f"Move #{i} must be an object")
+            continue
+        name = mv.get("name")
+        if not isinstance(name, str) or not name:
+            problems.append(f"Move #{i} has an invalid name: {name!r}")
+        elif name in move_names:
+            problems.append(f"Duplicate move: {name!r}")
+        else:
+            move_names.add(name)
+        if bad_int(mv.get("power"), 0):
+            problems.append(f"Move {name!r} has an invalid power: {mv.get('power')!r}")
+        if bad_int(mv.get("max_pp"), 1):
+            problems.append(f"Move {name!r} has an invalid max_pp: {mv.get('max_pp')!r}")
+        if mv.get("type", "Normal") not in types:
+            problems.append(f"Move {name!r} has an unknown type: {mv.get('type')!r}")
+
+    species_names = set()
+    if not isinstance(species, list):
+        problems.append("species.json must be a list")
+        species = []
+    for i, sp in enumerate(species):
+        if not isinstance(sp, dict):
+            problems.append(f"Species #{i} must be an object")
+            continue
+        name = sp.get("name")
+        if not isinstance(name, str) or not name:
+            problems.append(f"Species #{i} has an invalid name: {name!r}")
+        elif name in species_names:
+            problems.append(f"Duplicate species: {name!r}")
+        else:
+            species_names.add(name)
+        if sp.get("type") not in types:
+            problems.append(f"Species {name!r} has an unknown type: {sp.get('type')!r}")
+        if bad_int(sp.get("base_hp"), 1):
+            problems.append(f"Species {name!r} has an invalid base_hp: {sp.get('base_hp')!r}")
+        learnset = sp.get("moves", [])
+        if not isinstance(learnset, list):
+            problems.append(f"Species {name!r} moves must be a list")
+            continue
+        for move_name in learnset:
+            if move_name not in move_names:
+                problems.append(f"Species {name!r} uses an unknown move: {move_name!r}")
+    return problems
+
+
+def _fingerprint(data_dir: str) -> Tuple:
+    """(file, size, mtime_ns) for every source file."""
+    stamps = []
+    for fname in SOURCE_FILES:
+        try:
+            st = os.stat(os.path.join(data_dir, fname))
+        except OSError as exc:
+            raise CatalogError(f"Missing catalog source {fname} in {data_dir}") from exc
+        stamps.append((fname, st.st_size, st.st_mtime_ns))
+    return tuple(stamps)
+
+
+def compile_sources(data_dir: str = DATA_DIR) -> Tuple[Dict, Dict, Dict]:
+    """
+    Read and validate the JSON sources into the compact snapshot tables.
+
+    Args:
+        data_dir (str): Directory holding the source files.
+
+    Returns:
+        Tuple[Dict, Dict, Dict]: Type chart, {move: (power, max_pp, type)}
+            and {species: (type, base_hp, (move names...))}, species in file order.
+
+    Raises:
+        CatalogError: If a file is missing, unparsable or invalid.
+    """
+    parsed = []
+    for fname in SOURCE_FILES:
+        path = os.path.join(data_dir, fname)
+        try:
+            with open(path, encoding="utf-8") as fh:
+                parsed.append(json.load(fh))
+        except OSError as exc:
+            raise CatalogError(f"Cannot read catalog source {path}: {exc}") from exc
+        except json.JSONDecodeError as exc:
+            raise CatalogError(f"Invalid JSON in {path}: {exc}") from exc
+    chart, moves, species = parsed
+    problems = validate_catalog(chart, moves, species)
+    if problems:
+        raise CatalogError("Invalid catalog: " + "; ".join(problems))
+    chart = {att: {dfn: float(m) for dfn, m in row.items()} for att, row in chart.items()}
+    move_rows = {mv["name"]: (mv["power"], mv["max_pp"], mv.get("type", "Normal")) for mv in moves}
+    species_rows = {sp["name"]: (sp["type"], sp["base_hp"], tuple(sp.get("moves", ())))
+                    for sp in species}
+    return chart, move_rows, species_rows
+
+
+def write_snapshot(path: str, fingerprint: Tuple, tables: Tuple[Dict, Dict, Dict]):
+    """
+    Atomically write a compiled snapshot.
+
+    Args:
+        path (str): Snapshot file path.
+        fingerprint (Tuple): Source stamps the tables were compiled from.
+        tables (Tuple[Dict, Dict, Dict]): compile_sources() result.
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(_HEADER + marshal.dumps((fingerprint, tables)))
+    os.replace(tmp, path)
+
+
+def read_snapshot(path: str, fingerprint: Tuple) -> Optional[Tuple[Dict, Dict, Dict]]:
+    """
+    Return the tables stored in a snapshot if it matches fingerprint.
+
+    Args:
+        path (str): Snapshot file path.
+        fingerprint (Tuple): Current source stamps.
+
+    Returns:
+        Optional[Tuple[Dict, Dict, Dict]]: Tables, or None if the snapshot
+            is missing, stale, corrupt or from another format/marshal version.
+    """
+    try:
+        with open(path, "rb") as fh:
+            data = fh.read()
+    except OSError:
+        return None
+    if not data.startswith(_HEADER):
+        return None
+    try:
+        stamps, tables = marshal.loads(data[len(_HEADER):])
+    except (ValueError, EOFError, TypeError):
+        return None
+    if stamps != fingerprint:
+        return None
+    return tables
+
+
+def _apply_type_chart(chart: Dict[str, Dict[str, float]]):
+    """Rebuild the move type tables if chart differs from the one in use."""
+    global _applied_chart
+    if chart != _applied_chart:
+        build_type_tables(chart)
+        _applied_chart = chart
+
+
+class Catalog:
+    """
+    Loaded catalog tables with lazily materialized specs and prototypes.
+    """
+
+    def __init__(self, chart: Dict, moves: Dict, species: Dict, source: str = "sources",
+                 data_dir: Optional[str] = None):
+        """
+        Initialize from compiled tables and apply the type chart.
+
+        Args:
+            chart (Dict): Type chart.
+            moves (Dict): {move: (power, max_pp, type)}.
+            species (Dict): {species: (type, base_hp, (move names...))}.
+            source (str): "snapshot" or "sources", for diagnostics.
+            data_dir (str): Directory the tables were loaded from, if any
+                (other data such as zones.json is looked up there).
+        """
+        _apply_type_chart(chart)
+        self.chart = chart
+        self.source = source
+        self.data_dir = data_dir
+        self._moves = moves
+        self._species = species
+        self._names: List[str] = list(species)
+        self._move_specs: Dict[str, MoveSpec] = {}
+        self._species_specs: Dict[str, SpeciesSpec] = {}
+        self._protos: Dict[str, Monster] = {}
+
+    @classmethod
+    def load(cls, data_dir: str = DATA_DIR, snapshot: bool = True) -> "Catalog":
+        """
+        Load a catalog, reusing or refreshing its compiled snapshot.
+
+        Args:
+            data_dir (str): Directory holding the source files.
+            snapshot (bool): Use and maintain catalog.snapshot in data_dir.
+
+        Returns:
+            Catalog: Loaded catalog.
+
+        Raises:
+            CatalogError: If the sources are missing or invalid.
+        """
+        fingerprint = _fingerprint(data_dir)
+        path = os.path.join(data_dir, SNAPSHOT_NAME)
+        if snapshot:
+            tables = read_snapshot(path, fingerprint)
+            if tables is not None:
+                return cls(*tables, source="snapshot", data_dir=data_dir)
+        tables = compile_sources(data_dir)
+        if snapshot:
+            try:
+                write_snapshot(path, fingerprint, tables)
+            except OSError:
+                pass  # read-only install: recompile next time
+        return cls(*tables, data_dir=data_dir)
+
+    # Lazy materialization
+
+    def move_spec(self, name: str) -> MoveSpec:
+        """
+        Return the shared MoveSpec of a move.
+
+        Raises:
+            KeyError: If the move is unknown.
+        """
+        spec = self._move_specs.get(name)
+        if spec is None:
+            power, max_pp, type_ = self._moves[name]
+            spec = self._move_specs[name] = move_spec(name, power, max_pp, type_)
+        return spec
+
+    def species_spec(self, name: str) -> SpeciesSpec:
+        """
+        Return the shared SpeciesSpec of a species.
+
+        Raises:
+            KeyError: If the species is unknown.
+        """
+        spec = self._species_specs.get(name)
+        if spec is None:
+            type_, base_hp, learnset = self._species[name]
+            spec = SpeciesSpec(name, type_id(type_), base_hp,
+                               tuple(self.move_spec(m) for m in learnset))
+            self._species_specs[name] = spec
+        return spec
+
+    def prototype(self, name: str) -> Monster:
+        """
+        Return the prototype Monster of a species (created on first use).
+
+        Raises:
+            KeyError: If the species is unknown.
+        """
+        proto = self._protos.get(name)
+        if proto is None:
+            proto = self._protos[name] = Monster.from_spec(self.species_spec(name))
+        return proto
+
+    def move_prototypes(self) -> Dict[str, Move]:
+        """Return a fresh {name: Move} prototype for every move."""
+        return {name: Move.from_spec(self.move_spec(name)) for name in self._moves}
+
+    def prototypes(self) -> List[Monster]:
+        """Return every species prototype in catalog order (materializes all)."""
+        return [self.prototype(name) for name in self._names]
+
+    def registry(self) -> "CatalogRegistry":
+        """Return a lazy SpeciesRegistry over this catalog."""
+        return CatalogRegistry(self)
+
+    def names(self) -> List[str]:
+        """Return species names in catalog order."""
+        return list(self._names)
+
+    def starter(self) -> str:
+        """
+        Return the species new players start with (the first in catalog order).
+
+        Raises:
+            CatalogError: If the catalog has no species.
+        """
+        if not self._names:
+            where = self.data_dir or "tables"
+            raise CatalogError(f"Catalog ({where}) has no species to give as a starter")
+        return self._names[0]
+
+    def materialized(self) -> int:
+        """Return how many species prototypes have been created."""
+        return len(self._protos)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._species
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+class CatalogRegistry(SpeciesRegistry):
+    """
+    SpeciesRegistry whose prototypes come from a Catalog on first spawn.
+    """
+
+    def __init__(self, catalog: Catalog):
+        """
+        Initialize the registry.
+
+        Args:
+            catalog (Catalog): Catalog providing the species.
+        """
+        super().__init__()
+        self.catalog = catalog
+        self._names: List[str] = catalog.names()
+
+    def register(self, prototype: Monster):
+        """Register (or replace) the prototype for a species."""
+        if prototype.name not in self._protos and prototype.name not in self.catalog:
+            self._names.append(prototype.name)
+        self._protos[prototype.name] = prototype
+
+    def get(self, name: str) -> Monster:
+        """
+        Return the prototype for a species.
+
+        Raises:
+            KeyError: If the species is unknown.
+        """
+        proto = self._protos.get(name)
+        if proto is None:
+            proto = self._protos[name] = self.catalog.prototype(name)
+        return proto
+
+    def spawn(self, name: str) -> Monster:
+        """
+        Spawn a fresh monster of a species.
+
+        Raises:
+            KeyError: If the species is unknown.
+        """
+        return self.get(name).spawn()
+
+    def spawn_random(self, rng=None) -> Monster:
+        """
+        Spawn a fresh monster of a uniformly random species.
+
+        Args:
+            rng: Random source with choice(); defaults to the random module.
+        """
+        return self.get((random if rng is None else rng).choice(self._names)).spawn()
+
+    def names(self) -> List[str]:
+        """Return species names in catalog order."""
+        return list(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._protos or name in self.catalog
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+def load_catalog(data_dir: Optional[str] = None) -> Catalog:
+    """
+    Return the catalog for data_dir, loading it once per process.
+
+    Args:
+        data_dir (str): Data directory (default $MTG_CATALOG_DIR or DATA_DIR).
+
+    Returns:
+        Catalog: Shared loaded catalog.
+    """
+    data_dir = data_dir or os.environ.get("MTG_CATALOG_DIR") or DATA_DIR
+    catalog = _loaded.get(data_dir)
+    if catalog is None:
+        catalog = _loaded[data_dir] = Catalog.load(data_dir)
+    return catalog
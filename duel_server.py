@@ -0,0 +1,551 @@
+# duel_server.py
+
+"""
+asyncio PvP duel server for Monster Trainer Game.
+
+Players connect over TCP or a Unix socket and speak newline-delimited
+JSON. Every message carries a "pid" chosen by the client, so one
+connection can stand in for many players (used by the bot client and the
+load test); a real game client simply uses pid 0.
+
+Client -> server:
+    {"op": "join", "pid": 0, "name": "Ann", "species": "Flareon"}
+    {"op": "move", "pid": 0, "turn": 3, "index": 1}
+
+Server -> client:
+    {"event": "start", "pid": 0, "battle": 12, "opponent": "Bob",
+     "monster": "...", "opponent_monster": "...", "moves": ["..."]}
+    {"event": "turn", "pid": 0, "turn": 3, "hp": 40, "opponent_hp": 22,
+     "events": [...previous turn...]}
+    {"event": "result", "pid": 0, "outcome": "win" | "loss" | "draw",
+     "turns": 7, "events": [...]}
+    {"event": "error", "pid": 0, "message": "..."}
+
+Joined players are paired in arrival order; a pid can hold one seat per
+connection at a time. Each turn both players have turn_timeout seconds
+to move; a missing move becomes a random usable one. A player whose
+connection closes forfeits its running duel and is dropped from the
+lobby. At most max_battles duels run at once; further joins wait in a
+bounded lobby, and when that is full the server stops reading from the
+joining connection, pushing back on the client. Outgoing messages are
+coalesced into one write per connection per loop iteration, and senders
+await drain() once the transport buffer is full.
+"""
+
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import json
+
+from monster import Monster, STRUGGLE
+from move import Move
+from battle import CRITICAL_CHANCE
+from species import SpeciesRegistry
+from rng import GameRNG
+
+DEFAULT_TURN_TIMEOUT = 10.0
+DEFAULT_MAX_BATTLES = 10_000
+DEFAULT_MAX_TURNS = 200
+
+WIN = "win"
+LOSS = "loss"
+DRAW = "draw"
+
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class DuelBattle:
+    """
+    Headless PvP battle between two monsters using Monster.attack.
+
+    Both sides pick a move each turn; the side acting first alternates
+    every turn and a knocked-out monster does not act. Invalid choices
+    and moves without PP become Struggle.
+    """
+
+    def __init__(self, first: Monster, second: Monster, rng=None,
+                 crit_chance: float = CRITICAL_CHANCE, max_turns: int = DEFAULT_MAX_TURNS):
+        """
+        Initialize the battle and reset both monsters.
+
+        Args:
+            first (Monster): Side 0 monster.
+            second (Monster): Side 1 monster.
+            rng: Random source for crits (default: a fresh GameRNG).
+            crit_chance (float): Critical hit probability.
+            max_turns (int): Turn cap; the battle is a draw when reached.
+        """
+        self.monsters = (first, second)
+        self.rng = rng if rng is not None else GameRNG()
+        self.crit_chance = crit_chance
+        self.max_turns = max_turns
+        self.turn = 1
+        self.winner: Optional[int] = None
+        self.over = False
+        first.reset_stats()
+        second.reset_stats()
+
+    def _move(self, side: int, index) -> Move:
+        moves = self.monsters[side].get_moves()
+        if isinstance(index, int) and 0 <= index < len(moves) and moves[index].is_usable():
+            return moves[index]
+        return Move.from_spec(STRUGGLE)
+
+    def resolve(self, index_0, index_1) -> List[Dict]:
+        """
+        Resolve one turn.
+
+        Args:
+            index_0: Move index chosen by side 0.
+            index_1: Move index chosen by side 1.
+
+        Returns:
+            List[Dict]: Attack and faint events in order.
+        """
+        if self.over:
+            return []
+        events: List[Dict] = []
+        choices = (index_0, index_1)
+        order = (0, 1) if self.turn % 2 else (1, 0)
+        for side in order:
+            attacker, target = self.monsters[side], self.monsters[1 - side]
+            mv = self._move(side, choices[side])
+            outcome = attacker.attack(target, mv, crit_chance=self.crit_chance, rng=self.rng)
+            event = {"type": "attack", "side": side, "move": mv.name}
+            event.update(outcome)
+            events.append(event)
+            if target.is_fainted():
+                events.append({"type": "faint", "side": 1 - side})
+                self.winner = side
+                self.over = True
+                return events
+        self.turn += 1
+        if self.turn > self.max_turns:
+            self.over = True
+        return events
+
+    def forfeit(self, side: int) -> List[Dict]:
+        """
+        End the battle with side conceding; the other side wins.
+
+        Args:
+            side (int): Side that forfeits.
+
+        Returns:
+            List[Dict]: The forfeit event (empty if the battle was over).
+        """
+        if self.over:
+            return []
+        self.winner = 1 - side
+        self.over = True
+        return [{"type": "forfeit", "side": side}]
+
+    def random_choice(self, side: int) -> int:
+        """Return a random usable move index for side (0 if none)."""
+        moves = self.monsters[side].get_moves()
+        usable = [i for i, mv in enumerate(moves) if mv.is_usable()]
+        return self.rng.choice(usable) if usable else 0
+
+
+class _Connection:
+    """
+    Write side of one client connection, with the seats it holds by pid.
+
+    Messages queued during one event-loop iteration are flushed with a
+    single write; senders only wait for drain() once the transport buffer
+    passes its high-water mark.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.closed = False
+        self.seats: Dict[object, "_Seat"] = {}
+        self._buffer: List[str] = []
+
+    def _flush(self):
+        data, self._buffer = self._buffer, []
+        if not self.closed:
+            self.writer.write(("\n".join(data) + "\n").encode())
+
+    async def send(self, message: Dict):
+        if self.closed:
+            return
+        if not self._buffer:
+            asyncio.get_running_loop().call_soon(self._flush)
+        self._buffer.append(_encode(message))
+        transport = self.writer.transport
+        if transport.get_write_buffer_size() > transport.get_write_buffer_limits()[1]:
+            try:
+                await self.writer.drain()
+            except (ConnectionError, RuntimeError):
+                self.closed = True
+
+
+class _Seat:
+    """One player (connection, pid) taking part in a duel."""
+
+    def __init__(self, conn: _Connection, pid, name: str, monster: Monster):
+        self.conn = conn
+        self.pid = pid
+        self.name = name
+        self.monster = monster
+        self.turn = 0
+        self.move: Optional[asyncio.Future] = None
+
+    async def send(self, message: Dict):
+        message["pid"] = self.pid
+        await self.conn.send(message)
+
+
+class DuelServer:
+    """
+    Matches joined players into concurrent DuelBattles.
+    """
+
+    def __init__(self, registry: SpeciesRegistry, turn_timeout: float = DEFAULT_TURN_TIMEOUT,
+                 max_battles: int = DEFAULT_MAX_BATTLES, lobby_size: Optional[int] = None,
+                 max_turns: int = DEFAULT_MAX_TURNS, seed: Optional[int] = None):
+        """
+        Initialize the server (call start_tcp or start_unix to listen).
+
+        Args:
+            registry (SpeciesRegistry): Species players may choose.
+            turn_timeout (float): Seconds each player has per turn.
+            max_battles (int): Duels allowed to run at once.
+            lobby_size (int): Joined players allowed to wait (default
+                2 * max_battles).
+            max_turns (int): Turn cap per duel.
+            seed (int): Seed of the server's GameRNG (one child per duel).
+        """
+        self.registry = registry
+        self.turn_timeout = turn_timeout
+        self.max_turns = max_turns
+        self.rng = GameRNG(seed)
+        self.battles_started = 0
+        self.battles_finished = 0
+        self._slots = asyncio.Semaphore(max_battles)
+        self._lobby: asyncio.Queue = asyncio.Queue(lobby_size or 2 * max_battles)
+        self._tasks: set = set()
+        self._matchmaker: Optional[asyncio.Task] = None
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        """Listen on TCP; port 0 picks a free port."""
+        self._start_matchmaker()
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        """Listen on a Unix domain socket."""
+        self._start_matchmaker()
+        return await asyncio.start_unix_server(self.handle_connection, path)
+
+    def _start_matchmaker(self):
+        if self._matchmaker is None:
+            self._matchmaker = asyncio.create_task(self._match_players())
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Read one client's messages until it disconnects."""
+        conn = _Connection(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    msg = json.loads(line)
+                    op = msg.get("op")
+                except (ValueError, AttributeError):
+                    await conn.send({"event": "error", "message": "Malformed message"})
+                    continue
+                pid = msg.get("pid", 0)
+                if isinstance(pid, bool) or not isinstance(pid, (int, str)):
+                    await conn.send({"event": "error", "message": f"Invalid pid {pid!r}"})
+                    continue
+                if op == "move":
+                    self._on_move(conn, msg)
+                elif op == "join":
+                    await self._on_join(conn, msg)
+                else:
+                    await conn.send({"event": "error", "pid": msg.get("pid"),
+                                     "message": f"Unknown op {op!r}"})
+        except ConnectionError:
+            pass
+        finally:
+            conn.closed = True
+            # Wake this connection's duels so they forfeit now instead of
+            # timing out turn after turn
+            for seat in conn.seats.values():
+                if seat.move is not None and not seat.move.done():
+                    seat.move.set_result(None)
+            conn.seats.clear()
+            writer.close()
+
+    async def _on_join(self, conn: _Connection, msg: Dict):
+        pid = msg.get("pid", 0)
+        species = msg.get("species")
+        if not isinstance(species, str) or species not in self.registry:
+            await conn.send({"event": "error", "pid": pid, "message": f"Unknown species {species!r}"})
+            return
+        if pid in conn.seats:
+            await conn.send({"event": "error", "pid": pid, "message": f"Player {pid!r} already joined"})
+            return
+        seat = conn.seats[pid] = _Seat(conn, pid, str(msg.get("name") or "Trainer"),
+                                       self.registry.spawn(species))
+        # Blocks (and stops reading this connection) while the lobby is full
+        await self._lobby.put(seat)
+
+    def _on_move(self, conn: _Connection, msg: Dict):
+        seat = conn.seats.get(msg.get("pid", 0))
+        if seat is None or seat.move is None or seat.move.done():
+            return
+        if msg.get("turn", seat.turn) == seat.turn:
+            seat.move.set_result(msg.get("index"))
+
+    async def _match_players(self):
+        waiting: Optional[_Seat] = None
+        while True:
+            seat = await self._lobby.get()
+            # Players that disconnected while in the lobby are never matched
+            if seat.conn.closed:
+                continue
+            if waiting is None or waiting.conn.closed:
+                waiting = seat
+                continue
+            first, waiting = waiting, None
+            await self._slots.acquire()
+            task = asyncio.create_task(self._run_duel(first, seat))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _wait_for_moves(self, seats):
+        """Wait until both seats moved, the turn times out or a player disconnects."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.turn_timeout
+        pending = {seat.move for seat in seats}
+        while pending and not any(seat.conn.closed for seat in seats):
+            left = deadline - loop.time()
+            if left <= 0:
+                break
+            _, pending = await asyncio.wait(pending, timeout=left, return_when=asyncio.FIRST_COMPLETED)
+
+    async def _run_duel(self, a: _Seat, b: _Seat):
+        self.battles_started += 1
+        battle_id = self.battles_started
+        try:
+            battle = DuelBattle(a.monster, b.monster, rng=self.rng.split(), max_turns=self.max_turns)
+            seats = (a, b)
+            for side, seat in enumerate(seats):
+                other = seats[1 - side]
+                await seat.send({"event": "start", "battle": battle_id, "opponent": other.name,
+                                 "monster": str(seat.monster), "opponent_monster": str(other.monster),
+                                 "moves": [mv.name for mv in seat.monster.get_moves()]})
+            events: List[Dict] = []
+            loop = asyncio.get_running_loop()
+            while not battle.over:
+                gone = next((side for side, seat in enumerate(seats) if seat.conn.closed), None)
+                if gone is not None:
+                    events = battle.forfeit(gone)
+                    break
+                for side, seat in enumerate(seats):
+                    seat.turn = battle.turn
+                    seat.move = loop.create_future()
+                    await seat.send({"event": "turn", "turn": battle.turn,
+                                     "hp": seat.monster.current_hp,
+                                     "opponent_hp": seats[1 - side].monster.current_hp,
+                                     "events": events})
+                await self._wait_for_moves(seats)
+                choices = [seat.move.result() if seat.move.done() else battle.random_choice(side)
+                           for side, seat in enumerate(seats)]
+                for seat in seats:
+                    seat.move.cancel()
+                if not any(seat.conn.closed for seat in seats):
+                    events = battle.resolve(*choices)
+            for side, seat in enumerate(seats):
+                outcome = DRAW if battle.winner is None else (WIN if battle.winner == side else LOSS)
+                await seat.send({"event": "result", "outcome": outcome,
+                                 "turns": battle.turn - (battle.winner is None), "events": events})
+        finally:
+            for seat in (a, b):
+                if seat.conn.seats.get(seat.pid) is seat:
+                    del seat.conn.seats[seat.pid]
+            self.battles_finished += 1
+            self._slots.release()
+
+    async def close(self):
+        """Stop matchmaking and cancel running duels."""
+        if self._matchmaker is not None:
+            self._matchmaker.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(self._matchmaker, *self._tasks, return_exceptions=True)
+
+
+class BotClient:
+    """
+    Local test client playing many duels over one connection.
+
+    Every bot player joins with the given species and answers each turn
+    with a random move index. Turn latency (move sent -> next event for
+    that player) is recorded in latencies.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 pids: List[int], species: List[str], seed: Optional[int] = None,
+                 think_time: float = 0.0):
+        """
+        Initialize the bot.
+
+        Args:
+            reader, writer: Connected stream pair.
+            pids (List[int]): Player IDs simulated by this connection.
+            species (List[str]): Species to pick from (round robin by pid).
+            seed (int): Seed for the bot's move choices.
+            think_time (float): Delay before answering each turn.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.conn = _Connection(writer)
+        self.pids = pids
+        self.species = species
+        self.rng = GameRNG(seed)
+        self.think_time = think_time
+        self.latencies: List[float] = []
+        self.results: Dict[int, Dict] = {}
+        self._sent_at: Dict[int, float] = {}
+        self._moves: Dict[int, int] = {}
+
+    async def _answer(self, pid: int, turn: int):
+        if self.think_time:
+            await asyncio.sleep(self.think_time)
+        self._sent_at[pid] = asyncio.get_running_loop().time()
+        await self.conn.send({"op": "move", "pid": pid, "turn": turn,
+                              "index": int(self.rng.random() * self._moves.get(pid, 1))})
+
+    async def play(self) -> Dict[int, Dict]:
+        """Join every pid, play until all duels end and return results by pid."""
+        for pid in self.pids:
+            await self.conn.send({"op": "join", "pid": pid, "name": f"Bot{pid}",
+                                  "species": self.species[pid % len(self.species)]})
+        loop = asyncio.get_running_loop()
+        tasks = set()
+        while len(self.results) < len(self.pids):
+            line = await self.reader.readline()
+            if not line:
+                break
+            msg = json.loads(line)
+            pid = msg.get("pid")
+            sent = self._sent_at.pop(pid, None)
+            if sent is not None:
+                self.latencies.append(loop.time() - sent)
+            event = msg.get("event")
+            if event == "start":
+                self._moves[pid] = len(msg["moves"])
+            elif event == "turn":
+                if self.think_time:
+                    task = asyncio.create_task(self._answer(pid, msg["turn"]))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                else:
+                    await self._answer(pid, msg["turn"])
+            elif event in ("result", "error"):
+                self.results[pid] = msg
+        self.writer.close()
+        return self.results
+
+
+async def run_load_test(battles: int, connections: int = 100, registry: Optional[SpeciesRegistry] = None,
+                        path: Optional[str] = None, seed: int = 0,
+                        turn_timeout: float = 60.0) -> Dict:
+    """
+    Run battles concurrent duels between bot players against a local server.
+
+    Args:
+        battles (int): Concurrent duels (2 * battles bot players).
+        connections (int): Client connections the players are spread over.
+        registry (SpeciesRegistry): Species roster (default main's roster).
+        path (str): Unix socket path; TCP on localhost if None.
+        seed (int): Seed for server and bots.
+        turn_timeout (float): Server turn timeout.
+
+    Returns:
+        Dict: battles, turns, seconds, p50_ms, p99_ms and outcome counts.
+    """
+    if registry is None:
+        from main import create_default_moves, create_monsters
+        registry = SpeciesRegistry(create_monsters(create_default_moves()))
+    server = DuelServer(registry, turn_timeout=turn_timeout, max_battles=battles, seed=seed)
+    if path:
+        listener = await server.start_unix(path)
+    else:
+        listener = await server.start_tcp()
+        port = listener.sockets[0].getsockname()[1]
+    players = list(range(2 * battles))
+    connections = max(1, min(connections, len(players)))
+    bots = []
+    for c in range(connections):
+        if path:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        bots.append(BotClient(reader, writer, players[c::connections], registry.names(),
+                              seed=seed + c + 1))
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(*(bot.play() for bot in bots))
+    elapsed = loop.time() - start
+    await server.close()
+    listener.close()
+    await listener.wait_closed()
+
+    latencies = sorted(x for bot in bots for x in bot.latencies)
+    outcomes: Dict[str, int] = {}
+    for bot in bots:
+        for res in bot.results.values():
+            key = res.get("outcome", "error")
+            outcomes[key] = outcomes.get(key, 0) + 1
+
+    def pick(q: float) -> float:
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    return {"battles": battles, "turns": len(latencies), "seconds": elapsed,
+            "p50_ms": pick(0.50), "p99_ms": pick(0.99), "outcomes": outcomes}
+
+
+def main():
+    """Serve duels over TCP, or run the load test with --load."""
+    parser = argparse.ArgumentParser(description="Monster Trainer duel server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="serve on a Unix socket path instead")
+    parser.add_argument("--turn-timeout", type=float, default=DEFAULT_TURN_TIMEOUT)
+    parser.add_argument("--max-battles", type=int, default=DEFAULT_MAX_BATTLES)
+    parser.add_argument("--load", type=int, nargs="*", default=None,
+                        help="run the load test at these battle counts (default 1000 10000)")
+    parser.add_argument("--connections", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.load is not None:
+        for battles in args.load or [1_000, 10_000]:
+            r = asyncio.run(run_load_test(battles, args.connections, path=args.unix))
+            print(f"{battles:>7,} battles: {r['turns']:>9,} turns in {r['seconds']:6.1f}s  "
+                  f"p50 {r['p50_ms']:7.2f} ms  p99 {r['p99_ms']:7.2f} ms  {r['outcomes']}")
+        return
+
+    from main import create_default_moves, create_monsters
+
+    async def serve():
+        server = DuelServer(SpeciesRegistry(create_monsters(create_default_moves())),
+                            turn_timeout=args.turn_timeout, max_battles=args.max_battles)
+        if args.unix:
+            listener = await server.start_unix(args.unix)
+        else:
+            listener = await server.start_tcp(args.host, args.port)
+        print(f"Serving duels on {args.unix or f'{args.host}:{args.port}'}")
+        async with listener:
+            await listener.serve_forever()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# events.py
+
+"""
+Event bus and sinks for battle output.
+
+Battles publish structured event dicts (the BattleEngine events plus
+"encounter", "turn" and "result" events from the game loop) to an
+EventBus, which hands them to its sinks:
+
+    TerminalRenderer  formats events as text and writes everything
+                      buffered since the last flush() in one write
+    JsonLinesSink     one JSON object per line, for log pipelines
+    NullSink          discards everything
+
+A bus with no sinks (or only NullSinks) is disabled: publish() returns
+immediately, and publishers can check bus.enabled before building
+events at all, so simulations pay nothing for rendering.
+"""
+
+from typing import Dict, IO, Iterable, List, Optional
+import json
+import sys
+
+from battle import PLAYER_SIDE
+
+
+def format_event(ev: Dict) -> List[str]:
+    """
+    Return the terminal lines for one event.
+
+    Args:
+        ev (Dict): Event dict with a "type" key.
+
+    Returns:
+        List[str]: Lines to print (may be empty).
+    """
+    kind = ev["type"]
+    if kind == "attack":
+        lines = []
+        if ev["side"] == PLAYER_SIDE:
+            if ev["used_pp"] == 0:
+                return [f"{ev['monster']} tried to use {ev['move']} but had no PP!"]
+            lines.append(f"{ev['monster']} used {ev['move']}!")
+            if ev["critical"]:
+                lines.append("A critical hit!")
+            if ev["multiplier"] > 1.0:
+                lines.append("It's super effective!")
+            elif ev["multiplier"] < 1.0:
+                lines.append("It's not very effective...")
+        else:
+            if ev["used_pp"] == 0:
+                return [f"The wild {ev['monster']} tried {ev['move']} but had no PP!"]
+            lines.append(f"The wild {ev['monster']} used {ev['move']}!")
+            if ev["critical"]:
+                lines.append("A critical hit from the wild monster!")
+            if ev["multiplier"] > 1.0:
+                lines.append("It's super effective against you!")
+            elif ev["multiplier"] < 1.0:
+                lines.append("It's not very effective...")
+        lines.append(f"It dealt {ev['damage']} damage!")
+        return lines
+    if kind == "capture":
+        if ev["success"]:
+            return [f"You threw a {ev['item']}... and captured {ev['monster']}!"]
+        return ["The Monster Ball failed to capture it."]
+    if kind == "run":
+        return ["You successfully ran away!" if ev["success"] else "Couldn't escape!"]
+    if kind == "faint":
+        if ev["side"] == PLAYER_SIDE:
+            return [f"\n{ev['monster']} fainted! You lost this encounter."]
+        return [f"\nThe wild {ev['monster']} fainted!"]
+    if kind == "encounter":
+        return [f"\nA wild {ev['monster']} appeared!"]
+    if kind == "turn":
+        return [f"\n--- Turn {ev['turn']} ---",
+                f"{ev['player_monster']}: {ev['player_hp']}/{ev['player_max_hp']} HP",
+                f"{ev['wild_monster']}: {ev['wild_hp']}/{ev['wild_max_hp']} HP"]
+    if kind == "result":
+        return []
+    return [ev["message"]]
+
+
+class NullSink:
+    """Sink that discards every event."""
+
+    def handle(self, event: Dict):
+        """Ignore event."""
+
+    def flush(self):
+        """Nothing to flush."""
+
+
+class TerminalRenderer:
+    """
+    Renders events as text, buffering lines until flush().
+    """
+
+    def __init__(self, stream: Optional[IO[str]] = None):
+        """
+        Initialize the renderer.
+
+        Args:
+            stream (IO[str]): Text stream (default sys.stdout at flush time).
+        """
+        self.stream = stream
+        self._lines: List[str] = []
+
+    def handle(self, event: Dict):
+        """Format event into the buffer."""
+        self._lines += format_event(event)
+
+    def flush(self):
+        """Write the buffered lines with a single write call."""
+        if not self._lines:
+            return
+        stream = self.stream or sys.stdout
+        stream.write("\n".join(self._lines) + "\n")
+        stream.flush()
+        self._lines.clear()
+
+
+class JsonLinesSink:
+    """
+    Writes each event as one JSON line, buffered until flush().
+    """
+
+    def __init__(self, target):
+        """
+        Initialize the sink.
+
+        Args:
+            target: Path (opened for appending) or writable text stream.
+        """
+        if hasattr(target, "write"):
+            self._file = target
+            self._owns_file = False
+        else:
+            self._file = open(target, "a", encoding="utf-8")
+            self._owns_file = True
+        self._encode = json.JSONEncoder(separators=(",", ":")).encode
+        self._lines: List[str] = []
+
+    def handle(self, event: Dict):
+        """Encode event into the buffer."""
+        self._lines.append(self._encode(event))
+
+    def flush(self):
+        """Write the buffered lines with a single write call."""
+        if self._lines:
+            self._file.write("\n".join(self._lines) + "\n")
+            self._file.flush()
+            self._lines.clear()
+
+    def close(self):
+        """Flush and close the file (streams passed in stay open)."""
+        self.flush()
+        if self._owns_file:
+            self._file.close()
+
+
+class EventBus:
+    """
+    Delivers published events to every subscribed sink.
+    """
+
+    def __init__(self, sinks: Iterable = ()):
+        """
+        Initialize the bus.
+
+        Args:
+            sinks (Iterable): Initial sinks (objects with handle() and flush()).
+        """
+        self._sinks: List = []
+        for sink in sinks:
+            self.subscribe(sink)
+
+    @property
+    def enabled(self) -> bool:
+        """True if any sink will see published events."""
+        return bool(self._sinks)
+
+    def subscribe(self, sink):
+        """Add a sink (NullSinks are accepted but never called)."""
+        if not isinstance(sink, NullSink) and sink not in self._sinks:
+            self._sinks.append(sink)
+
+    def unsubscribe(self, sink):
+        """Remove a sink if subscribed."""
+        if sink in self._sinks:
+            self._sinks.remove(sink)
+
+    def publish(self, event: Dict):
+        """Send one event to every sink."""
+        for sink in self._sinks:
+            sink.handle(event)
+
+    def publish_many(self, events: List[Dict]):
+        """Send a turn's events to every sink (usable as BattleEngine.run's on_events)."""
+        for sink in self._sinks:
+            handle = sink.handle
+            for event in events:
+                handle(event)
+
+    def flush(self):
+        """Flush every sink, e.g. once per battle turn."""
+        for sink in self._sinks:
+            sink.flush()
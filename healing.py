@@ -0,0 +1,73 @@
+# healing.py
+
+"""
+Bulk "healing center" for Monster Trainer Game.
+
+Restores HP and PP for whole collections in one call instead of a
+Monster.reset_stats (and Move.reset_pp) call per monster:
+
+    list / Team of Monsters  one tight loop writing HP and PP directly,
+                             keeping Team aggregates in sync
+    MonsterStore             whole-column writes (NumPy when available)
+    PCBox                    strided in-place copies over the mapped file
+
+heal_all() picks the right path for its argument; heal_player() heals a
+player's team and PC box.
+"""
+
+from typing import Iterable
+
+from monster import Monster
+from monster_store import MonsterStore
+from pc_box import PCBox
+
+
+def heal_monsters(monsters: Iterable[Monster]) -> int:
+    """
+    Restore every monster to full HP and PP.
+
+    Args:
+        monsters (Iterable[Monster]): Monsters (e.g. a list or Team).
+
+    Returns:
+        int: Number of monsters healed.
+    """
+    count = 0
+    for mon in monsters:
+        mon.current_hp = mon.max_hp
+        for mv in mon.moves:
+            mv.current_pp = mv.spec.max_pp
+        count += 1
+    return count
+
+
+def heal_all(target) -> int:
+    """
+    Restore every monster held by target to full HP and PP.
+
+    Args:
+        target: MonsterStore, PCBox, or any iterable of Monsters.
+
+    Returns:
+        int: Number of monsters healed.
+    """
+    if isinstance(target, (MonsterStore, PCBox)):
+        target.heal_all()
+        return len(target)
+    return heal_monsters(target)
+
+
+def heal_player(player) -> int:
+    """
+    Heal a player's team and, if set, their PC box.
+
+    Args:
+        player (Player): Player to heal.
+
+    Returns:
+        int: Number of monsters healed.
+    """
+    healed = heal_monsters(player.team)
+    if player.box is not None:
+        healed += heal_all(player.box)
+    return healed
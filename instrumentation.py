@@ -0,0 +1,292 @@
+# instrumentation.py
+
+"""
+Opt-in instrumentation and profiling hooks for battle resolution.
+
+enable() wraps Monster.attack, Move.use_move, Item.apply_effect and
+BattleEngine.step (one call per battle turn, including capture rolls) so
+they record counters and log2 latency histograms into STATS; disable()
+puts the original functions back, so there is no overhead at all while
+instrumentation is off.
+
+profiling() and profile_encounter() run a single encounter under
+cProfile and tracemalloc and produce a text report.
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+
+from battle import BattleEngine, random_attack_policy
+from item import Item
+from monster import Monster
+from move import Move, TYPE_MATRIX
+
+# Bucket b counts latencies in [2**(b-1), 2**b) nanoseconds
+HISTOGRAM_BUCKETS = 64
+
+
+class Histogram:
+    """
+    Latency histogram with power-of-two nanosecond buckets.
+    """
+
+    __slots__ = ("buckets", "count", "total_ns")
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.buckets: List[int] = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+
+    def record(self, ns: int):
+        """Record one latency in nanoseconds."""
+        self.buckets[min(ns.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total_ns += ns
+
+    def clear(self):
+        """Drop every recorded latency."""
+        self.buckets[:] = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+
+    def mean_ns(self) -> float:
+        """Return the mean latency in nanoseconds."""
+        return self.total_ns / self.count if self.count else 0.0
+
+    def percentile_ns(self, pct: float) -> int:
+        """
+        Return an upper bound for the pct-th percentile latency.
+
+        Args:
+            pct (float): Percentile between 0 and 100.
+
+        Returns:
+            int: Upper edge (ns) of the bucket holding the percentile.
+        """
+        if not self.count:
+            return 0
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for b, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return 1 << b
+        return 1 << (HISTOGRAM_BUCKETS - 1)
+
+
+class Stats:
+    """
+    Counters and latency histograms collected while instrumentation is on.
+    """
+
+    def __init__(self):
+        """Initialize empty stats."""
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, Histogram] = {}
+
+    def reset(self):
+        """
+        Clear every counter and histogram.
+
+        Histograms are emptied in place: the enable() wrappers hold them
+        directly, so they keep recording after a reset.
+        """
+        self.counters.clear()
+        for hist in self.histograms.values():
+            hist.clear()
+
+    def count(self, name: str, n: int = 1):
+        """Add n to a counter."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def histogram(self, name: str) -> Histogram:
+        """Return (creating if needed) a named histogram."""
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = Histogram()
+        return hist
+
+    def report(self) -> str:
+        """Return counters and latency percentiles as text."""
+        lines = ["Counters:"]
+        for name in sorted(self.counters):
+            lines.append(f"  {name:<22}{self.counters[name]:>12,}")
+        lines.append(f"{'Latency (ns):':<22}{'count':>9}{'mean':>10}{'p50':>10}{'p99':>10}")
+        for name in sorted(self.histograms):
+            h = self.histograms[name]
+            lines.append(f"  {name:<20}{h.count:>9,}{h.mean_ns():>10,.0f}"
+                         f"{h.percentile_ns(50):>10,}{h.percentile_ns(99):>10,}")
+        return "\n".join(lines)
+
+
+STATS = Stats()
+
+# (owner class, attribute) -> original function while enabled
+_originals: Dict[tuple, Callable] = {}
+
+
+def is_enabled() -> bool:
+    """Return True while the wrappers are installed."""
+    return bool(_originals)
+
+
+def _patch(owner, attr: str, make_wrapper: Callable[[Callable], Callable]):
+    original = owner.__dict__[attr]
+    _originals[(owner, attr)] = original
+    setattr(owner, attr, wraps(original)(make_wrapper(original)))
+
+
+def enable(stats: Optional[Stats] = None):
+    """
+    Install the instrumentation wrappers (no-op if already enabled).
+
+    Args:
+        stats (Stats): Destination for measurements (default STATS).
+    """
+    if _originals:
+        return
+    stats = stats or STATS
+    clock = time.perf_counter_ns
+    count = stats.count
+
+    attack_hist = stats.histogram("monster.attack")
+
+    def wrap_attack(original):
+        def attack(self, target, move, crit_chance=0.10, rng=None):
+            start = clock()
+            outcome = original(self, target, move, crit_chance, rng)
+            attack_hist.record(clock() - start)
+            count("attacks")
+            if outcome["critical"]:
+                count("crits")
+            if outcome["used_pp"] and TYPE_MATRIX[move.spec.type_id][target.spec.type_id] > 1.0:
+                count("super_effective")
+            return outcome
+        return attack
+
+    use_hist = stats.histogram("move.use_move")
+
+    def wrap_use_move(original):
+        def use_move(self):
+            had_pp = self.current_pp > 0
+            start = clock()
+            power = original(self)
+            use_hist.record(clock() - start)
+            count("moves_used" if had_pp else "moves_without_pp")
+            return power
+        return use_move
+
+    item_hist = stats.histogram("item.apply_effect")
+
+    def wrap_apply_effect(original):
+        def apply_effect(self, monster):
+            start = clock()
+            result = original(self, monster)
+            item_hist.record(clock() - start)
+            count("items_applied")
+            return result
+        return apply_effect
+
+    turn_hist = stats.histogram("battle.turn")
+
+    def wrap_step(original):
+        def step(self, action):
+            start = clock()
+            events = original(self, action)
+            turn_hist.record(clock() - start)
+            count("turns")
+            for event in events:
+                if event["type"] == "capture":
+                    count("capture_attempts")
+                    if event["success"]:
+                        count("captures")
+            return events
+        return step
+
+    _patch(Monster, "attack", wrap_attack)
+    _patch(Move, "use_move", wrap_use_move)
+    _patch(Item, "apply_effect", wrap_apply_effect)
+    _patch(BattleEngine, "step", wrap_step)
+
+
+def disable():
+    """Restore the original, uninstrumented functions."""
+    for (owner, attr), original in _originals.items():
+        setattr(owner, attr, original)
+    _originals.clear()
+
+
+@contextmanager
+def instrumented(stats: Optional[Stats] = None) -> Iterator[Stats]:
+    """Enable instrumentation for the duration of a with block."""
+    enable(stats)
+    try:
+        yield stats or STATS
+    finally:
+        disable()
+
+
+@contextmanager
+def profiling(report_path: Optional[str] = None, top: int = 20) -> Iterator[Dict[str, str]]:
+    """
+    Run the with block under cProfile and tracemalloc.
+
+    On exit the yielded dict gets a "report" entry (top functions by
+    cumulative time and top allocation sites), also written to
+    report_path if given.
+
+    Args:
+        report_path (str): Optional file for the report.
+        top (int): Rows per section.
+    """
+    result: Dict[str, str] = {}
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        out = io.StringIO()
+        out.write("== cProfile (cumulative) ==\n")
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+        out.write(f"== tracemalloc: current {current:,} B, peak {peak:,} B ==\n")
+        for stat in snapshot.statistics("lineno")[:top]:
+            out.write(f"{stat}\n")
+        result["report"] = out.getvalue()
+        if report_path:
+            with open(report_path, "w") as f:
+                f.write(result["report"])
+
+
+def profile_encounter(player_monster: Monster, wild_monster: Monster,
+                      policy: Callable = random_attack_policy,
+                      report_path: Optional[str] = None, top: int = 20,
+                      **engine_kwargs) -> str:
+    """
+    Play one encounter under cProfile and tracemalloc and return the report.
+
+    Args:
+        player_monster (Monster): Player side.
+        wild_monster (Monster): Wild side.
+        policy (Callable): Player action policy.
+        report_path (str): Optional file for the report.
+        top (int): Rows per report section.
+        **engine_kwargs: Extra BattleEngine arguments (player, rng, ...).
+
+    Returns:
+        str: The profiling report.
+    """
+    with profiling(report_path, top) as result:
+        BattleEngine(player_monster, wild_monster, **engine_kwargs).run(policy)
+    return result["report"]
@@ -0,0 +1,319 @@
+# inventory.py
+
+"""
+Hash-indexed, list-compatible item container for Player inventories.
+
+Items keep their display order and are reached by index exactly like a
+list, but a dict from normalized name (lowercased) to the items sharing
+it makes merge-target lookup in add() - keyed by (normalized name,
+kind) - and name lookup in find()/index_of() O(1) instead of a scan
+calling get_kind() and lower() on every item.
+
+Items live in append-only slots. Removing one leaves a hole instead of
+shifting everything after it; while holes exist a Fenwick tree over the
+slots turns slot numbers into display indices and back in O(log n), and
+the slots are compacted once half of them are holes. Without holes
+(the usual case) index access is a plain list lookup.
+
+Names and kinds are read when an item is added; call reindex() after
+renaming an item or changing what kind of item it is.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from item import Item
+
+# Holes tolerated before compaction is considered
+MIN_HOLES_TO_COMPACT = 32
+
+
+class Inventory:
+    """
+    Ordered item list with O(1) merge and lookup by name.
+    """
+
+    def __init__(self, items: Iterable[Item] = ()):
+        """
+        Initialize the inventory.
+
+        Args:
+            items (Iterable[Item]): Items to hold, in display order (not
+                merged, like list(items)).
+        """
+        self._slots: List[Optional[Item]] = list(items)
+        self._holes = 0
+        # Fenwick tree of live slots (1-based); None while there are no holes
+        self._tree: Optional[List[int]] = None
+        # normalized name -> items with that name (usually one per kind)
+        self._by_name: Dict[str, List[Item]] = {}
+        # id(item) -> slot
+        self._slot_of: Dict[int, int] = {}
+        self.reindex()
+
+    # Slot bookkeeping
+
+    def reindex(self):
+        """Rebuild the lookup tables (after renaming items or changing their kind)."""
+        if self._holes:
+            self._slots = [it for it in self._slots if it is not None]
+            self._holes = 0
+        self._tree = None
+        self._by_name.clear()
+        self._slot_of.clear()
+        by_name = self._by_name
+        for slot, it in enumerate(self._slots):
+            by_name.setdefault(it.name.lower(), []).append(it)
+            self._slot_of[id(it)] = slot
+
+    def _build_tree(self):
+        n = len(self._slots)
+        tree = [0] * (n + 1)
+        for k in range(1, n + 1):
+            tree[k] += self._slots[k - 1] is not None
+            parent = k + (k & -k)
+            if parent <= n:
+                tree[parent] += tree[k]
+        self._tree = tree
+
+    def _rank(self, slot: int) -> int:
+        """Number of live slots before slot (its display index)."""
+        if self._tree is None:
+            return slot
+        tree = self._tree
+        total = 0
+        while slot > 0:
+            total += tree[slot]
+            slot &= slot - 1
+        return total
+
+    def _select(self, index: int) -> int:
+        """Slot holding the item at display index (0 <= index < len)."""
+        if self._tree is None:
+            return index
+        tree = self._tree
+        slot = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = slot + step
+            if nxt < len(tree) and tree[nxt] <= index:
+                slot = nxt
+                index -= tree[nxt]
+            step >>= 1
+        return slot
+
+    def _normalize(self, index: int) -> int:
+        n = len(self._slots) - self._holes
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("inventory index out of range")
+        return index
+
+    def _remove_slot(self, slot: int):
+        item = self._slots[slot]
+        name = item.name.lower()
+        group = self._by_name[name]
+        group.remove(item)
+        if not group:
+            del self._by_name[name]
+        del self._slot_of[id(item)]
+        if slot == len(self._slots) - 1 and self._tree is None:
+            self._slots.pop()
+            return
+        if self._tree is None:
+            self._build_tree()
+        self._slots[slot] = None
+        self._holes += 1
+        k, tree = slot + 1, self._tree
+        while k < len(tree):
+            tree[k] -= 1
+            k += k & -k
+        if self._holes >= MIN_HOLES_TO_COMPACT and 2 * self._holes >= len(self._slots):
+            self.reindex()
+
+    # Keyed operations
+
+    def add(self, item: Item) -> Item:
+        """
+        Merge item into an entry with the same name (any case) and kind, or append it.
+
+        Args:
+            item (Item): Item to add.
+
+        Returns:
+            Item: The inventory entry now holding the quantity.
+        """
+        group = self._by_name.get(item.name.lower())
+        if group:
+            kind = item.get_kind()
+            for it in group:
+                if it.get_kind() == kind:
+                    it.increase_quantity(item.quantity)
+                    return it
+        self.append(item)
+        return item
+
+    def find(self, name: str, kind: Optional[str] = None) -> Optional[Item]:
+        """
+        Return the first item named name (any case), optionally of a given kind.
+
+        Args:
+            name (str): Item name.
+            kind (str): Optional get_kind() value to match.
+
+        Returns:
+            Optional[Item]: Matching item, or None.
+        """
+        group = self._by_name.get(name.lower())
+        if not group:
+            return None
+        if kind is None:
+            return min(group, key=lambda it: self._slot_of[id(it)])
+        for it in group:
+            if it.get_kind() == kind:
+                return it
+        return None
+
+    def index_of(self, name: str) -> int:
+        """
+        Return the index of the first item named name (any case), -1 if none.
+
+        Args:
+            name (str): Item name.
+
+        Returns:
+            int: Display index, or -1.
+        """
+        group = self._by_name.get(name.lower())
+        if not group:
+            return -1
+        return self._rank(min(self._slot_of[id(it)] for it in group))
+
+    def remove_named(self, name: str, kind: Optional[str] = None) -> Optional[Item]:
+        """
+        Remove and return the item find(name, kind) would return.
+
+        Returns:
+            Optional[Item]: Removed item, or None if nothing matched.
+        """
+        item = self.find(name, kind)
+        if item is not None:
+            self._remove_slot(self._slot_of[id(item)])
+        return item
+
+    # List interface
+
+    def append(self, item: Item):
+        """Append item without merging (like list.append)."""
+        slot = len(self._slots)
+        self._slots.append(item)
+        self._by_name.setdefault(item.name.lower(), []).append(item)
+        self._slot_of[id(item)] = slot
+        tree = self._tree
+        if tree is not None:
+            # New node k covers slots (k - lowbit(k), k]; all but the last already exist
+            k = slot + 1
+            tree.append(1 + self._rank(slot) - self._rank(k - (k & -k)))
+
+    def extend(self, items: Iterable[Item]):
+        """Append every item without merging."""
+        for it in items:
+            self.append(it)
+
+    def insert(self, index: int, item: Item):
+        """Insert item before index without merging (O(n))."""
+        items = list(self)
+        items.insert(index, item)
+        self._slots = items
+        self._holes = 0
+        self.reindex()
+
+    def pop(self, index: int = -1) -> Item:
+        """Remove and return the item at index."""
+        slot = self._select(self._normalize(index))
+        item = self._slots[slot]
+        self._remove_slot(slot)
+        return item
+
+    def remove(self, item: Item):
+        """Remove item (by identity); raises ValueError if absent."""
+        if item not in self:
+            raise ValueError("Item not in inventory")
+        self._remove_slot(self._slot_of[id(item)])
+
+    def index(self, item: Item) -> int:
+        """Return the position of item (by identity); raises ValueError if absent."""
+        if item not in self:
+            raise ValueError("Item not in inventory")
+        return self._rank(self._slot_of[id(item)])
+
+    def clear(self):
+        """Remove every item."""
+        self._slots = []
+        self._holes = 0
+        self.reindex()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if self._tree is None:
+            return self._slots[index]
+        return self._slots[self._select(self._normalize(index))]
+
+    def __setitem__(self, index, item):
+        if isinstance(index, slice):
+            items = list(self)
+            items[index] = item
+            self._slots = items
+            self._holes = 0
+            self.reindex()
+            return
+        slot = self._select(self._normalize(index))
+        old = self._slots[slot]
+        name = old.name.lower()
+        group = self._by_name[name]
+        group.remove(old)
+        if not group:
+            del self._by_name[name]
+        del self._slot_of[id(old)]
+        self._slots[slot] = item
+        self._by_name.setdefault(item.name.lower(), []).append(item)
+        self._slot_of[id(item)] = slot
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            items = list(self)
+            del items[index]
+            self._slots = items
+            self._holes = 0
+            self.reindex()
+            return
+        self._remove_slot(self._select(self._normalize(index)))
+
+    def __len__(self) -> int:
+        return len(self._slots) - self._holes
+
+    def __iter__(self) -> Iterator[Item]:
+        if not self._holes:
+            return iter(self._slots)
+        return (it for it in self._slots if it is not None)
+
+    def __reversed__(self) -> Iterator[Item]:
+        return reversed(list(self))
+
+    def __contains__(self, item) -> bool:
+        group = self._by_name.get(getattr(item, "name", "").lower(), ())
+        return any(it is item for it in group)
+
+    def __bool__(self) -> bool:
+        return len(self._slots) > self._holes
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Inventory):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Inventory({list(self)!r})"
@@ -13,8 +13,12 @@ from typing import Tuple
 class Item:
     """
     Represents a consumable item with healing, PP restoration, or capture effects.
+
+    _summary caches get_item_summary(); any field write clears it.
     """
 
+    __slots__ = ("name", "heal", "restore_pp", "quantity", "is_capture", "_summary")
+
     def __init__(self, name: str, heal: int = 0, restore_pp: int = 0,
                  quantity: int = 1, is_capture: bool = False):
         """
@@ -32,6 +36,12 @@ class Item:
         self.restore_pp = int(restore_pp)
         self.quantity = int(quantity)
         self.is_capture = bool(is_capture)
+        self._summary = None
+
+    def __setattr__(self, name: str, value):
+        object.__setattr__(self, name, value)
+        if name != "_summary":
+            object.__setattr__(self, "_summary", None)
 
     def use(self) -> Tuple[int, int]:
         """
@@ -131,10 +141,16 @@ class Item:
         """
         Return UI-friendly description.
 
+        The string is cached until a field (e.g. quantity) is written.
+
         Returns:
             str: Summary string with quantity, name, kind, heal, and PP values.
         """
-        return f"{self.quantity}x {self.name} [{self.get_kind()}] (Heal:{self.heal} PP:{self.restore_pp})"
+        text = self._summary
+        if text is None:
+            text = self._summary = (f"{self.quantity}x {self.name} [{self.get_kind()}] "
+                                    f"(Heal:{self.heal} PP:{self.restore_pp})")
+        return text
 
     def __str__(self):
         return self.get_item_summary()
\ No newline at end of file
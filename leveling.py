@@ -0,0 +1,144 @@
+# leveling.py
+
+"""
+Table-driven leveling and experience for Monster Trainer Game.
+
+Max HP grows by a truncated 10% per level, which has no exact closed
+form. monster.hp_after_levels is the HP table: it caches the chain of
+max HP values per starting max HP, bit-for-bit what repeated level-ups
+give, so Monster.level_up, MonsterStore.level_up and every helper here
+jump any number of levels with one lookup instead of a loop. Keying on
+the starting max HP rather than the species also covers monsters that
+were already leveled or had their max HP changed.
+
+Experience follows a cubic curve: reaching level L takes L**3 total XP.
+XP totals are owned by the caller (save data, battle rewards); the
+functions here turn totals into levels and apply the level change.
+
+Bulk helpers level whole lists, MonsterStores and PC boxes at once.
+"""
+
+from bisect import bisect_right
+from typing import Iterable, List, Optional, Sequence
+
+from monster import Monster, hp_after_levels
+
+MAX_LEVEL = 100
+
+# XP_TABLE[level] = total XP needed to reach level (level 1 needs none)
+XP_TABLE: List[int] = [0, 0] + [level ** 3 for level in range(2, MAX_LEVEL + 1)]
+
+def xp_for_level(level: int) -> int:
+    """
+    Return the total XP needed to reach a level.
+
+    Raises:
+        ValueError: If level is outside 1..MAX_LEVEL.
+    """
+    if not 1 <= level <= MAX_LEVEL:
+        raise ValueError(f"Level must be 1-{MAX_LEVEL}: {level}")
+    return XP_TABLE[level]
+
+
+def level_for_xp(xp: int) -> int:
+    """Return the level reached with xp total experience (capped at MAX_LEVEL)."""
+    return max(1, min(MAX_LEVEL, bisect_right(XP_TABLE, xp) - 1))
+
+
+def xp_reward(defeated: Monster) -> int:
+    """
+    Return the XP earned for defeating a monster.
+
+    Scales with the defeated monster's base HP and level.
+    """
+    return max(1, defeated.spec.base_hp * defeated.level // 7)
+
+
+def set_level(monster: Monster, level: int):
+    """
+    Raise a monster to level in one step (same result as level_up calls).
+
+    Args:
+        monster (Monster): Monster to level.
+        level (int): Target level; lower or equal levels are ignored.
+    """
+    if level > monster.level:
+        monster.level_up(level - monster.level)
+
+
+def add_experience(monster: Monster, xp: int, gained: int) -> int:
+    """
+    Add experience and level the monster up to match its new total.
+
+    Args:
+        monster (Monster): Monster earning the XP.
+        xp (int): Its total XP before this gain.
+        gained (int): XP earned.
+
+    Returns:
+        int: New total XP.
+    """
+    xp += max(0, int(gained))
+    set_level(monster, level_for_xp(xp))
+    return xp
+
+
+def level_up_many(monsters: Iterable[Monster], amount: int = 1):
+    """
+    Level every monster up by amount.
+
+    Args:
+        monsters (Iterable[Monster]): Monsters (team members stay in sync
+            with their Team aggregates).
+        amount (int): Levels to add to each.
+    """
+    if amount <= 0:
+        return
+    for mon in monsters:
+        mon.level_up(amount)
+
+
+def set_levels(monsters: Iterable[Monster], levels: Sequence[int]):
+    """
+    Raise each monster to the matching target level.
+
+    Args:
+        monsters (Iterable[Monster]): Monsters.
+        levels (Sequence[int]): Target level per monster.
+    """
+    for mon, level in zip(monsters, levels):
+        if level > mon.level:
+            mon.level_up(level - mon.level)
+
+
+def add_experience_many(monsters: Sequence[Monster], xps: Sequence[int], gained: int) -> List[int]:
+    """
+    Give every monster the same XP and level them up accordingly.
+
+    Args:
+        monsters (Sequence[Monster]): Monsters earning XP.
+        xps (Sequence[int]): Their total XP before the gain.
+        gained (int): XP earned by each.
+
+    Returns:
+        List[int]: New XP totals, in order.
+    """
+    gained = max(0, int(gained))
+    new_xps = [xp + gained for xp in xps]
+    set_levels(monsters, [level_for_xp(xp) for xp in new_xps])
+    return new_xps
+
+
+def level_up_box(box, amount: int = 1, indices: Optional[Iterable[int]] = None):
+    """
+    Level up records of a pc_box.PCBox in place without materializing them.
+
+    Args:
+        box (PCBox): Box to update.
+        amount (int): Levels to add to each record.
+        indices (Iterable[int]): Records to update (default all).
+    """
+    if amount <= 0:
+        return
+    for i in range(len(box)) if indices is None else indices:
+        box.set_level(i, box.level(i) + amount, hp_after_levels(box.hp(i)[1], amount))
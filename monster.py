@@ -6,16 +6,83 @@ Monster class for Monster Trainer Game.
 Provides HP, level, move list, combat utilities, and management helpers.
 """
 
-from typing import List, Dict
-from move import Move
+from dataclasses import dataclass, replace
+from typing import List, Dict, Tuple
+from move import Move, MoveSpec, TYPE_MATRIX, TYPE_NAMES, move_spec, type_id
 import random
 
 
+# Fallback move used when a monster has no PP left on any move
+STRUGGLE = move_spec("Struggle", power=4, max_pp=9999, type_="Normal")
+
+# Max HP grows by 10% (truncated) per level
+HP_GROWTH = 1.10
+# Starting max HP -> [max HP after 0, 1, 2, ... level-ups]; cleared when too large
+_hp_chains: Dict[int, List[int]] = {}
+_MAX_HP_CHAINS = 1 << 14
+
+
+def hp_after_levels(max_hp: int, levels: int) -> int:
+    """
+    Return max HP after gaining levels, exactly as repeated level-ups compute it.
+
+    Each level maps hp to max(1, int(hp * HP_GROWTH)); the results are
+    cached per starting value, so any jump is a table lookup once the
+    chain is built.
+
+    Args:
+        max_hp (int): Max HP before leveling.
+        levels (int): Levels gained (>= 0).
+
+    Returns:
+        int: Max HP after the level-ups.
+    """
+    chain = _hp_chains.get(max_hp)
+    if chain is None:
+        if len(_hp_chains) >= _MAX_HP_CHAINS:
+            _hp_chains.clear()
+        chain = _hp_chains[max_hp] = [max_hp]
+    while len(chain) <= levels:
+        chain.append(max(1, int(chain[-1] * HP_GROWTH)))
+    return chain[levels]
+
+
+@dataclass(frozen=True, slots=True)
+class SpeciesSpec:
+    """
+    Immutable species definition shared by every Monster of that species.
+
+    base_hp and moves describe a freshly spawned level-1 monster; each
+    Monster keeps its own max_hp, level and move list.
+    """
+
+    name: str
+    type_id: int
+    base_hp: int
+    moves: Tuple[MoveSpec, ...] = ()
+
+    @property
+    def type(self) -> str:
+        """Species type string."""
+        return TYPE_NAMES[self.type_id]
+
+
 class Monster:
     """
     Represents a battle monster with stats, moves, and combat behavior.
+
+    Species data lives in a shared SpeciesSpec; the instance only owns
+    its HP, level and Move list (each Move owning its PP). _teams holds
+    the team.Team objects (one entry per membership) whose aggregates the
+    current_hp / max_hp setters keep up to date. _summary caches
+    get_summary() and is cleared by the HP, level, name and type setters
+    and, through Move._owners, by PP changes of the monster's moves.
+    Neither is copied or pickled. Edit moves with add_move and
+    remove_move_by_name so the summary follows.
     """
 
+    __slots__ = ("spec", "_max_hp", "_hp", "_level", "moves", "_teams", "_summary")
+
     def __init__(self, name: str, type_: str, max_hp: int, moves: List[Move], level: int = 1):
         """
         Initialize a Monster.
@@ -26,13 +93,156 @@ class Monster:
             max_hp (int): Maximum HP.
             moves (List[Move]): List of Move instances.
             level (int): Starting level.
+
+        Raises:
+            ValueError: If type_ is not in the type chart.
         """
-        self.name = name
-        self.type = type_
-        self.max_hp = int(max_hp)
-        self.current_hp = int(max_hp)
-        self.level = int(level)
         self.moves: List[Move] = list(moves)
+        self.spec = SpeciesSpec(name, type_id(type_), int(max_hp),
+                                tuple(mv.spec for mv in self.moves))
+        self._max_hp = int(max_hp)
+        self._hp = int(max_hp)
+        self._level = int(level)
+        self._teams = ()
+        self._summary = None
+        for mv in self.moves:
+            mv._owners += (self,)
+
+    @classmethod
+    def from_spec(cls, spec: SpeciesSpec, level: int = 1) -> "Monster":
+        """
+        Create a full-health Monster from a shared SpeciesSpec.
+
+        Args:
+            spec (SpeciesSpec): Species definition.
+            level (int): Level to record (HP is the species base HP).
+
+        Returns:
+            Monster: New Monster with fresh moves.
+        """
+        return Monster._from_parts(spec, int(level), spec.base_hp, spec.base_hp,
+                                   [Move.from_spec(ms) for ms in spec.moves])
+
+    @classmethod
+    def _from_parts(cls, spec: SpeciesSpec, level: int, max_hp: int, current_hp: int,
+                    moves: List[Move]) -> "Monster":
+        """
+        Build a Monster from already-validated state, bypassing __init__.
+
+        Every construction path that skips __init__ (from_spec, clone,
+        spawn, save loading, PC box records) goes through here so each
+        slot is set.
+
+        Args:
+            spec (SpeciesSpec): Species definition.
+            level (int): Level.
+            max_hp (int): Maximum HP.
+            current_hp (int): Current HP.
+            moves (List[Move]): Move list (used as is, not copied).
+
+        Returns:
+            Monster: New Monster on no team.
+        """
+        mon = Monster.__new__(Monster)
+        mon.spec = spec
+        mon._max_hp = max_hp
+        mon._hp = current_hp
+        mon._level = level
+        mon.moves = moves
+        mon._teams = ()
+        mon._summary = None
+        for mv in moves:
+            mv._owners += (mon,)
+        return mon
+
+    def __reduce__(self):
+        # Copies and pickles carry state only, never team links or caches
+        return Monster._from_parts, (self.spec, self.level, self.max_hp, self.current_hp,
+                                     [mv.clone() for mv in self.moves])
+
+    @property
+    def current_hp(self) -> int:
+        """Current HP (writes keep every containing Team in sync)."""
+        return self._hp
+
+    @current_hp.setter
+    def current_hp(self, value: int):
+        old = self._hp
+        self._hp = value
+        self._summary = None
+        for team in self._teams:
+            team._hp_changed(old, value)
+
+    @property
+    def max_hp(self) -> int:
+        """Maximum HP (writes keep every containing Team in sync)."""
+        return self._max_hp
+
+    @max_hp.setter
+    def max_hp(self, value: int):
+        old = self._max_hp
+        self._max_hp = value
+        self._summary = None
+        for team in self._teams:
+            team._hp_changed(0, 0, old, value)
+
+    @property
+    def level(self) -> int:
+        """Level."""
+        return self._level
+
+    @level.setter
+    def level(self, value: int):
+        self._level = value
+        self._summary = None
+
+    @property
+    def name(self) -> str:
+        """Monster name."""
+        return self.spec.name
+
+    @name.setter
+    def name(self, value: str):
+        self.spec = replace(self.spec, name=value)
+        self._summary = None
+
+    @property
+    def type_id(self) -> int:
+        """Interned type ID."""
+        return self.spec.type_id
+
+    @property
+    def type(self) -> str:
+        """Monster type string."""
+        return TYPE_NAMES[self.spec.type_id]
+
+    @type.setter
+    def type(self, value: str):
+        old = self.spec.type_id
+        self.spec = replace(self.spec, type_id=type_id(value))
+        self._summary = None
+        for team in self._teams:
+            team._type_changed(old, self.spec.type_id)
+
+    def clone(self) -> "Monster":
+        """
+        Return an independent copy including current HP and PP.
+
+        Returns:
+            Monster: New Monster sharing this monster's SpeciesSpec.
+        """
+        return Monster._from_parts(self.spec, self.level, self.max_hp, self.current_hp,
+                                   [mv.clone() for mv in self.moves])
+
+    def spawn(self) -> "Monster":
+        """
+        Return a fresh copy of this monster with full HP and PP.
+
+        Returns:
+            Monster: New Monster, typically spawned from a species prototype.
+        """
+        return Monster._from_parts(self.spec, self.level, self.max_hp, self.max_hp,
+                                   [mv.spawn() for mv in self.moves])
 
     def take_damage(self, amount: int):
         """
@@ -71,19 +281,25 @@ class Monster:
         """Return current move list."""
         return self.moves
 
-    def choose_move_random(self) -> Move:
+    def choose_move_random(self, rng=None) -> Move:
         """
         Return a random usable move.
         If no usable moves remain, return a fallback 'Struggle' move.
+
+        Args:
+            rng: Random source with choice() (e.g. rng.GameRNG); defaults
+                to the global random module.
         """
         usable = [m for m in self.moves if m.is_usable()]
         if not usable:
-            return Move("Struggle", power=4, max_pp=9999, type_="Normal")
-        return random.choice(usable)
+            return Move.from_spec(STRUGGLE)
+        return (random if rng is None else rng).choice(usable)
 
     def add_move(self, move: Move):
         """Add a move to the monster's repertoire."""
         self.moves.append(move)
+        move._owners += (self,)
+        self._summary = None
 
     def remove_move_by_name(self, name: str) -> bool:
         """
@@ -97,6 +313,12 @@ class Monster:
         for i, m in enumerate(self.moves):
             if m.name == name:
                 del self.moves[i]
+                owners = m._owners
+                for k, owner in enumerate(owners):
+                    if owner is self:
+                        m._owners = owners[:k] + owners[k + 1:]
+                        break
+                self._summary = None
                 return True
         return False
 
@@ -109,10 +331,10 @@ class Monster:
         """
         if amount <= 0:
             return
-        for _ in range(int(amount)):
-            self.level += 1
-            self.max_hp = max(1, int(self.max_hp * 1.10))
-        self.current_hp = min(self.current_hp, self.max_hp)
+        self.level += int(amount)
+        self.max_hp = hp_after_levels(self.max_hp, int(amount))
+        if self.current_hp > self.max_hp:
+            self.current_hp = self.max_hp
 
     def effective_hp_ratio(self) -> float:
         """
@@ -125,7 +347,7 @@ class Monster:
             return 0.0
         return float(self.current_hp) / float(self.max_hp)
 
-    def attack(self, target: "Monster", move: Move, crit_chance: float = 0.10) -> Dict:
+    def attack(self, target: "Monster", move: Move, crit_chance: float = 0.10, rng=None) -> Dict:
         """
         Attack a target monster using a move.
 
@@ -133,6 +355,7 @@ class Monster:
             target (Monster): Target monster.
             move (Move): Move used in attack.
             crit_chance (float): Probability of critical hit.
+            rng: Random source with random(); defaults to the random module.
 
         Returns:
             Dict: Outcome with keys:
@@ -145,8 +368,8 @@ class Monster:
         if base <= 0:
             return {"damage": 0, "critical": False, "multiplier": 0.0, "used_pp": 0}
 
-        type_mult = move.get_multiplier(target.type)
-        critical = (random.random() < crit_chance)
+        type_mult = TYPE_MATRIX[move.spec.type_id][target.spec.type_id]
+        critical = ((random if rng is None else rng).random() < crit_chance)
         crit_mult = 1.5 if critical else 1.0
 
         damage = int(base * type_mult * crit_mult)
@@ -159,8 +382,19 @@ class Monster:
         }
 
     def get_summary(self) -> str:
-        """Return multi-line summary string for UI including moves."""
-        moves_str = ", ".join([mv.get_move_summary() for mv in self.moves])
+        """
+        Return multi-line summary string for UI including moves.
+
+        The string is cached until a setter marks it stale (see the
+        class docstring).
+        """
+        text = self._summary
+        if text is None:
+            text = self._summary = self._format_summary()
+        return text
+
+    def _format_summary(self) -> str:
+        moves_str = ", ".join(mv.get_move_summary() for mv in self.moves)
         return f"{self.name} (Lvl {self.level}) Type:{self.type} HP:{self.current_hp}/{self.max_hp} Moves:[{moves_str}]"
 
     def get_hp_status(self) -> str:
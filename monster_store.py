@@ -0,0 +1,354 @@
+# monster_store.py
+
+"""
+Struct-of-arrays storage for large monster collections.
+
+MonsterStore keeps per-monster state (species, level, HP and PP per move
+slot) in compact array.array columns and shares SpeciesSpec entries (name,
+type and move definitions) between all monsters of a species. Indexing
+the store returns a MonsterView, a lightweight Monster whose attributes
+read and write the columns, so the existing Monster API keeps working.
+Writes outside a column's range raise ValueError before anything is
+stored.
+"""
+
+from array import array
+from dataclasses import replace
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from monster import Monster, SpeciesSpec, hp_after_levels
+from move import Move, MoveSpec
+
+# Largest value each column type can hold
+LEVEL_MAX = 0xFFFF  # 'H'
+HP_MAX = 0xFFFFFFFF  # 'I'
+PP_MAX = 0xFFFF  # 'H'
+
+
+def _checked(field: str, value: int, maximum: int) -> int:
+    """
+    Return value if it fits its column.
+
+    Raises:
+        ValueError: If value is negative or above maximum.
+    """
+    if not 0 <= value <= maximum:
+        raise ValueError(f"{field} {value!r} is outside the stored range 0..{maximum}")
+    return value
+
+
+class MoveView(Move):
+    """
+    Move whose PP lives in a MonsterStore column.
+
+    The store rewrites columns in bulk, so views never cache summaries.
+    """
+
+    __slots__ = ("_store", "_index", "_slot")
+
+    def __init__(self, store: "MonsterStore", index: int, slot: int, spec: MoveSpec):
+        """
+        Initialize a view of one move slot.
+
+        Args:
+            store (MonsterStore): Owning store.
+            index (int): Monster index in the store.
+            slot (int): Move slot of the monster.
+            spec (MoveSpec): Shared definition of the move in that slot.
+        """
+        self._store = store
+        self._index = index
+        self._slot = slot
+        self.spec = spec
+        self._owners = ()
+        self._summary = None
+
+    # Backing field of Move.current_pp
+    @property
+    def _pp(self) -> int:
+        return self._store._pp[self._slot][self._index]
+
+    @_pp.setter
+    def _pp(self, value: int):
+        self._store._pp[self._slot][self._index] = _checked("PP", value, PP_MAX)
+
+    def get_move_summary(self) -> str:
+        """Return compact summary useful for UIs (built from the store each call)."""
+        return self._format_summary()
+
+
+class MonsterView(Monster):
+    """
+    Monster whose state lives in MonsterStore columns.
+
+    The move set comes from the row's SpeciesSpec; editing it gives the
+    row a species entry listing its new moves. The store rewrites columns
+    in bulk, so views never cache summaries.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "MonsterStore", index: int):
+        """
+        Initialize a view of one stored monster.
+
+        Args:
+            store (MonsterStore): Owning store.
+            index (int): Monster index in the store.
+        """
+        self._store = store
+        self._index = index
+        self._teams = ()
+        self._summary = None
+
+    @property
+    def spec(self) -> SpeciesSpec:
+        return self._store._species[self._store._species_col[self._index]]
+
+    @spec.setter
+    def spec(self, value: SpeciesSpec):
+        self._store._species_col[self._index] = self._store._species_id(value)
+
+    # Backing fields of Monster.max_hp / current_hp / level, whose setters
+    # keep Teams in sync
+    @property
+    def _max_hp(self) -> int:
+        return self._store._max_hp[self._index]
+
+    @_max_hp.setter
+    def _max_hp(self, value: int):
+        self._store._max_hp[self._index] = _checked("Max HP", value, HP_MAX)
+
+    @property
+    def _hp(self) -> int:
+        return self._store._current_hp[self._index]
+
+    @_hp.setter
+    def _hp(self, value: int):
+        self._store._current_hp[self._index] = _checked("HP", value, HP_MAX)
+
+    @property
+    def _level(self) -> int:
+        return self._store._level[self._index]
+
+    @_level.setter
+    def _level(self, value: int):
+        self._store._level[self._index] = _checked("Level", value, LEVEL_MAX)
+
+    @property
+    def moves(self) -> List[Move]:
+        store, i = self._store, self._index
+        specs = store._species[store._species_col[i]].moves
+        return [MoveView(store, i, slot, ms) for slot, ms in enumerate(specs)]
+
+    def get_summary(self) -> str:
+        """Return the UI summary (built from the store each call)."""
+        return self._format_summary()
+
+    def add_move(self, move: Move):
+        """Add a move to the stored monster (its spec and current PP are copied)."""
+        pp = _checked("PP", move.current_pp, PP_MAX)
+        spec = self.spec
+        self.spec = replace(spec, moves=spec.moves + (move.spec,))
+        self._store._pp[len(spec.moves)][self._index] = pp
+
+    def remove_move_by_name(self, name: str) -> bool:
+        """
+        Remove the first move that matches name.
+
+        Args:
+            name (str): Name of the move to remove.
+        Returns:
+            bool: True if removed, False otherwise.
+        """
+        spec = self.spec
+        for slot, ms in enumerate(spec.moves):
+            if ms.name == name:
+                pp, i = self._store._pp, self._index
+                for later in range(slot + 1, len(spec.moves)):
+                    pp[later - 1][i] = pp[later][i]
+                pp[len(spec.moves) - 1][i] = 0
+                self.spec = replace(spec, moves=spec.moves[:slot] + spec.moves[slot + 1:])
+                return True
+        return False
+
+
+class MonsterStore:
+    """
+    Column store of monsters with shared SpeciesSpec entries.
+
+    Columns are array.array buffers: species index ('I'), level ('H'),
+    max/current HP ('I') and one PP column ('H') per move slot. The
+    species entry of a row always lists the row's actual moves. Values
+    that do not fit their column are rejected with ValueError and leave
+    the store unchanged.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._species: List[SpeciesSpec] = []
+        self._species_ids: Dict[SpeciesSpec, int] = {}
+        self._species_col = array("I")
+        self._level = array("H")
+        self._max_hp = array("I")
+        self._current_hp = array("I")
+        self._pp: List[array] = []
+
+    def _species_id(self, spec: SpeciesSpec) -> int:
+        """Return (registering if new) the index of a species entry."""
+        sid = self._species_ids.get(spec)
+        if sid is None:
+            sid = len(self._species)
+            self._species.append(spec)
+            self._species_ids[spec] = sid
+            while len(self._pp) < len(spec.moves):
+                self._pp.append(array("H", bytes(2 * len(self))))
+        return sid
+
+    def append(self, monster: Monster) -> int:
+        """
+        Copy a monster's state into the store.
+
+        Args:
+            monster (Monster): Monster to store.
+
+        Returns:
+            int: Index of the stored monster.
+
+        Raises:
+            ValueError: If level, HP or PP does not fit its column.
+        """
+        moves = monster.get_moves()
+        level = _checked("Level", monster.level, LEVEL_MAX)
+        max_hp = _checked("Max HP", monster.max_hp, HP_MAX)
+        current_hp = _checked("HP", monster.current_hp, HP_MAX)
+        pps = [_checked("PP", mv.current_pp, PP_MAX) for mv in moves]
+        spec = monster.spec
+        move_specs = tuple(mv.spec for mv in moves)
+        if spec.moves != move_specs:
+            spec = replace(spec, moves=move_specs)
+        self._species_col.append(self._species_id(spec))
+        self._level.append(level)
+        self._max_hp.append(max_hp)
+        self._current_hp.append(current_hp)
+        for slot, col in enumerate(self._pp):
+            col.append(pps[slot] if slot < len(pps) else 0)
+        return len(self._level) - 1
+
+    def append_fresh(self, spec: SpeciesSpec, level: int, max_hp: int) -> int:
+        """
+        Append a full-HP, full-PP monster of a species without building it.
+
+        Args:
+            spec (SpeciesSpec): Species entry (its moves are the row's moves).
+            level (int): Level.
+            max_hp (int): Max (and current) HP.
+
+        Returns:
+            int: Index of the stored monster.
+
+        Raises:
+            ValueError: If level or max_hp does not fit its column.
+        """
+        _checked("Level", level, LEVEL_MAX)
+        _checked("Max HP", max_hp, HP_MAX)
+        self._species_col.append(self._species_id(spec))
+        self._level.append(level)
+        self._max_hp.append(max_hp)
+        self._current_hp.append(max_hp)
+        moves = spec.moves
+        for slot, col in enumerate(self._pp):
+            col.append(moves[slot].max_pp if slot < len(moves) else 0)
+        return len(self._level) - 1
+
+    def level_up(self, amount: int = 1, indices: Optional[Iterable[int]] = None):
+        """
+        Level up stored monsters in place, as Monster.level_up would.
+
+        Args:
+            amount (int): Levels to add to each.
+            indices (Iterable[int]): Rows to update (default all).
+
+        Raises:
+            ValueError: If a new level or max HP does not fit its column
+                (no row is changed).
+        """
+        if amount <= 0:
+            return
+        amount = int(amount)
+        level, max_hp, current_hp = self._level, self._max_hp, self._current_hp
+        rows = range(len(level)) if indices is None else list(indices)
+        if not rows:
+            return
+        _checked("Level", max(level[i] for i in rows) + amount, LEVEL_MAX)
+        try:
+            new_hp = [hp_after_levels(max_hp[i], amount) for i in rows]
+        except OverflowError:  # HP growth passed float range, far above HP_MAX
+            raise ValueError(f"Max HP after {amount} levels is outside the stored range 0..{HP_MAX}") from None
+        _checked("Max HP", max(new_hp), HP_MAX)
+        for i, hp in zip(rows, new_hp):
+            level[i] += amount
+            max_hp[i] = hp
+            if current_hp[i] > hp:
+                current_hp[i] = hp
+
+    def heal_all(self):
+        """
+        Restore every stored monster to full HP and PP with whole-column writes.
+
+        The HP column is copied from the max HP column; each PP column is
+        filled from a per-species max PP lookup, vectorized with NumPy when
+        it is installed.
+        """
+        if not len(self._level):
+            return
+        self._current_hp[:] = self._max_hp
+        try:
+            import numpy as np
+        except ImportError:  # pragma: no cover - optional dependency
+            np = None
+        species = self._species_col if np is None else np.frombuffer(self._species_col, dtype=np.uint32)
+        for slot, col in enumerate(self._pp):
+            lut = [spec.moves[slot].max_pp if slot < len(spec.moves) else 0 for spec in self._species]
+            if np is None:
+                col[:] = array("H", map(lut.__getitem__, species))
+            else:
+                np.frombuffer(col, dtype=np.uint16)[:] = np.array(lut, dtype=np.uint16)[species]
+
+    def extend(self, monsters):
+        """Append every monster from an iterable."""
+        for m in monsters:
+            self.append(m)
+
+    def __len__(self) -> int:
+        return len(self._level)
+
+    def __getitem__(self, index: int) -> MonsterView:
+        """Return a view of the monster at index (negative indices allowed)."""
+        n = len(self._level)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("MonsterStore index out of range")
+        return MonsterView(self, index)
+
+    def __iter__(self) -> Iterator[MonsterView]:
+        for i in range(len(self._level)):
+            yield MonsterView(self, i)
+
+    def materialize(self, index: int) -> Monster:
+        """
+        Return a standalone Monster copy of the stored monster at index.
+
+        Args:
+            index (int): Monster index.
+
+        Returns:
+            Monster: Independent Monster with its own Move objects.
+        """
+        return self[index].clone()
+
+    def nbytes(self) -> int:
+        """Return the bytes held by the column buffers."""
+        cols = [self._species_col, self._level, self._max_hp, self._current_hp, *self._pp]
+        return sum(c.itemsize * len(c) for c in cols)
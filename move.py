@@ -7,7 +7,8 @@ Provides move behavior (PP, power, type), small damage variation,
 and helper utilities for UI and testing.
 """
 
-from typing import Tuple
+from dataclasses import dataclass, replace
+from typing import Dict, List, Tuple
 import random
 
 # Type effectiveness chart
@@ -20,12 +21,174 @@ TYPE_CHART = {
     "Normal":  {"Rock": 0.5}
 }
 
+# Types interned to small integer IDs, and a dense TYPE_MATRIX[attacker][defender]
+# of multipliers precomputed from TYPE_CHART. Rebuilt in place by
+# build_type_tables so modules holding references stay current. IDs are never
+# reassigned: specs, saves and logs store them, so a new chart only appends.
+TYPE_NAMES: List[str] = []
+TYPE_IDS: Dict[str, int] = {}
+TYPE_MATRIX: List[List[float]] = []
+_TYPE_IDS_LOWER: Dict[str, int] = {}
+_type_array = None
+
+
+def validate_type_chart(chart: Dict[str, Dict[str, float]]) -> List[str]:
+    """
+    Return a list of problems found in a type chart (empty if valid).
+
+    Args:
+        chart (Dict[str, Dict[str, float]]): Attacker -> defender -> multiplier.
+
+    Returns:
+        List[str]: Human-readable problem descriptions.
+    """
+    problems = []
+    for attacker, row in chart.items():
+        if not isinstance(attacker, str) or not attacker:
+            problems.append(f"Invalid attacking type name: {attacker!r}")
+        if not isinstance(row, dict):
+            problems.append(f"Row for {attacker!r} must be a dict")
+            continue
+        for defender, mult in row.items():
+            if not isinstance(defender, str) or not defender:
+                problems.append(f"Invalid defending type name in {attacker!r}: {defender!r}")
+            if not isinstance(mult, (int, float)) or mult < 0:
+                problems.append(f"Invalid multiplier {attacker}->{defender}: {mult!r}")
+    lowered: Dict[str, str] = {}
+    for name in list(chart) + [d for row in chart.values() if isinstance(row, dict) for d in row]:
+        if isinstance(name, str):
+            other = lowered.setdefault(name.lower(), name)
+            if other != name:
+                problems.append(f"Type names differ only by case: {other!r} and {name!r}")
+    return problems
+
+
+def build_type_tables(chart: Dict[str, Dict[str, float]] = TYPE_CHART):
+    """
+    Intern the types of chart and rebuild TYPE_NAMES, TYPE_IDS and TYPE_MATRIX.
+
+    Types that are already interned keep their IDs (whatever their order in
+    chart) and new types are appended, so existing MoveSpecs and
+    SpeciesSpecs keep meaning the same type. Interned types missing from
+    chart stay valid with neutral (1.0) multipliers.
+
+    Args:
+        chart (Dict[str, Dict[str, float]]): Attacker -> defender -> multiplier.
+
+    Raises:
+        ValueError: If the chart fails validate_type_chart.
+    """
+    global _type_array
+    problems = validate_type_chart(chart)
+    if problems:
+        raise ValueError("Invalid type chart: " + "; ".join(problems))
+    names: List[str] = list(TYPE_NAMES)
+    for attacker, row in chart.items():
+        for name in [attacker, *row]:
+            if name not in names:
+                names.append(name)
+    TYPE_NAMES[:] = names
+    TYPE_IDS.clear()
+    TYPE_IDS.update((name, i) for i, name in enumerate(names))
+    _TYPE_IDS_LOWER.clear()
+    _TYPE_IDS_LOWER.update((name.lower(), i) for i, name in enumerate(names))
+    TYPE_MATRIX[:] = [[float(chart.get(att, {}).get(dfn, 1.0)) for dfn in names]
+                      for att in names]
+    _type_array = None
+
+
+def type_id(type_name: str) -> int:
+    """
+    Return the interned integer ID of a type.
+
+    Args:
+        type_name (str): Type name exactly as in TYPE_CHART.
+
+    Returns:
+        int: Index into TYPE_NAMES and TYPE_MATRIX.
+
+    Raises:
+        ValueError: If the type is not in the type chart.
+    """
+    try:
+        return TYPE_IDS[type_name]
+    except KeyError:
+        raise ValueError(f"Unknown type: {type_name!r}") from None
+
+
+def type_matrix_array():
+    """
+    Return TYPE_MATRIX as a cached read-only NumPy float64 array.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    global _type_array
+    if _type_array is None:
+        import numpy as np
+        _type_array = np.array(TYPE_MATRIX, dtype=np.float64)
+        _type_array.setflags(write=False)
+    return _type_array
+
+
+build_type_tables()
+
+
+@dataclass(frozen=True, slots=True)
+class MoveSpec:
+    """
+    Immutable move definition shared by every Move instance of that move.
+    """
+
+    name: str
+    power: int
+    max_pp: int
+    type_id: int
+
+    @property
+    def type(self) -> str:
+        """Move type string."""
+        return TYPE_NAMES[self.type_id]
+
+
+_move_specs: Dict[Tuple[str, int, int, int], MoveSpec] = {}
+
+
+def move_spec(name: str, power: int, max_pp: int, type_: str = "Normal") -> MoveSpec:
+    """
+    Return the shared MoveSpec for these values, creating it on first use.
+
+    Args:
+        name (str): Move name.
+        power (int): Base power.
+        max_pp (int): Maximum PP.
+        type_ (str): Move type string.
+
+    Returns:
+        MoveSpec: Interned move definition.
+
+    Raises:
+        ValueError: If type_ is not in the type chart.
+    """
+    key = (name, int(power), int(max_pp), type_id(type_))
+    spec = _move_specs.get(key)
+    if spec is None:
+        spec = _move_specs[key] = MoveSpec(*key)
+    return spec
+
 
 class Move:
     """
     Represents a combat move with power, PP, and type.
+
+    Static data lives in a shared MoveSpec; the instance only owns its PP.
+    _summary caches get_move_summary() and is cleared by the PP and spec
+    setters, which also clear the summary of every Monster in _owners
+    (the monsters listing this move).
     """
 
+    __slots__ = ("spec", "_pp", "_owners", "_summary")
+
     def __init__(self, name: str, power: int, max_pp: int, type_: str = "Normal"):
         """
         Initialize a Move.
@@ -35,12 +198,120 @@ class Move:
             power (int): Base power.
             max_pp (int): Maximum PP.
             type_ (str): Move type string.
+
+        Raises:
+            ValueError: If type_ is not in the type chart.
+        """
+        self.spec = move_spec(name, power, max_pp, type_)
+        self._pp = self.spec.max_pp
+        self._owners = ()
+        self._summary = None
+
+    @classmethod
+    def from_spec(cls, spec: MoveSpec) -> "Move":
+        """
+        Create a Move with full PP from a shared MoveSpec.
+
+        Args:
+            spec (MoveSpec): Move definition.
+
+        Returns:
+            Move: New Move instance.
+        """
+        return Move._from_parts(spec, spec.max_pp)
+
+    @classmethod
+    def _from_parts(cls, spec: MoveSpec, current_pp: int) -> "Move":
+        """Build a Move owned by no monster, bypassing __init__."""
+        mv = Move.__new__(Move)
+        mv.spec = spec
+        mv._pp = current_pp
+        mv._owners = ()
+        mv._summary = None
+        return mv
+
+    def __reduce__(self):
+        # Copies and pickles carry state only, never owners or caches
+        return Move._from_parts, (self.spec, self.current_pp)
+
+    def _changed(self):
+        """Drop the cached summaries of this move and its owners."""
+        self._summary = None
+        for owner in self._owners:
+            owner._summary = None
+
+    @property
+    def current_pp(self) -> int:
+        """Current PP."""
+        return self._pp
+
+    @current_pp.setter
+    def current_pp(self, value: int):
+        self._pp = value
+        self._changed()
+
+    @property
+    def name(self) -> str:
+        """Move name."""
+        return self.spec.name
+
+    @name.setter
+    def name(self, value: str):
+        self.spec = replace(self.spec, name=value)
+        self._changed()
+
+    @property
+    def power(self) -> int:
+        """Base power."""
+        return self.spec.power
+
+    @power.setter
+    def power(self, value: int):
+        self.spec = replace(self.spec, power=int(value))
+        self._changed()
+
+    @property
+    def max_pp(self) -> int:
+        """Maximum PP."""
+        return self.spec.max_pp
+
+    @max_pp.setter
+    def max_pp(self, value: int):
+        self.spec = replace(self.spec, max_pp=int(value))
+        self._changed()
+
+    @property
+    def type_id(self) -> int:
+        """Interned type ID."""
+        return self.spec.type_id
+
+    @property
+    def type(self) -> str:
+        """Move type string."""
+        return TYPE_NAMES[self.spec.type_id]
+
+    @type.setter
+    def type(self, value: str):
+        self.spec = replace(self.spec, type_id=type_id(value))
+        self._changed()
+
+    def clone(self) -> "Move":
+        """
+        Return an independent copy including current PP.
+
+        Returns:
+            Move: New Move sharing this move's MoveSpec.
+        """
+        return Move._from_parts(self.spec, self.current_pp)
+
+    def spawn(self) -> "Move":
+        """
+        Return a fresh copy of this move with full PP.
+
+        Returns:
+            Move: New Move sharing this move's MoveSpec.
         """
-        self.name = name
-        self.power = int(power)
-        self.max_pp = int(max_pp)
-        self.current_pp = int(max_pp)
-        self.type = type_
+        return Move._from_parts(self.spec, self.spec.max_pp)
 
     def use_move(self) -> int:
         """
@@ -52,7 +323,7 @@ class Move:
         if self.current_pp <= 0:
             return 0
         self.current_pp -= 1
-        return self.power
+        return self.spec.power
 
     def restore_pp(self, amount: int) -> int:
         """
@@ -67,12 +338,12 @@ class Move:
         if amount <= 0:
             return 0
         before = self.current_pp
-        self.current_pp = min(self.max_pp, self.current_pp + int(amount))
+        self.current_pp = min(self.spec.max_pp, self.current_pp + int(amount))
         return self.current_pp - before
 
     def reset_pp(self):
         """Reset current PP to max_pp."""
-        self.current_pp = self.max_pp
+        self.current_pp = self.spec.max_pp
 
     def is_usable(self) -> bool:
         """Return True if at least 1 PP remains."""
@@ -87,8 +358,11 @@ class Move:
 
         Returns:
             float: Effectiveness multiplier.
+
+        Raises:
+            ValueError: If defender_type is not in the type chart.
         """
-        return TYPE_CHART.get(self.type, {}).get(defender_type, 1.0)
+        return TYPE_MATRIX[self.spec.type_id][type_id(defender_type)]
 
     def get_damage_range(self, variation_pct: float = 0.1) -> Tuple[int, int]:
         """
@@ -109,10 +383,19 @@ class Move:
         """
         Return compact summary useful for UIs.
 
+        The string is cached until a PP or spec setter marks it stale.
+
         Returns:
             str: Summary string with name, type, power, and PP.
         """
-        return f"{self.name} ({self.type}) Power:{self.power} PP:{self.current_pp}/{self.max_pp}"
+        text = self._summary
+        if text is None:
+            text = self._summary = self._format_summary()
+        return text
+
+    def _format_summary(self) -> str:
+        spec = self.spec
+        return f"{spec.name} ({TYPE_NAMES[spec.type_id]}) Power:{spec.power} PP:{self.current_pp}/{spec.max_pp}"
 
     def pp_percentage(self) -> float:
         """
@@ -144,7 +427,7 @@ class Move:
         Returns:
             bool: True if type matches.
         """
-        return self.type.lower() == type_name.lower()
+        return _TYPE_IDS_LOWER.get(type_name.lower()) == self.type_id
 
     def __str__(self):
         return self.get_move_summary()
\ No newline at end of file
@@ -0,0 +1,288 @@
+# pc_box.py
+
+"""
+Memory-mapped "PC box" storage for captured monsters.
+
+Monsters outside the active Player.team are kept as fixed-width records
+in a file mapped with mmap, so opening a box of any size is instant, a
+record is reached by index in O(1), HP and level are updated in place,
+and a full Monster object is only built when a record is pulled into the
+team.
+
+File layout (little-endian, version 1):
+
+    header   4s magic "MTPC", H version, H record size, Q count, Q capacity
+             (padded to 32 bytes)
+    records  capacity fixed-width records, the first count in use
+
+Each record holds the monster's name, type, base HP, level, max/current
+HP and up to MAX_MOVES move slots (name, type, power, max/current PP).
+Names are limited to NAME_BYTES and types to TYPE_BYTES of UTF-8.
+"""
+
+from struct import Struct
+from typing import Dict, Iterator, Optional, Tuple
+import mmap
+import os
+
+from monster import Monster, SpeciesSpec
+from move import Move, move_spec, type_id
+
+MAGIC = b"MTPC"
+VERSION = 1
+MAX_MOVES = 4
+NAME_BYTES = 16
+TYPE_BYTES = 12
+HEADER_SIZE = 32
+
+_HEADER = Struct("<4sHHQQ")
+_MONSTER = Struct(f"<{NAME_BYTES}s{TYPE_BYTES}sIHIIB")
+_MOVE = Struct(f"<{NAME_BYTES}s{TYPE_BYTES}siHH")
+RECORD_SIZE = _MONSTER.size + MAX_MOVES * _MOVE.size
+
+# Field offsets inside a record for in-place updates
+_LEVEL = Struct("<H")
+_HP = Struct("<I")
+_LEVEL_OFFSET = NAME_BYTES + TYPE_BYTES + 4
+_MAX_HP_OFFSET = _LEVEL_OFFSET + 2
+_CURRENT_HP_OFFSET = _MAX_HP_OFFSET + 4
+_MOVE_MAX_PP_OFFSET = NAME_BYTES + TYPE_BYTES + 4
+_MOVE_CURRENT_PP_OFFSET = _MOVE_MAX_PP_OFFSET + 2
+
+
+def _encode(text: str, size: int) -> bytes:
+    """Encode text into a fixed-width NUL-padded field."""
+    raw = text.encode("utf-8")
+    if len(raw) > size or b"\0" in raw:
+        raise ValueError(f"{text!r} does not fit in {size} bytes")
+    return raw
+
+
+def _decode(raw: bytes) -> str:
+    return raw.rstrip(b"\0").decode("utf-8")
+
+
+class PCBox:
+    """
+    Fixed-width, memory-mapped monster storage backed by a file.
+    """
+
+    def __init__(self, path, initial_capacity: int = 1024):
+        """
+        Open a box file, creating it if missing.
+
+        Args:
+            path (str | os.PathLike): Box file location.
+            initial_capacity (int): Records to reserve for a new file.
+
+        Raises:
+            ValueError: If an existing file is not a compatible box.
+        """
+        self.path = os.fspath(path)
+        if not os.path.exists(self.path):
+            with open(self.path, "wb") as f:
+                f.write(self._header_bytes(0, max(1, initial_capacity)))
+                f.truncate(HEADER_SIZE + max(1, initial_capacity) * RECORD_SIZE)
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, version, record_size, self._count, self._capacity = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            self.close()
+            raise ValueError(f"{self.path} is not a compatible PC box file")
+        self._species: Dict[Tuple, SpeciesSpec] = {}
+
+    @staticmethod
+    def _header_bytes(count: int, capacity: int) -> bytes:
+        return _HEADER.pack(MAGIC, VERSION, RECORD_SIZE, count, capacity).ljust(HEADER_SIZE, b"\0")
+
+    def _write_header(self):
+        self._map[:HEADER_SIZE] = self._header_bytes(self._count, self._capacity)
+
+    def _offset(self, index: int) -> int:
+        """Return the byte offset of record index, validating it."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("PC box index out of range")
+        return HEADER_SIZE + index * RECORD_SIZE
+
+    def _grow(self):
+        """Double the capacity and remap the file."""
+        self._capacity *= 2
+        self._map.close()
+        self._file.truncate(HEADER_SIZE + self._capacity * RECORD_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._write_header()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "PCBox":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def deposit(self, monster: Monster) -> int:
+        """
+        Store a copy of monster's current state at the end of the box.
+
+        Args:
+            monster (Monster): Monster to store.
+
+        Returns:
+            int: Index of the new record.
+
+        Raises:
+            ValueError: If the monster has too many moves or too-long names.
+        """
+        moves = monster.get_moves()
+        if len(moves) > MAX_MOVES:
+            raise ValueError(f"PC box records hold at most {MAX_MOVES} moves")
+        if self._count == self._capacity:
+            self._grow()
+        off = HEADER_SIZE + self._count * RECORD_SIZE
+        spec = monster.spec
+        _MONSTER.pack_into(self._map, off, _encode(spec.name, NAME_BYTES),
+                           _encode(spec.type, TYPE_BYTES), spec.base_hp, monster.level,
+                           monster.max_hp, monster.current_hp, len(moves))
+        off += _MONSTER.size
+        for slot in range(MAX_MOVES):
+            if slot < len(moves):
+                mv = moves[slot]
+                _MOVE.pack_into(self._map, off, _encode(mv.name, NAME_BYTES),
+                                _encode(mv.type, TYPE_BYTES), mv.power, mv.max_pp, mv.current_pp)
+            else:
+                self._map[off:off + _MOVE.size] = bytes(_MOVE.size)
+            off += _MOVE.size
+        self._count += 1
+        self._write_header()
+        return self._count - 1
+
+    def name(self, index: int) -> str:
+        """Return the species name of record index."""
+        off = self._offset(index)
+        return _decode(self._map[off:off + NAME_BYTES])
+
+    def level(self, index: int) -> int:
+        """Return the level of record index."""
+        return _LEVEL.unpack_from(self._map, self._offset(index) + _LEVEL_OFFSET)[0]
+
+    def hp(self, index: int) -> Tuple[int, int]:
+        """Return (current_hp, max_hp) of record index."""
+        off = self._offset(index)
+        return (_HP.unpack_from(self._map, off + _CURRENT_HP_OFFSET)[0],
+                _HP.unpack_from(self._map, off + _MAX_HP_OFFSET)[0])
+
+    def set_hp(self, index: int, current_hp: int):
+        """
+        Update current HP in place, clamped to [0, max_hp].
+
+        Args:
+            index (int): Record index.
+            current_hp (int): New current HP.
+        """
+        off = self._offset(index)
+        max_hp = _HP.unpack_from(self._map, off + _MAX_HP_OFFSET)[0]
+        _HP.pack_into(self._map, off + _CURRENT_HP_OFFSET, max(0, min(max_hp, int(current_hp))))
+
+    def set_level(self, index: int, level: int, max_hp: Optional[int] = None):
+        """
+        Update level (and optionally max HP) in place.
+
+        Current HP is clamped to the new max HP.
+
+        Args:
+            index (int): Record index.
+            level (int): New level.
+            max_hp (int): New max HP, or None to keep it.
+        """
+        off = self._offset(index)
+        _LEVEL.pack_into(self._map, off + _LEVEL_OFFSET, int(level))
+        if max_hp is not None:
+            _HP.pack_into(self._map, off + _MAX_HP_OFFSET, int(max_hp))
+            current = _HP.unpack_from(self._map, off + _CURRENT_HP_OFFSET)[0]
+            _HP.pack_into(self._map, off + _CURRENT_HP_OFFSET, min(current, int(max_hp)))
+
+    def heal_all(self):
+        """
+        Restore every record to full HP and PP in place.
+
+        Each field is copied for all records at once by strided slice
+        assignment over the mapping (current_hp bytes from max_hp bytes,
+        current_pp from max_pp per move slot), so the per-record cost is
+        paid in C rather than in a Python loop.
+        """
+        start, end = HEADER_SIZE, HEADER_SIZE + self._count * RECORD_SIZE
+        fields = [(_CURRENT_HP_OFFSET, _MAX_HP_OFFSET, _HP.size)]
+        for slot in range(MAX_MOVES):
+            base = _MONSTER.size + slot * _MOVE.size
+            fields.append((base + _MOVE_CURRENT_PP_OFFSET, base + _MOVE_MAX_PP_OFFSET, 2))
+        m = self._map
+        for dst, src, width in fields:
+            for b in range(width):
+                m[start + dst + b:end:RECORD_SIZE] = m[start + src + b:end:RECORD_SIZE]
+
+    def materialize(self, index: int) -> Monster:
+        """
+        Build a Monster from record index, leaving the record in place.
+
+        Args:
+            index (int): Record index.
+
+        Returns:
+            Monster: Independent Monster with shared specs.
+        """
+        off = self._offset(index)
+        name, type_, base_hp, level, max_hp, current_hp, n_moves = _MONSTER.unpack_from(self._map, off)
+        off += _MONSTER.size
+        moves = []
+        for _ in range(n_moves):
+            mv_name, mv_type, power, max_pp, current_pp = _MOVE.unpack_from(self._map, off)
+            moves.append(Move._from_parts(move_spec(_decode(mv_name), power, max_pp, _decode(mv_type)),
+                                          current_pp))
+            off += _MOVE.size
+        key = (name, type_, base_hp, tuple(mv.spec for mv in moves))
+        spec = self._species.get(key)
+        if spec is None:
+            spec = self._species[key] = SpeciesSpec(_decode(name), type_id(_decode(type_)),
+                                                    base_hp, key[3])
+        return Monster._from_parts(spec, level, max_hp, current_hp, moves)
+
+    def withdraw(self, index: int) -> Monster:
+        """
+        Remove record index and return it as a Monster.
+
+        The last record is moved into the freed slot, so removal is O(1)
+        but changes the index of that last record.
+
+        Args:
+            index (int): Record index.
+
+        Returns:
+            Monster: The withdrawn monster.
+        """
+        mon = self.materialize(index)
+        off = self._offset(index)
+        last = HEADER_SIZE + (self._count - 1) * RECORD_SIZE
+        if off != last:
+            self._map[off:off + RECORD_SIZE] = self._map[last:last + RECORD_SIZE]
+        self._count -= 1
+        self._write_header()
+        return mon
+
+    def __iter__(self) -> Iterator[Monster]:
+        """Materialize every stored monster in index order."""
+        for i in range(self._count):
+            yield self.materialize(i)
+
+    def flush(self):
+        """Flush pending writes to disk."""
+        self._map.flush()
+
+    def close(self):
+        """Flush and release the mapping and file."""
+        if not self._map.closed:
+            self._map.flush()
+            self._map.close()
+        self._file.close()
@@ -6,10 +6,32 @@ Player class for Monster Trainer Game.
 Manages team, inventory, and player actions (item use, team manipulation).
 """
 
-from typing import List
+from typing import Dict, List, Optional
 from monster import Monster
 from item import Item
-import copy
+from inventory import Inventory
+from team import Team
+
+
+def _summary_changes(previous: List[str], current: List[str]) -> Dict[int, Optional[str]]:
+    """
+    Diff two summary lists position by position.
+
+    Args:
+        previous (List[str]): Summaries from the last call.
+        current (List[str]): Summaries now.
+
+    Returns:
+        Dict[int, Optional[str]]: index -> new summary for every changed or
+            added entry, index -> None for entries past the new end.
+    """
+    changes: Dict[int, Optional[str]] = {}
+    for i, text in enumerate(current):
+        if i >= len(previous) or previous[i] != text:
+            changes[i] = text
+    for i in range(len(current), len(previous)):
+        changes[i] = None
+    return changes
 
 
 class Player:
@@ -25,12 +47,17 @@ class Player:
             name (str): Player's name.
         """
         self.name = name
-        self.team: List[Monster] = []
-        self.inventory: List[Item] = [
+        self.team = []
+        self.inventory = [
             Item("Monster Ball", quantity=2, is_capture=True),
             Item("Health Potion", heal=30, quantity=2),
             Item("PP Potion", restore_pp=5, quantity=1),
         ]
+        # Optional storage (e.g. pc_box.PCBox) for monsters outside the team
+        self.box = None
+        # Summaries as of the last team_changes()/inventory_changes() call
+        self._shown_team: List[str] = []
+        self._shown_inventory: List[str] = []
 
     def add_monster(self, monster: Monster):
         """
@@ -43,12 +70,12 @@ class Player:
 
     def add_monster_deepcopy(self, monster: Monster):
         """
-        Add a deep copy of monster to avoid shared state.
+        Add an independent copy of monster to avoid shared state.
 
         Args:
             monster (Monster): Monster to copy and add.
         """
-        self.team.append(copy.deepcopy(monster))
+        self.team.append(monster.clone())
 
     def remove_monster_by_index(self, index: int) -> bool:
         """
@@ -65,18 +92,73 @@ class Player:
             return True
         return False
 
+    def deposit_monster(self, index: int) -> bool:
+        """
+        Move a team monster into the attached box.
+
+        Args:
+            index (int): Index of monster in team.
+
+        Returns:
+            bool: True if deposited, False if no box or invalid index.
+        """
+        if self.box is None or not 0 <= index < len(self.team):
+            return False
+        self.box.deposit(self.team[index])
+        del self.team[index]
+        return True
+
+    def withdraw_monster(self, box_index: int) -> bool:
+        """
+        Pull a monster out of the attached box into the team.
+
+        Args:
+            box_index (int): Index of the monster in the box.
+
+        Returns:
+            bool: True if withdrawn, False if no box or invalid index.
+        """
+        if self.box is None or not 0 <= box_index < len(self.box):
+            return False
+        self.team.append(self.box.withdraw(box_index))
+        return True
+
+    @property
+    def team(self) -> Team:
+        """Team members in order (a Team; assigning a list wraps it)."""
+        return self._team
+
+    @team.setter
+    def team(self, monsters):
+        if isinstance(monsters, Team):
+            new = monsters
+        else:
+            monsters = list(monsters)
+            # Unlink the current members so the old Team stops tracking them
+            old = getattr(self, "_team", None)
+            if old is not None:
+                old.clear()
+            new = Team(monsters)
+        self._team = new
+
+    @property
+    def inventory(self) -> Inventory:
+        """Items in display order (an Inventory; assigning a list wraps it)."""
+        return self._inventory
+
+    @inventory.setter
+    def inventory(self, items):
+        self._inventory = items if isinstance(items, Inventory) else Inventory(items)
+
     def add_item(self, item: Item):
         """
-        Add an item to inventory; merge if same-name item exists.
+        Add an item to inventory; merge if an item with the same name
+        (ignoring case) and kind exists.
 
         Args:
             item (Item): Item to add.
         """
-        for it in self.inventory:
-            if it.name == item.name and it.get_kind() == item.get_kind():
-                it.increase_quantity(item.quantity)
-                return
-        self.inventory.append(item)
+        self.inventory.add(item)
 
     def remove_item_by_index(self, index: int) -> bool:
         """
@@ -136,10 +218,7 @@ class Player:
         Returns:
             int: Index of first matching item, -1 if not found.
         """
-        for idx, it in enumerate(self.inventory):
-            if it.name.lower() == name.lower():
-                return idx
-        return -1
+        return self.inventory.index_of(name)
 
     def inventory_list(self) -> List[str]:
         """
@@ -159,6 +238,35 @@ class Player:
         """
         return [m.get_summary() for m in self.team]
 
+    def team_changes(self) -> Dict[int, Optional[str]]:
+        """
+        Return the team summaries that changed since the previous call.
+
+        The first call reports every member. Summaries are cached on each
+        Monster, so unchanged members cost a key comparison, not a format.
+
+        Returns:
+            Dict[int, Optional[str]]: Team index -> new summary, or None if
+                the team has since shrunk below that index.
+        """
+        current = self.team_list()
+        changes = _summary_changes(self._shown_team, current)
+        self._shown_team = current
+        return changes
+
+    def inventory_changes(self) -> Dict[int, Optional[str]]:
+        """
+        Return the inventory summaries that changed since the previous call.
+
+        Returns:
+            Dict[int, Optional[str]]: Inventory index -> new summary, or None
+                if the inventory has since shrunk below that index.
+        """
+        current = self.inventory_list()
+        changes = _summary_changes(self._shown_inventory, current)
+        self._shown_inventory = current
+        return changes
+
     def has_usable_monsters(self) -> bool:
         """
         Return True if any monster in team is not fainted.
@@ -166,7 +274,7 @@ class Player:
         Returns:
             bool: True if at least one monster is usable.
         """
-        return any(not m.is_fainted() for m in self.team)
+        return self.team.alive_count > 0
 
     def total_team_health(self) -> int:
         """
@@ -175,7 +283,7 @@ class Player:
         Returns:
             int: Total HP.
         """
-        return sum(m.current_hp for m in self.team)
+        return self.team.total_hp
 
     def get_team_size(self) -> int:
         """Return number of monsters in team."""
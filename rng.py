@@ -0,0 +1,114 @@
+# rng.py
+
+"""
+Deterministic, splittable random streams for Monster Trainer Game.
+
+Game code accepts an optional rng argument with random()/choice(); when
+omitted it falls back to the global random module. GameRNG provides the
+same interface from a seeded private generator, derives independent
+child streams (one per worker or battle) from its seed, and offers bulk
+draws for batch simulators.
+"""
+
+from typing import List, Optional, Union
+import hashlib
+import random
+
+SeedKey = Union[int, str]
+
+
+def derive_seed(seed: int, key: SeedKey) -> int:
+    """
+    Derive a 64-bit child seed from a parent seed and a key.
+
+    Args:
+        seed (int): Parent seed.
+        key (SeedKey): Child identifier (e.g. worker or battle number).
+
+    Returns:
+        int: Child seed; equal inputs always give equal outputs.
+    """
+    digest = hashlib.blake2b(f"{seed}/{key!r}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class GameRNG:
+    """
+    Seedable random stream with random()/choice() like the random module.
+    """
+
+    __slots__ = ("seed", "random", "choice", "_rng", "_splits", "_np")
+
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Initialize a stream.
+
+        Args:
+            seed (int): Seed; a fresh 64-bit seed is drawn if None.
+        """
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = int(seed)
+        self._rng = random.Random(self.seed)
+        # Bound methods avoid a Python-level call per draw
+        self.random = self._rng.random
+        self.choice = self._rng.choice
+        self._splits = 0
+        self._np = None
+
+    def child(self, key: SeedKey) -> "GameRNG":
+        """
+        Return the independent child stream for key.
+
+        The result depends only on this stream's seed and key, not on how
+        many draws or splits happened before.
+
+        Args:
+            key (SeedKey): Child identifier.
+
+        Returns:
+            GameRNG: Child stream.
+        """
+        return GameRNG(derive_seed(self.seed, key))
+
+    def split(self) -> "GameRNG":
+        """Return the next sequentially numbered child stream."""
+        self._splits += 1
+        return self.child(self._splits)
+
+    def spawn(self, n: int) -> List["GameRNG"]:
+        """Return n sequentially numbered child streams."""
+        return [self.split() for _ in range(n)]
+
+    def block(self, n: int) -> List[float]:
+        """
+        Draw n floats in [0, 1) at once.
+
+        Args:
+            n (int): Number of draws.
+
+        Returns:
+            List[float]: The next n values of random().
+        """
+        rand = self.random
+        return [rand() for _ in range(n)]
+
+    def numpy(self):
+        """
+        Return a NumPy Generator seeded from this stream (created once).
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if self._np is None:
+            import numpy as np
+            self._np = np.random.default_rng(derive_seed(self.seed, "numpy"))
+        return self._np
+
+    def getstate(self):
+        """Return the internal state for later setstate()."""
+        return self._rng.getstate()
+
+    def setstate(self, state):
+        """Restore a state returned by getstate()."""
+        self._rng.setstate(state)
@@ -0,0 +1,304 @@
+# savegame.py
+
+"""
+Binary save/load for a Player's team and inventory.
+
+File layout (little-endian, version 1):
+
+    header        4s magic "MTGS", H version, H flags
+    strings       I count, then per string: H byte length + UTF-8 bytes
+    move specs    I count, then per spec: I name, i power, I max_pp, I type
+    species       I count, then per species: I name, I type, I base_hp,
+                  H move count + I move spec index per move
+    player        I name
+    team          I count, then per monster: I species, I level, I max_hp,
+                  I current_hp, H move count + (I move spec, I current_pp)
+    inventory     I count, then per item: I name, i heal, i restore_pp,
+                  i quantity, B is_capture
+
+Names and types are indices into the string table; monsters reference
+shared move/species tables, so loading rebuilds shared MoveSpec and
+SpeciesSpec flyweights. iter_team streams monsters one record at a time.
+"""
+
+from contextlib import contextmanager
+from struct import Struct
+from typing import BinaryIO, Dict, Iterator, List, Tuple, Union
+import os
+
+from item import Item
+from monster import Monster, SpeciesSpec
+from move import Move, MoveSpec, move_spec, type_id
+from player import Player
+
+MAGIC = b"MTGS"
+VERSION = 1
+
+_HEADER = Struct("<4sHH")
+_COUNT = Struct("<I")
+_STR_LEN = Struct("<H")
+_MOVE_SPEC = Struct("<IiII")
+_SPECIES = Struct("<IIIH")
+_MONSTER = Struct("<IIIIH")
+_MOVE_STATE = Struct("<II")
+_ITEM = Struct("<IiiiB")
+
+PathOrFile = Union[str, os.PathLike, BinaryIO]
+
+
+class SaveFormatError(ValueError):
+    """Raised when a save file is malformed or has an unsupported version."""
+
+
+@contextmanager
+def _opened(target: PathOrFile, mode: str):
+    """Yield a binary file for a path, or the file object itself."""
+    if hasattr(target, "read") or hasattr(target, "write"):
+        yield target
+    else:
+        with open(target, mode) as f:
+            yield f
+
+
+class _Tables:
+    """Interning tables built while writing a save file."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self.string_ids: Dict[str, int] = {}
+        self.moves: List[MoveSpec] = []
+        self.move_ids: Dict[MoveSpec, int] = {}
+        self.species: List[SpeciesSpec] = []
+        self.species_ids: Dict[SpeciesSpec, int] = {}
+
+    def string(self, s: str) -> int:
+        sid = self.string_ids.get(s)
+        if sid is None:
+            if len(s.encode("utf-8")) > 0xFFFF:
+                raise ValueError(f"String too long for save file: {s[:20]!r}...")
+            sid = self.string_ids[s] = len(self.strings)
+            self.strings.append(s)
+        return sid
+
+    def move(self, spec: MoveSpec) -> int:
+        mid = self.move_ids.get(spec)
+        if mid is None:
+            self.string(spec.name)
+            self.string(spec.type)
+            mid = self.move_ids[spec] = len(self.moves)
+            self.moves.append(spec)
+        return mid
+
+    def species_id(self, spec: SpeciesSpec) -> int:
+        sid = self.species_ids.get(spec)
+        if sid is None:
+            self.string(spec.name)
+            self.string(spec.type)
+            for ms in spec.moves:
+                self.move(ms)
+            sid = self.species_ids[spec] = len(self.species)
+            self.species.append(spec)
+        return sid
+
+
+def save_player(player: Player, target: PathOrFile):
+    """
+    Write player's name, team and inventory in the binary save format.
+
+    Args:
+        player (Player): Player to save.
+        target (PathOrFile): Path or writable binary file.
+
+    Raises:
+        ValueError: If a string or number does not fit the format.
+    """
+    tables = _Tables()
+    tables.string(player.name)
+    team = [(tables.species_id(m.spec), m, [tables.move(mv.spec) for mv in m.get_moves()])
+            for m in player.team]
+    for it in player.inventory:
+        tables.string(it.name)
+
+    out: List[bytes] = [_HEADER.pack(MAGIC, VERSION, 0), _COUNT.pack(len(tables.strings))]
+    for s in tables.strings:
+        raw = s.encode("utf-8")
+        out.append(_STR_LEN.pack(len(raw)))
+        out.append(raw)
+    sid = tables.string_ids
+    out.append(_COUNT.pack(len(tables.moves)))
+    for ms in tables.moves:
+        out.append(_MOVE_SPEC.pack(sid[ms.name], ms.power, ms.max_pp, sid[ms.type]))
+    out.append(_COUNT.pack(len(tables.species)))
+    for sp in tables.species:
+        out.append(_SPECIES.pack(sid[sp.name], sid[sp.type], sp.base_hp, len(sp.moves)))
+        out.append(Struct(f"<{len(sp.moves)}I").pack(*(tables.move_ids[ms] for ms in sp.moves)))
+    out.append(_COUNT.pack(sid[player.name]))
+
+    out.append(_COUNT.pack(len(team)))
+    for species_idx, m, move_idx in team:
+        out.append(_MONSTER.pack(species_idx, m.level, m.max_hp, m.current_hp, len(move_idx)))
+        for mv, mid in zip(m.get_moves(), move_idx):
+            out.append(_MOVE_STATE.pack(mid, mv.current_pp))
+
+    out.append(_COUNT.pack(len(player.inventory)))
+    for it in player.inventory:
+        out.append(_ITEM.pack(sid[it.name], it.heal, it.restore_pp, it.quantity, it.is_capture))
+
+    with _opened(target, "wb") as f:
+        f.write(b"".join(out))
+
+
+class SaveReader:
+    """
+    Incremental reader for the binary save format.
+
+    Reads the header and shared tables on construction; team monsters and
+    inventory items are then decoded one record at a time, in file order.
+    """
+
+    def __init__(self, f: BinaryIO):
+        """
+        Read the header, string/move/species tables and player name.
+
+        Args:
+            f (BinaryIO): Binary file positioned at the start of a save.
+
+        Raises:
+            SaveFormatError: If the file is not a supported save.
+        """
+        self._f = f
+        magic, version, _flags = self._unpack(_HEADER)
+        if magic != MAGIC:
+            raise SaveFormatError("Not a Monster Trainer save file")
+        if version != VERSION:
+            raise SaveFormatError(f"Unsupported save version {version}")
+
+        try:
+            self.strings = [self._read(self._unpack(_STR_LEN)[0]).decode("utf-8")
+                            for _ in range(self._count())]
+        except UnicodeDecodeError as exc:
+            raise SaveFormatError(f"Invalid string in save file: {exc}") from None
+        self.move_specs: List[MoveSpec] = []
+        for _ in range(self._count()):
+            name, power, max_pp, type_idx = self._unpack(_MOVE_SPEC)
+            self.move_specs.append(move_spec(self._string(name), power, max_pp,
+                                             self._type(type_idx)))
+        self.species: List[SpeciesSpec] = []
+        for _ in range(self._count()):
+            name, type_idx, base_hp, n_moves = self._unpack(_SPECIES)
+            move_idx = Struct(f"<{n_moves}I").unpack(self._read(4 * n_moves))
+            self.species.append(SpeciesSpec(self._string(name), type_id(self._type(type_idx)),
+                                            base_hp, tuple(self._move_spec(i) for i in move_idx)))
+        self.player_name = self._string(self._count())
+        self.team_size = self._count()
+        self._team_left = self.team_size
+
+    def _read(self, n: int) -> bytes:
+        data = self._f.read(n)
+        if len(data) != n:
+            raise SaveFormatError("Truncated save file")
+        return data
+
+    def _unpack(self, st: Struct) -> Tuple:
+        return st.unpack(self._read(st.size))
+
+    def _count(self) -> int:
+        return self._unpack(_COUNT)[0]
+
+    @staticmethod
+    def _lookup(table: List, index: int, what: str):
+        if index >= len(table):
+            raise SaveFormatError(f"{what} index {index} out of range ({len(table)} entries)")
+        return table[index]
+
+    def _string(self, index: int) -> str:
+        return self._lookup(self.strings, index, "String")
+
+    def _type(self, index: int) -> str:
+        """Return the type name at a string index, checked against the type chart."""
+        name = self._string(index)
+        try:
+            type_id(name)
+        except ValueError:
+            raise SaveFormatError(f"Unknown type in save file: {name!r}") from None
+        return name
+
+    def _move_spec(self, index: int) -> MoveSpec:
+        return self._lookup(self.move_specs, index, "Move")
+
+    def iter_team(self) -> Iterator[Monster]:
+        """
+        Yield team monsters one at a time without reading ahead.
+
+        Yields:
+            Monster: Next monster in the saved team.
+
+        Raises:
+            SaveFormatError: If a record is truncated or references a
+                missing species or move.
+        """
+        while self._team_left:
+            species_idx, level, max_hp, current_hp, n_moves = self._unpack(_MONSTER)
+            spec = self._lookup(self.species, species_idx, "Species")
+            moves = []
+            for _ in range(n_moves):
+                mid, current_pp = self._unpack(_MOVE_STATE)
+                mv = Move.from_spec(self._move_spec(mid))
+                mv.current_pp = current_pp
+                moves.append(mv)
+            self._team_left -= 1
+            yield Monster._from_parts(spec, level, max_hp, current_hp, moves)
+
+    def read_inventory(self) -> List[Item]:
+        """
+        Skip any unread team records and return the saved inventory.
+
+        Returns:
+            List[Item]: Saved items in order.
+        """
+        for _ in self.iter_team():
+            pass
+        items = []
+        for _ in range(self._count()):
+            name, heal, restore_pp, quantity, is_capture = self._unpack(_ITEM)
+            items.append(Item(self._string(name), heal=heal, restore_pp=restore_pp,
+                              quantity=quantity, is_capture=bool(is_capture)))
+        return items
+
+
+def load_player(source: PathOrFile) -> Player:
+    """
+    Load a Player saved with save_player.
+
+    Args:
+        source (PathOrFile): Path or readable binary file.
+
+    Returns:
+        Player: Player with the saved team and inventory.
+
+    Raises:
+        SaveFormatError: If the file is malformed.
+    """
+    with _opened(source, "rb") as f:
+        reader = SaveReader(f)
+        player = Player(reader.player_name)
+        player.team = list(reader.iter_team())
+        player.inventory = reader.read_inventory()
+    return player
+
+
+def iter_team(source: PathOrFile) -> Iterator[Monster]:
+    """
+    Stream the saved team without materializing the whole file.
+
+    Args:
+        source (PathOrFile): Path or readable binary file.
+
+    Yields:
+        Monster: Saved monsters in team order.
+
+    Raises:
+        SaveFormatError: If the file is malformed.
+    """
+    with _opened(source, "rb") as f:
+        yield from SaveReader(f).iter_team()
@@ -0,0 +1,482 @@
+# solver.py
+
+"""
+Exact outcome probabilities for wild encounters.
+
+BattleSolver computes the win/loss/run/capture probabilities and the
+expected number of turns of an encounter by memoized dynamic programming
+over states (player HP, wild HP, PP per move slot of both sides, capture
+items left) instead of sampling. Transitions follow BattleEngine.step:
+damage as in Monster.attack, run odds from try_to_run, capture odds from
+calculate_capture_chance, and the wild side answering with
+choose_move_random (uniform usable move, Struggle when out of PP).
+
+Every transition lowers HP, PP or items except "nothing happened" turns
+(a failed run, a wasted turn with zero damage back), which are
+self-loops and are solved in closed form, so the state graph is acyclic
+apart from those.
+
+Policies marked with own_side_only (all built-in ones) decide from the
+wild HP, items and which of their own moves have PP left, never from the
+player HP or wild PP. The player side (wild HP, player PP, items) and
+the wild side (player HP, wild PP) then evolve independently: each side
+is propagated turn by turn on its own, and the outcome follows from
+"player side ends at turn t" and "player survives t - 1 wild replies".
+That replaces the product state space with two small ones: the
+Aquarion mirror match visits a few thousand states per side instead of
+265,000 joint ones. Other policies use the joint DP.
+
+Solvers are kept per matchup by solve_matchup in a bounded LRU cache,
+so a repeated query costs a dict lookup.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from monster import Monster, STRUGGLE
+from item import Item
+from move import TYPE_MATRIX
+from battle import (
+    CRITICAL_CHANCE, RUN_SUCCESS_BASE, ATTACK, ITEM, RUN, WIN, LOSS, RAN_AWAY, CAPTURED,
+    calculate_capture_chance,
+)
+
+# Crit damage multiplier used by Monster.attack
+CRIT_MULTIPLIER = 1.5
+
+# (player_hp, wild_hp, player_pp, wild_pp, items_left)
+State = Tuple[int, int, Tuple[int, ...], Tuple[int, ...], int]
+# (win, loss, ran_away, captured, stalemate, expected_turns)
+Outcome = Tuple[float, float, float, float, float, float]
+Policy = Callable[[State, "BattleSolver"], List[Tuple[float, Tuple]]]
+
+_TERMINAL_VALUES = {
+    WIN: (1.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+    LOSS: (0.0, 1.0, 0.0, 0.0, 0.0, 0.0),
+    RAN_AWAY: (0.0, 0.0, 1.0, 0.0, 0.0, 0.0),
+    CAPTURED: (0.0, 0.0, 0.0, 1.0, 0.0, 0.0),
+}
+_STALEMATE = (0.0, 0.0, 0.0, 0.0, 1.0, float("inf"))
+# Appended to a state to mark the node where the wild reply is pending
+_WILD_TURN = "wild"
+# Most solvers solve_matchup keeps (least recently used are dropped first)
+MAX_CACHED_SOLVERS = 128
+
+
+def own_side_only(policy: Policy) -> Policy:
+    """
+    Mark a policy that reads only the wild HP, items and whether its own
+    moves have PP left (not player HP, wild PP or exact PP counts).
+
+    BattleSolver solves such policies by splitting the encounter into
+    independent player and wild sides.
+    """
+    policy.own_side_only = True
+    return policy
+
+
+@own_side_only
+def attack_policy(state: State, solver: "BattleSolver") -> List[Tuple[float, Tuple]]:
+    """Uniformly random usable move, slot 0 when none (random_attack_policy)."""
+    usable = [k for k, pp in enumerate(state[2]) if pp > 0]
+    if not usable:
+        return [(1.0, (ATTACK, 0))]
+    return [(1.0 / len(usable), (ATTACK, k)) for k in usable]
+
+
+@own_side_only
+def run_policy(state: State, solver: "BattleSolver") -> List[Tuple[float, Tuple]]:
+    """Try to run every turn."""
+    return [(1.0, (RUN,))]
+
+
+@own_side_only
+def capture_policy(state: State, solver: "BattleSolver") -> List[Tuple[float, Tuple]]:
+    """Throw a capture item every turn while any are left, then attack."""
+    if state[4] > 0:
+        return [(1.0, (ITEM,))]
+    return attack_policy(state, solver)
+
+
+@lru_cache(maxsize=None)
+def capture_below(hp_ratio: float) -> Policy:
+    """
+    Return a policy that attacks until the wild HP ratio is at most hp_ratio,
+    then throws capture items while any are left.
+
+    The same ratio always returns the same policy object, so solver caches
+    are shared between calls.
+    """
+    def policy(state: State, solver: "BattleSolver") -> List[Tuple[float, Tuple]]:
+        if state[4] > 0 and state[1] <= hp_ratio * solver.wild_max_hp:
+            return [(1.0, (ITEM,))]
+        return attack_policy(state, solver)
+    policy.__name__ = f"capture_below({hp_ratio})"
+    return own_side_only(policy)
+
+
+class BattleSolver:
+    """
+    Memoized exact solver for one matchup, player policy and capture item.
+    """
+
+    def __init__(self, player_monster: Monster, wild_monster: Monster,
+                 policy: Policy = attack_policy, item: Optional[Item] = None,
+                 crit_chance: float = CRITICAL_CHANCE):
+        """
+        Initialize the solver; monsters are only read, never modified.
+
+        Args:
+            player_monster (Monster): Player side.
+            wild_monster (Monster): Wild side.
+            policy (Policy): Player policy mapping (state, solver) to a list
+                of (probability, action) pairs; actions are (ATTACK, slot),
+                (RUN,) or (ITEM,) for a capture throw.
+            item (Item): Capture item thrown by ITEM actions; its quantity
+                is the starting items_left.
+            crit_chance (float): Critical hit probability for both sides.
+        """
+        self.policy = policy
+        self.item = item
+        self.crit_chance = crit_chance
+        self.player_max_hp = player_monster.max_hp
+        self.wild_max_hp = wild_monster.max_hp
+        self.memo: Dict[Tuple, Outcome] = {}
+        self._clamp: Dict[Tuple, Tuple[int, ...]] = {}
+        self._reply_cache: Dict[Tuple[int, ...], List] = {}
+        p_moves, w_moves = player_monster.get_moves(), wild_monster.get_moves()
+        self._p_dmg = [_damage(mv.power, mv.spec.type_id, wild_monster.type_id) for mv in p_moves]
+        self._w_dmg = [_damage(mv.power, mv.spec.type_id, player_monster.type_id) for mv in w_moves]
+        self._w_struggle = _damage(STRUGGLE.power, STRUGGLE.type_id, player_monster.type_id)
+        # Smallest hit the wild side can land; 0 disables PP clamping
+        self._w_min_hit = min(d[0] for d in self._w_dmg + [self._w_struggle])
+        level_diff = wild_monster.level - player_monster.level
+        self._run_chance = max(0.1, min(0.95, RUN_SUCCESS_BASE - 0.05 * level_diff))
+        # calculate_capture_chance only depends on the wild HP ratio
+        self._probe = wild_monster.clone()
+        self.start: State = (self.player_max_hp, self.wild_max_hp,
+                             tuple(mv.max_pp for mv in p_moves),
+                             tuple(mv.max_pp for mv in w_moves),
+                             item.quantity if item is not None else 0)
+
+    def canonical(self, state: State) -> State:
+        """
+        Clamp PP that cannot run out before the encounter ends.
+
+        Every turn that does not end the encounter includes a wild hit of
+        at least the wild side's smallest damage, so at most
+        ceil(player_hp / smallest hit) turns remain and no slot can be used
+        more often; PP above that bound is equivalent to the bound, which
+        collapses most of the state space.
+        """
+        if self._w_min_hit <= 0:
+            return state
+        p_hp, w_hp, p_pp, w_pp, items = state
+        cap = -(-p_hp // self._w_min_hit)
+        return (p_hp, w_hp, self._capped(p_pp, cap), self._capped(w_pp, cap), items)
+
+    def _capped(self, pp: Tuple[int, ...], cap: int) -> Tuple[int, ...]:
+        """Return pp with every slot clamped to cap (cached)."""
+        key = (pp, cap)
+        new = self._clamp.get(key)
+        if new is None:
+            new = self._clamp[key] = tuple(min(x, cap) for x in pp)
+        return new
+
+    def capture_chance(self, wild_hp: int) -> float:
+        """Return calculate_capture_chance for the wild monster at wild_hp."""
+        if self.item is None:
+            return 0.0
+        self._probe.current_hp = wild_hp
+        return calculate_capture_chance(self._probe, self.item)
+
+    def solve(self, state: Optional[State] = None) -> Dict:
+        """
+        Solve the encounter from state (a fresh encounter by default).
+
+        Args:
+            state (State): Optional mid-battle state.
+
+        Returns:
+            Dict: Result with keys win, loss, ran_away, captured and
+                stalemate (probabilities) and expected_turns (float, inf
+                when a stalemate is possible).
+        """
+        root = self.canonical(state or self.start)
+        if getattr(self.policy, "own_side_only", False) and self._w_min_hit > 0:
+            value = self.memo.get(root)
+            if value is None:
+                value = self.memo[root] = self._split_value(root)
+        else:
+            value = self._value(root)
+        win, loss, ran, captured, stalemate, turns = value
+        return {"win": win, "loss": loss, "ran_away": ran, "captured": captured,
+                "stalemate": stalemate, "expected_turns": turns}
+
+    def _value(self, root: State) -> Outcome:
+        """
+        Fill the memo for every node reachable from root (iteratively).
+
+        Nodes are player-turn states and, as the same tuple extended with
+        _WILD_TURN, states where the wild reply is still pending. Splitting
+        turns this way keeps branching additive instead of multiplicative.
+        """
+        memo = self.memo
+        pending: Dict[Tuple, Dict] = {}
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            if node in memo:
+                stack.pop()
+                continue
+            trans = pending.get(node)
+            if trans is None:
+                if len(node) == 5:
+                    trans = pending[node] = self._player_transitions(node)
+                else:
+                    trans = pending[node] = self._wild_transitions(node)
+            missing = [nxt for nxt in trans if nxt.__class__ is tuple and nxt != node
+                       and nxt not in memo]
+            if missing:
+                stack.extend(missing)
+                continue
+            memo[node] = self._combine(node, trans, len(node) == 5)
+            del pending[node]
+            stack.pop()
+        return memo[root]
+
+    def _split_value(self, root: State) -> Outcome:
+        """
+        Solve root by propagating the player and wild sides separately.
+
+        Needs an own_side_only policy and a wild side whose every hit does
+        damage, so the player is down within horizon wild replies.
+        """
+        p_hp, w_hp, p_pp, w_pp, items = root
+        w_min = self._w_min_hit
+        horizon = -(-p_hp // w_min)
+
+        # survive[t]: probability the player is still up after t wild replies
+        survive = [1.0]
+        wild: Dict[Tuple, float] = {(p_hp, w_pp): 1.0}
+        for _ in range(horizon):
+            nxt: Dict[Tuple, float] = {}
+            for (hp, pp), prob in wild.items():
+                for p, dmg, new_pp in self._replies(pp):
+                    left = hp - dmg
+                    if left > 0:
+                        key = (left, self._capped(new_pp, -(-left // w_min)))
+                        nxt[key] = nxt.get(key, 0.0) + prob * p
+            wild = nxt
+            survive.append(sum(wild.values()))
+
+        # ended[result][t]: probability the player side ends the encounter
+        # at turn t; going[t]: probability it has not ended after t turns
+        ended = {WIN: [0.0] * (horizon + 1), RAN_AWAY: [0.0] * (horizon + 1),
+                 CAPTURED: [0.0] * (horizon + 1)}
+        going = [1.0]
+        player: Dict[Tuple, float] = {(w_hp, self._capped(p_pp, horizon), items): 1.0}
+        for t in range(1, horizon + 1):
+            nxt = {}
+            # PP beyond the turns left can never run out
+            cap = horizon - t
+            for (hp, pp, left), prob in player.items():
+                for p, new_w_hp, new_pp, new_items, result in self._player_branches(
+                        (p_hp, hp, pp, w_pp, left)):
+                    if result is not None:
+                        ended[result][t] += prob * p
+                    else:
+                        key = (new_w_hp, self._capped(new_pp, cap), new_items)
+                        nxt[key] = nxt.get(key, 0.0) + prob * p
+            player = nxt
+            going.append(sum(player.values()))
+
+        win, ran, captured = (sum(ended[r][t] * survive[t - 1] for t in range(1, horizon + 1))
+                              for r in (WIN, RAN_AWAY, CAPTURED))
+        loss = sum(going[t] * (survive[t - 1] - survive[t]) for t in range(1, horizon + 1))
+        turns = sum(going[t] * survive[t] for t in range(horizon))
+        return (win, loss, ran, captured, 0.0, turns)
+
+    def _combine(self, node: Tuple, trans: Dict, new_turn: bool) -> Outcome:
+        """Bellman update, solving a self-loop of probability q in closed form."""
+        q = trans.get(node, 0.0)
+        if q >= 1.0 - 1e-12:
+            return _STALEMATE
+        memo = self.memo
+        win = loss = ran = captured = stalemate = turns = 0.0
+        for nxt, p in trans.items():
+            if nxt == node:
+                continue
+            v = memo[nxt] if nxt.__class__ is tuple else _TERMINAL_VALUES[nxt]
+            win += p * v[0]
+            loss += p * v[1]
+            ran += p * v[2]
+            captured += p * v[3]
+            stalemate += p * v[4]
+            turns += p * v[5]
+        scale = 1.0 / (1.0 - q)
+        stalemate *= scale
+        if stalemate > 1e-12:
+            turns = float("inf")
+        else:
+            turns = (new_turn + turns) * scale
+        return (win * scale, loss * scale, ran * scale, captured * scale, stalemate, turns)
+
+    def _replies(self, w_pp: Tuple[int, ...]) -> List[Tuple[float, int, Tuple[int, ...]]]:
+        """Wild reply outcomes (probability, damage, wild PP after), cached by PP."""
+        replies = self._reply_cache.get(w_pp)
+        if replies is None:
+            usable = [k for k, pp in enumerate(w_pp) if pp > 0]
+            replies = []
+            for k in usable or [-1]:
+                damage = self._w_dmg[k] if k >= 0 else self._w_struggle
+                new_w_pp = w_pp if k < 0 else w_pp[:k] + (w_pp[k] - 1,) + w_pp[k + 1:]
+                for dmg, prob in _outcomes(damage, self.crit_chance):
+                    if prob > 0.0:
+                        replies.append((prob / max(1, len(usable)), dmg, new_w_pp))
+            self._reply_cache[w_pp] = replies
+        return replies
+
+    def _reply_targets(self, state: State, prob: float, out: Dict):
+        """Add the wild reply to state, weighted by prob, to out."""
+        p_hp, w_hp, p_pp, _, items = state
+        for p, dmg, new_w_pp in self._replies(state[3]):
+            hp = p_hp - dmg
+            nxt = LOSS if hp <= 0 else self.canonical((hp, w_hp, p_pp, new_w_pp, items))
+            out[nxt] = out.get(nxt, 0.0) + p * prob
+
+    def _wild_transitions(self, node: Tuple) -> Dict:
+        """Transitions of a pending wild reply."""
+        out: Dict = {}
+        self._reply_targets(node[:5], 1.0, out)
+        return out
+
+    def _player_transitions(self, state: State) -> Dict:
+        """
+        Transitions of a player turn.
+
+        Player actions that change nothing (failed run, wasted turn) are
+        followed by the wild reply inline so a zero-damage reply shows up
+        as a direct self-loop.
+        """
+        p_hp, _, _, w_pp, _ = state
+        out: Dict = {}
+        for prob, new_w_hp, new_p_pp, new_items, result in self._player_branches(state):
+            if result is not None:
+                out[result] = out.get(result, 0.0) + prob
+                continue
+            after = (p_hp, new_w_hp, new_p_pp, w_pp, new_items)
+            if after == state:
+                self._reply_targets(state, prob, out)
+            else:
+                nxt = after + (_WILD_TURN,)
+                out[nxt] = out.get(nxt, 0.0) + prob
+        return out
+
+    def _player_branches(self, state: State) -> Iterator[Tuple]:
+        """
+        Yield the outcomes of the player's action in state.
+
+        Yields:
+            Tuple: (probability, wild_hp, player_pp, items_left, result),
+                result being WIN, RAN_AWAY or CAPTURED when the action ends
+                the encounter and None otherwise.
+        """
+        _, w_hp, p_pp, _, items = state
+        crit = self.crit_chance
+        for p_action, action in self.policy(state, self):
+            kind = action[0]
+            # Player action: list of (prob, wild_hp, player_pp, items, result)
+            branches = []
+            if kind == ATTACK:
+                k = action[1]
+                if 0 <= k < len(p_pp) and p_pp[k] > 0:
+                    pp = p_pp[:k] + (p_pp[k] - 1,) + p_pp[k + 1:]
+                    for dmg, prob in _outcomes(self._p_dmg[k], crit):
+                        branches.append((prob, max(0, w_hp - dmg), pp, items, None))
+                else:
+                    branches.append((1.0, w_hp, p_pp, items, None))
+            elif kind == RUN:
+                chance = self._run_chance
+                branches.append((chance, w_hp, p_pp, items, RAN_AWAY))
+                branches.append((1.0 - chance, w_hp, p_pp, items, None))
+            elif kind == ITEM:
+                chance = self.capture_chance(w_hp)
+                left = max(0, items - 1)
+                branches.append((chance, w_hp, p_pp, left, CAPTURED))
+                branches.append((1.0 - chance, w_hp, p_pp, left, None))
+            else:
+                branches.append((1.0, w_hp, p_pp, items, None))
+
+            for prob, new_w_hp, new_p_pp, new_items, result in branches:
+                prob *= p_action
+                if prob <= 0.0:
+                    continue
+                if result is None and new_w_hp <= 0:
+                    result = WIN
+                yield prob, new_w_hp, new_p_pp, new_items, result
+
+
+def _damage(power: int, move_type: int, defender_type: int) -> Tuple[int, int]:
+    """Return (normal, critical) damage as computed by Monster.attack."""
+    if power <= 0:
+        return (0, 0)
+    mult = TYPE_MATRIX[move_type][defender_type]
+    return (int(power * mult * 1.0), int(power * mult * CRIT_MULTIPLIER))
+
+
+def _outcomes(damage: Tuple[int, int], crit_chance: float) -> List[Tuple[int, float]]:
+    """Damage outcomes with probabilities, merged when a crit changes nothing."""
+    normal, crit = damage
+    if normal == crit:
+        return [(normal, 1.0)]
+    return [(normal, 1.0 - crit_chance), (crit, crit_chance)]
+
+
+# Solvers by matchup, shared by solve_matchup calls, least recently used first
+_solvers: "OrderedDict[Tuple, BattleSolver]" = OrderedDict()
+
+
+def solve_matchup(player_monster: Monster, wild_monster: Monster,
+                  policy: Policy = attack_policy, item: Optional[Item] = None,
+                  crit_chance: float = CRITICAL_CHANCE) -> Dict:
+    """
+    Solve a fresh encounter, reusing the cached solver for the matchup.
+
+    Args:
+        player_monster (Monster): Player side.
+        wild_monster (Monster): Wild side.
+        policy (Policy): Player policy (see BattleSolver).
+        item (Item): Capture item for ITEM actions.
+        crit_chance (float): Critical hit probability.
+
+    Returns:
+        Dict: Result as returned by BattleSolver.solve.
+    """
+    key = (_monster_key(player_monster), _monster_key(wild_monster), policy,
+           None if item is None else (item.heal, item.restore_pp, item.quantity, item.is_capture),
+           crit_chance)
+    solver = _solvers.get(key)
+    if solver is None:
+        solver = _solvers[key] = BattleSolver(player_monster, wild_monster, policy, item, crit_chance)
+        if len(_solvers) > MAX_CACHED_SOLVERS:
+            _solvers.popitem(last=False)
+    else:
+        _solvers.move_to_end(key)
+    return solver.solve()
+
+
+def _monster_key(monster: Monster) -> Tuple:
+    return (monster.spec, monster.level, monster.max_hp,
+            tuple(mv.spec for mv in monster.get_moves()))
+
+
+def clear_cache():
+    """Drop every cached solver."""
+    _solvers.clear()
+
+
+def cache_info() -> Dict[str, int]:
+    """Return the number of cached solvers and memoized states."""
+    return {"solvers": len(_solvers), "states": sum(len(s.memo) for s in _solvers.values())}
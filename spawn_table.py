@@ -0,0 +1,276 @@
+# spawn_table.py
+
+"""
+Weighted wild-encounter tables for Monster Trainer Game.
+
+A SpawnTable lists the species of one zone with a rarity weight and a
+level band each. Picking an entry uses a precomputed alias table
+(Vose's method): one random() draw selects a column and decides between
+the column's own entry and its alias, so a sample costs O(1) however
+many species the zone has. A second draw picks the level.
+
+Spawned monsters come from registry prototypes via Monster.spawn, with
+max HP for every level in the band precomputed the same way
+Monster.level_up scales it. spawn_many() produces thousands of monsters
+per call, either as Monster objects or appended straight into a
+monster_store.MonsterStore without building Monster objects at all.
+
+Zones are read from zones.json in the catalog data directory:
+
+    {"zone": [{"species": name, "weight": w, "levels": [lo, hi]}, ...]}
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import os
+import random
+
+from monster import Monster, hp_after_levels
+from species import SpeciesRegistry
+
+ZONES_FILE = "zones.json"
+DEFAULT_ZONE = "meadow"
+
+
+@dataclass(frozen=True, slots=True)
+class SpawnEntry:
+    """
+    One species of a spawn table: rarity weight and inclusive level band.
+    """
+
+    species: str
+    weight: float = 1.0
+    min_level: int = 1
+    max_level: int = 1
+
+
+def build_alias_table(weights: List[float]) -> Tuple[List[float], List[int]]:
+    """
+    Build Vose's alias table for weighted sampling.
+
+    Args:
+        weights (List[float]): Positive weights (need not sum to 1).
+
+    Returns:
+        Tuple[List[float], List[int]]: Per-column acceptance probability and
+            alias index. Column i yields i with probability prob[i], else alias[i].
+
+    Raises:
+        ValueError: If weights is empty or any weight is not positive.
+    """
+    n = len(weights)
+    if not n:
+        raise ValueError("Spawn table needs at least one entry")
+    if any(not w > 0 for w in weights):
+        raise ValueError(f"Spawn weights must be positive: {weights!r}")
+    total = float(sum(weights))
+    scaled = [w * n / total for w in weights]
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s, g = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = g
+        scaled[g] -= 1.0 - scaled[s]
+        (small if scaled[g] < 1.0 else large).append(g)
+    # Leftovers are 1.0 up to rounding error
+    return prob, alias
+
+
+class SpawnTable:
+    """
+    Weighted species/level sampler for one zone.
+    """
+
+    def __init__(self, entries: Iterable[SpawnEntry], registry: SpeciesRegistry):
+        """
+        Initialize the table.
+
+        Args:
+            entries (Iterable[SpawnEntry]): Species with weights and level bands.
+            registry (SpeciesRegistry): Source of species prototypes.
+
+        Raises:
+            ValueError: If an entry has a bad weight or level band, or names
+                a species the registry does not know.
+        """
+        self.entries: List[SpawnEntry] = list(entries)
+        self.registry = registry
+        for e in self.entries:
+            if not 1 <= e.min_level <= e.max_level:
+                raise ValueError(f"Invalid level band for {e.species}: {e.min_level}-{e.max_level}")
+            if e.species not in registry:
+                raise ValueError(f"Unknown species in spawn table: {e.species!r}")
+        self._prob, self._alias = build_alias_table([e.weight for e in self.entries])
+        self._n = len(self.entries)
+        # Resolved on first pick so large tables stay lazy
+        self._protos: List[Optional[Monster]] = [None] * self._n
+        self._hp: List[Optional[List[int]]] = [None] * self._n
+
+    @classmethod
+    def uniform(cls, registry: SpeciesRegistry, level: int = 1) -> "SpawnTable":
+        """Return a table giving every registry species equal weight at one level."""
+        return cls([SpawnEntry(name, 1.0, level, level) for name in registry.names()], registry)
+
+    def _resolve(self, index: int) -> Monster:
+        """Fetch the prototype of an entry and precompute its max HP per level."""
+        entry = self.entries[index]
+        proto = self.registry.get(entry.species)
+        hps = [hp_after_levels(proto.max_hp, max(0, level - proto.level))
+               for level in range(entry.min_level, entry.max_level + 1)]
+        self._hp[index] = hps
+        self._protos[index] = proto
+        return proto
+
+    def sample(self, rng=None) -> Tuple[int, int]:
+        """
+        Pick an entry and a level.
+
+        Args:
+            rng: Random source with random(); defaults to the random module.
+
+        Returns:
+            Tuple[int, int]: Entry index and level.
+        """
+        rand = (random if rng is None else rng).random
+        r = rand() * self._n
+        i = int(r)
+        if r - i >= self._prob[i]:
+            i = self._alias[i]
+        e = self.entries[i]
+        return i, e.min_level + int(rand() * (e.max_level - e.min_level + 1))
+
+    def sample_many(self, n: int, rng=None) -> Tuple[List[int], List[int]]:
+        """
+        Pick n entries and levels.
+
+        Returns:
+            Tuple[List[int], List[int]]: Entry indices and levels.
+        """
+        rand = (random if rng is None else rng).random
+        prob, alias, entries, size = self._prob, self._alias, self.entries, self._n
+        indices, levels = [0] * n, [0] * n
+        for k in range(n):
+            r = rand() * size
+            i = int(r)
+            if r - i >= prob[i]:
+                i = alias[i]
+            e = entries[i]
+            indices[k] = i
+            levels[k] = e.min_level + int(rand() * (e.max_level - e.min_level + 1))
+        return indices, levels
+
+    def sample_arrays(self, n: int, rng=None):
+        """
+        Vectorized sample_many returning NumPy int arrays (entry indices, levels).
+
+        Args:
+            n (int): Number of samples.
+            rng: GameRNG (its numpy() generator is used) or a NumPy Generator.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        import numpy as np
+        gen = rng.numpy() if hasattr(rng, "numpy") else (rng or np.random.default_rng())
+        r = gen.random(n) * self._n
+        cols = r.astype(np.int64)
+        keep = (r - cols) < np.asarray(self._prob)[cols]
+        indices = np.where(keep, cols, np.asarray(self._alias, dtype=np.int64)[cols])
+        lo = np.array([e.min_level for e in self.entries], dtype=np.int64)[indices]
+        span = np.array([e.max_level - e.min_level + 1 for e in self.entries], dtype=np.int64)[indices]
+        levels = lo + (gen.random(n) * span).astype(np.int64)
+        return indices, levels
+
+    def _make(self, index: int, level: int) -> Monster:
+        proto = self._protos[index] or self._resolve(index)
+        mon = proto.spawn()
+        hp = self._hp[index][level - self.entries[index].min_level]
+        mon.level = level
+        mon.max_hp = hp
+        mon.current_hp = hp
+        return mon
+
+    def spawn(self, rng=None) -> Monster:
+        """
+        Spawn one wild monster at full HP and PP.
+
+        Args:
+            rng: Random source with random(); defaults to the random module.
+        """
+        return self._make(*self.sample(rng))
+
+    def spawn_many(self, n: int, rng=None, store=None) -> List[Monster]:
+        """
+        Spawn n wild monsters in one call.
+
+        Args:
+            n (int): Number of monsters.
+            rng: Random source with random(); defaults to the random module.
+            store (MonsterStore): If given, rows are appended to it directly
+                (no Monster objects are built) and an empty list is returned.
+
+        Returns:
+            List[Monster]: The monsters (empty when store is given).
+        """
+        indices, levels = self.sample_many(n, rng)
+        if store is None:
+            make = self._make
+            return [make(i, lvl) for i, lvl in zip(indices, levels)]
+        for i in set(indices):
+            if self._protos[i] is None:
+                self._resolve(i)
+        protos, hp, entries = self._protos, self._hp, self.entries
+        append = store.append_fresh
+        for i, lvl in zip(indices, levels):
+            append(protos[i].spec, lvl, hp[i][lvl - entries[i].min_level])
+        return []
+
+    def probabilities(self) -> Dict[str, float]:
+        """Return each species' share of spawns (summed over its entries)."""
+        total = float(sum(e.weight for e in self.entries))
+        shares: Dict[str, float] = {}
+        for e in self.entries:
+            shares[e.species] = shares.get(e.species, 0.0) + e.weight / total
+        return shares
+
+    def __len__(self) -> int:
+        return self._n
+
+
+def load_spawn_tables(registry: SpeciesRegistry, path: str) -> Dict[str, SpawnTable]:
+    """
+    Load every zone's spawn table from a zones.json file.
+
+    Args:
+        registry (SpeciesRegistry): Source of species prototypes.
+        path (str): zones.json path or the directory holding it.
+
+    Returns:
+        Dict[str, SpawnTable]: Zone name -> table (empty if the file is missing).
+
+    Raises:
+        ValueError: If the file is malformed or names unknown species.
+    """
+    if os.path.isdir(path):
+        path = os.path.join(path, ZONES_FILE)
+    try:
+        with open(path, encoding="utf-8") as fh:
+            zones = json.load(fh)
+    except FileNotFoundError:
+        return {}
+    if not isinstance(zones, dict):
+        raise ValueError(f"{path} must map zone names to entry lists")
+    tables = {}
+    for zone, rows in zones.items():
+        try:
+            entries = [SpawnEntry(row["species"], float(row.get("weight", 1.0)),
+                                  *(int(x) for x in row.get("levels", (1, 1))))
+                       for row in rows]
+            tables[zone] = SpawnTable(entries, registry)
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid spawn table for zone {zone!r}: {exc}") from exc
+    return tables
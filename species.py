@@ -0,0 +1,88 @@
+# species.py
+
+"""
+Species prototype registry for Monster Trainer Game.
+
+Holds one prototype Monster per species and spawns fresh instances from
+it with Monster.spawn instead of deep-copying.
+"""
+
+from typing import Dict, Iterable, List
+import random
+
+from monster import Monster
+
+
+class SpeciesRegistry:
+    """
+    Maps species names to prototype monsters and spawns copies of them.
+    """
+
+    def __init__(self, prototypes: Iterable[Monster] = ()):
+        """
+        Initialize the registry.
+
+        Args:
+            prototypes (Iterable[Monster]): Prototypes to register.
+        """
+        self._protos: Dict[str, Monster] = {}
+        self._order: List[Monster] = []
+        for proto in prototypes:
+            self.register(proto)
+
+    def register(self, prototype: Monster):
+        """
+        Register (or replace) the prototype for a species.
+
+        Args:
+            prototype (Monster): Prototype; its name is the species key.
+        """
+        old = self._protos.get(prototype.name)
+        if old is not None:
+            self._order[self._order.index(old)] = prototype
+        else:
+            self._order.append(prototype)
+        self._protos[prototype.name] = prototype
+
+    def get(self, name: str) -> Monster:
+        """
+        Return the prototype for a species.
+
+        Raises:
+            KeyError: If the species is unknown.
+        """
+        return self._protos[name]
+
+    def spawn(self, name: str) -> Monster:
+        """
+        Spawn a fresh monster of a species.
+
+        Args:
+            name (str): Species name.
+
+        Returns:
+            Monster: New instance at full HP and PP.
+
+        Raises:
+            KeyError: If the species is unknown.
+        """
+        return self._protos[name].spawn()
+
+    def spawn_random(self, rng=None) -> Monster:
+        """
+        Spawn a fresh monster of a uniformly random species.
+
+        Args:
+            rng: Random source with choice(); defaults to the random module.
+        """
+        return (random if rng is None else rng).choice(self._order).spawn()
+
+    def names(self) -> List[str]:
+        """Return species names in registration order."""
+        return [p.name for p in self._order]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._protos
+
+    def __len__(self) -> int:
+        return len(self._order)
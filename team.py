@@ -0,0 +1,231 @@
+# team.py
+
+"""
+List-compatible team container with incrementally maintained aggregates.
+
+A Team keeps the alive count, total current HP, total max HP and the
+number of monsters per type up to date as monsters join and leave and
+as their current_hp, max_hp and type setters change them, so
+Player.has_usable_monsters and total_team_health are O(1) however large
+the team is.
+
+Each Monster lists the Teams it is on (Monster._teams, one entry per
+membership), so the same monster may sit on several teams, or twice on
+one, as with a plain list. Only replacing a monster's spec directly is
+not seen; call refresh() afterwards. consistency_errors() recomputes
+everything from scratch for tests.
+"""
+
+from typing import Dict, Iterable, Iterator, List
+
+from monster import Monster
+from move import TYPE_NAMES, type_id
+
+
+class Team:
+    """
+    Ordered list of monsters with running HP and type aggregates.
+    """
+
+    def __init__(self, monsters: Iterable[Monster] = ()):
+        """
+        Initialize the team.
+
+        Args:
+            monsters (Iterable[Monster]): Initial members, in order.
+        """
+        self._members: List[Monster] = []
+        self.alive_count = 0
+        self.total_hp = 0
+        self.total_max_hp = 0
+        # type_id -> number of members of that type
+        self._type_counts: Dict[int, int] = {}
+        for mon in monsters:
+            self.append(mon)
+
+    # Aggregate maintenance (called by Monster)
+
+    def _attach(self, mon: Monster):
+        mon._teams += (self,)
+        hp = mon.current_hp
+        self.alive_count += hp > 0
+        self.total_hp += hp
+        self.total_max_hp += mon.max_hp
+        tid = mon.spec.type_id
+        self._type_counts[tid] = self._type_counts.get(tid, 0) + 1
+
+    def _detach(self, mon: Monster):
+        teams = mon._teams
+        for i, team in enumerate(teams):
+            if team is self:
+                mon._teams = teams[:i] + teams[i + 1:]
+                break
+        hp = mon.current_hp
+        self.alive_count -= hp > 0
+        self.total_hp -= hp
+        self.total_max_hp -= mon.max_hp
+        tid = mon.spec.type_id
+        left = self._type_counts[tid] - 1
+        if left:
+            self._type_counts[tid] = left
+        else:
+            del self._type_counts[tid]
+
+    def _hp_changed(self, old_hp: int, new_hp: int, old_max: int = 0, new_max: int = 0):
+        self.total_hp += new_hp - old_hp
+        self.alive_count += (new_hp > 0) - (old_hp > 0)
+        self.total_max_hp += new_max - old_max
+
+    def _type_changed(self, old_id: int, new_id: int):
+        counts = self._type_counts
+        counts[old_id] -= 1
+        if not counts[old_id]:
+            del counts[old_id]
+        counts[new_id] = counts.get(new_id, 0) + 1
+
+    def refresh(self):
+        """Recompute every aggregate (after direct writes to spec)."""
+        members = self._members
+        self.alive_count = sum(1 for m in members if m.current_hp > 0)
+        self.total_hp = sum(m.current_hp for m in members)
+        self.total_max_hp = sum(m.max_hp for m in members)
+        counts: Dict[int, int] = {}
+        for m in members:
+            counts[m.spec.type_id] = counts.get(m.spec.type_id, 0) + 1
+        self._type_counts = counts
+
+    def consistency_errors(self) -> List[str]:
+        """
+        Compare the running aggregates with a full recomputation.
+
+        Returns:
+            List[str]: One description per mismatch (empty if consistent).
+        """
+        saved = (self.alive_count, self.total_hp, self.total_max_hp, dict(self._type_counts))
+        self.refresh()
+        fresh = (self.alive_count, self.total_hp, self.total_max_hp, self._type_counts)
+        self.alive_count, self.total_hp, self.total_max_hp, self._type_counts = saved
+        names = ("alive_count", "total_hp", "total_max_hp", "type_counts")
+        errors = [f"{name}: running {a} != recomputed {b}"
+                  for name, a, b in zip(names, saved, fresh) if a != b]
+        errors += [f"{m.name} at {i} is not linked to this team"
+                   for i, m in enumerate(self._members) if not self._links(m)]
+        return errors
+
+    def _links(self, mon) -> int:
+        """Return how many memberships of mon point at this team."""
+        return sum(1 for team in getattr(mon, "_teams", ()) if team is self)
+
+    # Queries
+
+    def has_alive(self) -> bool:
+        """Return True if any member is not fainted."""
+        return self.alive_count > 0
+
+    def type_counts(self) -> Dict[str, int]:
+        """Return the number of members per type name."""
+        return {TYPE_NAMES[tid]: n for tid, n in self._type_counts.items()}
+
+    def count_type(self, type_name: str) -> int:
+        """Return how many members have the given type."""
+        try:
+            return self._type_counts.get(type_id(type_name), 0)
+        except ValueError:
+            return 0
+
+    # List interface
+
+    def append(self, mon: Monster):
+        """Add a monster at the end."""
+        self._attach(mon)
+        self._members.append(mon)
+
+    def extend(self, monsters: Iterable[Monster]):
+        """Add several monsters at the end."""
+        for mon in monsters:
+            self.append(mon)
+
+    def insert(self, index: int, mon: Monster):
+        """Add a monster before index."""
+        self._attach(mon)
+        self._members.insert(index, mon)
+
+    def pop(self, index: int = -1) -> Monster:
+        """Remove and return the monster at index."""
+        mon = self._members.pop(index)
+        self._detach(mon)
+        return mon
+
+    def remove(self, mon: Monster):
+        """Remove mon (by identity); raises ValueError if absent."""
+        self.pop(self.index(mon))
+
+    def index(self, mon: Monster) -> int:
+        """Return the position of mon (by identity); raises ValueError if absent."""
+        for i, m in enumerate(self._members):
+            if m is mon:
+                return i
+        raise ValueError("Monster not on team")
+
+    def clear(self):
+        """Remove every monster."""
+        for mon in self._members:
+            self._detach(mon)
+        self._members.clear()
+        self.refresh()
+
+    def __getitem__(self, index):
+        return self._members[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            new = list(value)
+            for mon in self._members[index]:
+                self._detach(mon)
+            for mon in new:
+                self._attach(mon)
+            self._members[index] = new
+            return
+        if value is self._members[index]:
+            return
+        self._attach(value)
+        self._detach(self._members[index])
+        self._members[index] = value
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            for mon in self._members[index]:
+                self._detach(mon)
+        else:
+            self._detach(self._members[index])
+        del self._members[index]
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __iter__(self) -> Iterator[Monster]:
+        return iter(self._members)
+
+    def __reversed__(self) -> Iterator[Monster]:
+        return reversed(self._members)
+
+    def __contains__(self, mon) -> bool:
+        return self._links(mon) > 0
+
+    def __bool__(self) -> bool:
+        return bool(self._members)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Team):
+            return self._members == other._members
+        if isinstance(other, list):
+            return self._members == other
+        return NotImplemented
+
+    def __reduce__(self):
+        # Copies and pickles rebuild the team through _attach, relinking the
+        # copied members to it
+        return Team, (list(self._members),)
+
+    def __repr__(self):
+        return f"Team({self._members!r})"
@@ -0,0 +1,330 @@
+# team_builder.py
+
+"""
+Lineup optimizer: pick the best team from a large collection.
+
+Every candidate monster is reduced to a combat profile (type, max HP and
+(move type, power) pairs); monsters sharing a profile are
+interchangeable. For each candidate profile a and opponent profile d
+the expected outcome
+
+    s(a, d) = T_a / (T_a + T_d)
+
+compares how long a survives d's best expected hit (T_a = a.hp /
+dmg_d) with how long d survives a's (T_d = d.hp / dmg_a), using
+TYPE_MATRIX multipliers, move power and CRITICAL_CHANCE. s > 0.5 means
+a is expected to win. Scores are cached as one column per opponent
+profile, so repeated queries over the same box and zones only look
+them up.
+
+A team's value against weighted opponents is the coverage
+
+    f(team) = sum_d w_d * max_{a in team} s(a, d)
+
+i.e. each opponent is met by the team's best counter. Profiles another
+profile beats or ties against every opponent are dropped first; the
+rest are searched by branch and bound. The search starts from a greedy
+lineup improved by single swaps and prunes with two upper bounds: the
+best remaining score per opponent, and the sum of the best remaining
+marginal gains (valid because f is submodular). An optional node budget
+caps the worst case.
+"""
+
+from heapq import heappush, heapreplace
+from math import inf
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from battle import CRITICAL_CHANCE
+from monster import STRUGGLE, Monster
+from move import TYPE_MATRIX
+
+TEAM_SIZE = 6
+
+# (type_id, max_hp, ((move type_id, power), ...))
+Profile = Tuple[int, int, Tuple[Tuple[int, int], ...]]
+Opponent = Union[Monster, Tuple[Monster, float]]
+
+
+def profile_of(monster: Monster) -> Profile:
+    """Return the combat profile of a monster (PP and current HP are ignored)."""
+    moves = tuple(sorted({(mv.spec.type_id, mv.spec.power) for mv in monster.moves}))
+    return monster.spec.type_id, monster.max_hp, moves or ((STRUGGLE.type_id, STRUGGLE.power),)
+
+
+def expected_damage(attacker: Profile, defender: Profile, crit_chance: float = CRITICAL_CHANCE) -> float:
+    """
+    Return the attacker's best expected damage per turn against defender.
+
+    Args:
+        attacker (Profile): Attacking profile.
+        defender (Profile): Defending profile.
+        crit_chance (float): Critical hit probability (x1.5 damage).
+
+    Returns:
+        float: Expected damage of the best move, truncated like Monster.attack.
+    """
+    row_type = defender[0]
+    best = 0.0
+    for move_type, power in attacker[2]:
+        mult = TYPE_MATRIX[move_type][row_type]
+        dmg = (1 - crit_chance) * int(power * mult) + crit_chance * int(power * mult * 1.5)
+        if dmg > best:
+            best = dmg
+    return best
+
+
+def outcome_score(a: Profile, d: Profile) -> float:
+    """
+    Return the expected outcome s(a, d) in [0, 1] (see module docstring).
+    """
+    return _outcome(a[1], d[1], expected_damage(a, d), expected_damage(d, a))
+
+
+def _outcome(hp_a: int, hp_d: int, dmg_a: float, dmg_d: float) -> float:
+    survive = hp_a / dmg_d if dmg_d else inf
+    finish = hp_d / dmg_a if dmg_a else inf
+    if survive == finish:
+        return 0.5
+    if survive == inf:
+        return 1.0
+    return survive / (survive + finish)
+
+
+def opponents_from_table(table) -> List[Tuple[Monster, float]]:
+    """
+    Turn a spawn_table.SpawnTable into weighted opponents.
+
+    Each entry contributes its species at the top of its level band (the
+    toughest version a zone can spawn), weighted by its spawn share.
+
+    Args:
+        table (SpawnTable): Zone spawn table.
+
+    Returns:
+        List[Tuple[Monster, float]]: (opponent, weight) pairs.
+    """
+    total = float(sum(e.weight for e in table.entries))
+    opponents = []
+    for e in table.entries:
+        mon = table.registry.get(e.species).spawn()
+        mon.level_up(e.max_level - mon.level)
+        opponents.append((mon, e.weight / total))
+    return opponents
+
+
+class TeamBuilder:
+    """
+    Picks lineups from a fixed collection, caching pairwise scores.
+    """
+
+    def __init__(self, monsters: Iterable[Monster]):
+        """
+        Initialize the builder.
+
+        Args:
+            monsters (Iterable[Monster]): Candidates (e.g. a player's team and box).
+        """
+        self.refresh(monsters)
+
+    @classmethod
+    def for_player(cls, player) -> "TeamBuilder":
+        """Return a builder over a player's team and PC box (if any)."""
+        monsters = list(player.team)
+        if player.box is not None:
+            monsters.extend(player.box)
+        return cls(monsters)
+
+    def refresh(self, monsters: Iterable[Monster]):
+        """
+        Replace the candidates and drop the cached score columns.
+
+        Args:
+            monsters (Iterable[Monster]): New candidates.
+        """
+        self.monsters: List[Monster] = list(monsters)
+        groups: Dict[Profile, List[Monster]] = {}
+        for mon in self.monsters:
+            groups.setdefault(profile_of(mon), []).append(mon)
+        self._groups = groups
+        self._profiles: List[Profile] = list(groups)
+        # opponent profile -> s(a, opponent) for every candidate profile a
+        self._columns: Dict[Profile, List[float]] = {}
+
+    def score_column(self, opponent: Profile) -> List[float]:
+        """Return s(a, opponent) for every candidate profile a (cached)."""
+        column = self._columns.get(opponent)
+        if column is not None:
+            return column
+        # Damage depends only on the attacker's moves and the defender's type,
+        # so it is computed once per distinct move set / candidate type
+        dealt: Dict[Tuple, float] = {}
+        taken: Dict[int, float] = {}
+        column = []
+        for a in self._profiles:
+            dmg_a = dealt.get(a[2])
+            if dmg_a is None:
+                dmg_a = dealt[a[2]] = expected_damage(a, opponent)
+            dmg_d = taken.get(a[0])
+            if dmg_d is None:
+                dmg_d = taken[a[0]] = expected_damage(opponent, a)
+            column.append(_outcome(a[1], opponent[1], dmg_a, dmg_d))
+        self._columns[opponent] = column
+        return column
+
+    def best_team(self, opponents: Iterable[Opponent], size: int = TEAM_SIZE,
+                  max_nodes: Optional[int] = None) -> Dict:
+        """
+        Find the lineup with the highest weighted coverage against opponents.
+
+        Args:
+            opponents (Iterable[Opponent]): Monsters, or (monster, weight) pairs.
+            size (int): Team size.
+            max_nodes (int): Search node budget; when exhausted the best
+                lineup found so far is returned (None searches to the end).
+
+        Returns:
+            Dict: Result with keys:
+                - team (List[Monster]): Chosen monsters, best counters first
+                - value (float): Coverage f(team), between 0 and 1
+                - counters (List[int]): Index in team of the best counter per opponent
+                - nodes (int): Search nodes expanded
+                - optimal (bool): False if max_nodes stopped the search early
+        """
+        weights: Dict[Profile, float] = {}
+        for opp in opponents:
+            mon, w = opp if isinstance(opp, tuple) else (opp, 1.0)
+            key = profile_of(mon)
+            weights[key] = weights.get(key, 0.0) + float(w)
+        if not weights or not self._profiles or size <= 0:
+            return {"team": [], "value": 0.0, "counters": [], "nodes": 0, "optimal": True}
+        total = sum(weights.values())
+        opp_profiles = list(weights)
+        w = [weights[d] / total for d in opp_profiles]
+        columns = [[s * wj for s in self.score_column(d)] for d, wj in zip(opp_profiles, w)]
+        rows = [list(row) for row in zip(*columns)]
+
+        items = _non_dominated(rows)
+        chosen, value, nodes, optimal = _branch_and_bound(rows, items, min(size, len(items)), max_nodes)
+        if len(chosen) < size:
+            # Fewer useful profiles than slots: fill with the best remaining monsters
+            ordered = sorted(range(len(rows)), key=lambda i: -sum(rows[i]))
+            chosen += [i for i in ordered if i not in chosen][:size - len(chosen)]
+        team = [self._groups[self._profiles[i]][0] for i in chosen]
+        if len(team) < size:
+            # Still short: add interchangeable duplicates of the best profiles
+            for i in ordered:
+                for mon in self._groups[self._profiles[i]][1:]:
+                    if len(team) < size:
+                        team.append(mon)
+        counters = [max(range(len(chosen)), key=lambda t: rows[chosen[t]][j]) for j in range(len(w))]
+        return {"team": team, "value": value, "counters": counters, "nodes": nodes,
+                "optimal": optimal}
+
+
+def _non_dominated(rows: List[List[float]]) -> List[int]:
+    """Indices of rows not beaten-or-tied everywhere by an earlier kept row, best sum first."""
+    order = sorted(range(len(rows)), key=lambda i: -sum(rows[i]))
+    kept: List[int] = []
+    # Kept rows to test against, most recent dominator first (a few strong rows
+    # dominate most candidates)
+    checks: List[List[float]] = []
+    for i in order:
+        row = rows[i]
+        for pos, other in enumerate(checks):
+            if all(a >= b for a, b in zip(other, row)):
+                if pos:
+                    checks.insert(0, checks.pop(pos))
+                break
+        else:
+            kept.append(i)
+            checks.append(row)
+    return kept
+
+
+def _incumbent(rows: List[List[float]], items: List[int], size: int) -> Tuple[List[int], float]:
+    """Greedy lineup improved by single swaps until none helps."""
+    team: List[int] = []
+    cur = [0.0] * len(rows[0])
+    for _ in range(size):
+        best_i, best_gain = None, -1.0
+        for i in items:
+            if i not in team:
+                gain = sum(max(0.0, s - c) for s, c in zip(rows[i], cur))
+                if gain > best_gain:
+                    best_i, best_gain = i, gain
+        team.append(best_i)
+        cur = [max(s, c) for s, c in zip(rows[best_i], cur)]
+    value = sum(cur)
+    improved = True
+    while improved:
+        improved = False
+        for pos in range(size):
+            rest = team[:pos] + team[pos + 1:]
+            base = [max(col) for col in zip(*(rows[i] for i in rest))] if rest else [0.0] * len(cur)
+            for i in items:
+                if i in team:
+                    continue
+                total = sum(max(s, c) for s, c in zip(rows[i], base))
+                if total > value + 1e-12:
+                    team[pos], value, improved = i, total, True
+    return team, value
+
+
+def _branch_and_bound(rows: List[List[float]], items: List[int], size: int,
+                      max_nodes: Optional[int] = None) -> Tuple[List[int], float, int, bool]:
+    """
+    Maximize coverage over size-subsets of items.
+
+    Returns:
+        Tuple[List[int], float, int, bool]: Chosen row indices, coverage, nodes
+            expanded, and whether the search finished (the lineup is optimal).
+    """
+    n_opp = len(rows[0])
+    best = list(_incumbent(rows, items, size))
+
+    # suffix_max[k][j]: best score for opponent j among items[k:]
+    suffix_max = [[0.0] * n_opp for _ in range(len(items) + 1)]
+    for k in range(len(items) - 1, -1, -1):
+        suffix_max[k] = [max(a, b) for a, b in zip(rows[items[k]], suffix_max[k + 1])]
+    nodes = 0
+    eps = 1e-12
+
+    def search(start: int, team: List[int], cur: List[float], value: float):
+        nonlocal nodes
+        if max_nodes is not None and nodes >= max_nodes:
+            return
+        nodes += 1
+        left = size - len(team)
+        stop = len(items) - left + 1
+        gains = [sum(max(0.0, s - c) for s, c in zip(rows[items[k]], cur))
+                 for k in range(start, len(items))]
+        # after[t]: sum of the left - 1 largest gains behind position t
+        after = [0.0] * len(gains)
+        heap: List[float] = []
+        total = 0.0
+        for t in range(len(gains) - 1, -1, -1):
+            after[t] = total
+            if left > 1:
+                if len(heap) < left - 1:
+                    heappush(heap, gains[t])
+                    total += gains[t]
+                elif gains[t] > heap[0]:
+                    total += gains[t] - heapreplace(heap, gains[t])
+        for k in range(start, stop):
+            # Shrinks as k grows, so once it fails every later k fails too
+            if sum(max(c, s) for c, s in zip(cur, suffix_max[k])) <= best[1] + eps:
+                return
+            t = k - start
+            if value + gains[t] + after[t] <= best[1] + eps:
+                continue
+            new = [max(s, c) for s, c in zip(rows[items[k]], cur)]
+            team.append(items[k])
+            if left == 1:
+                best[0], best[1] = list(team), value + gains[t]
+            else:
+                search(k + 1, team, new, value + gains[t])
+            team.pop()
+
+    search(0, [], [0.0] * n_opp, 0.0)
+    chosen = sorted(best[0], key=lambda i: -sum(rows[i]))
+    return chosen, best[1], nodes, max_nodes is None or nodes < max_nodes
@@ -9,6 +9,7 @@ and edge case scenarios.
 
 import random
 import copy
+import pickle
 import pytest
 
 from move import Move
@@ -223,4 +224,1388 @@ def test_team_and_inventory_size_helpers():
     assert p.get_inventory_size() >= 1  # starter inventory exists
     m = Monster("HelperMon", "Normal", 20, [Move("Punch", 5, 5)], level=1)
     p.add_monster(m)
-    assert p.get_team_size() == 1
\ No newline at end of file
+    assert p.get_team_size() == 1
+
+# --- Battle engine tests ---
+
+from battle import (
+    BattleEngine, ATTACK, ITEM, RUN, WIN, LOSS, RAN_AWAY, CAPTURED,
+    random_attack_policy,
+)
+
+
+def test_battle_engine_runs_headless_to_a_result():
+    """A full encounter resolves without I/O and resets both monsters."""
+    random.seed(1)
+    mine = Monster("Hero", "Water", 60, [Move("Aqua Jet", 9, 10, "Water")], level=1)
+    wild = Monster("Foe", "Fire", 40, [Move("Ember", 5, 10, "Fire")], level=1)
+    engine = BattleEngine(mine, wild)
+    result = engine.run(random_attack_policy)
+    assert result in (WIN, LOSS)
+    assert mine.current_hp == mine.max_hp
+    assert wild.current_hp == wild.max_hp
+
+
+def test_battle_engine_attack_events_and_invalid_actions():
+    """Attack turns emit attack events; bad input wastes the turn."""
+    random.seed(0)
+    mine = Monster("Hero", "Normal", 50, [Move("Hit", 5, 10)], level=1)
+    wild = Monster("Foe", "Normal", 50, [Move("Hit", 5, 10)], level=1)
+    engine = BattleEngine(mine, wild, crit_chance=0.0)
+    events = engine.step((ATTACK, 0))
+    assert [e["type"] for e in events] == ["attack", "attack"]
+    assert events[0]["side"] == "player" and events[0]["damage"] == 5
+    assert wild.current_hp == 45
+    events = engine.step((ATTACK, 7))
+    assert events[0] == {"type": "invalid", "message": "Invalid move; turn wasted."}
+    assert engine.step(("bogus",))[0]["type"] == "invalid"
+    assert engine.turn == 4
+
+
+def test_battle_engine_capture_and_run():
+    """Capture adds the wild monster to the team and ends the encounter."""
+    random.seed(0)
+    p = Player("Catcher")
+    mine = Monster("Hero", "Normal", 50, [Move("Hit", 5, 10)], level=1)
+    p.add_monster(mine)
+    wild = Monster("Foe", "Normal", 50, [Move("Hit", 5, 10)], level=1)
+    engine = BattleEngine(mine, wild, player=p)
+    ball = p.find_item_by_name("Monster Ball")
+    while not engine.is_over() and p.inventory[ball].quantity > 0:
+        engine.step((ITEM, ball, -1))
+    if engine.result == CAPTURED:
+        assert p.get_team_size() == 2
+    engine = BattleEngine(mine, Monster("Foe", "Normal", 50, [Move("Hit", 5, 10)]))
+    while not engine.is_over():
+        engine.step((RUN,))
+    assert engine.result in (RAN_AWAY, LOSS)
+
+
+# --- Batch simulator tests ---
+
+def test_batch_sim_matches_deterministic_scalar_battle():
+    """With no crits and one move each, batch and scalar agree exactly."""
+    pytest.importorskip("numpy")
+    from batch_sim import simulate_matchup
+    mine = Monster("Hero", "Water", 60, [Move("Aqua Jet", 9, 10, "Water")])
+    wild = Monster("Foe", "Fire", 40, [Move("Ember", 5, 3, "Fire")])
+    engine = BattleEngine(mine, wild, crit_chance=0.0)
+    result = engine.run(random_attack_policy)
+    summary = simulate_matchup(mine, wild, 50, seed=0, crit_chance=0.0)
+    expected = "wins" if result == WIN else "losses"
+    assert summary[expected] == 50
+    assert summary["mean_turns"] == engine.turn
+
+
+def test_batch_sim_win_rate_tracks_scalar_engine():
+    """Random battles produce matching win-rate distributions."""
+    pytest.importorskip("numpy")
+    from batch_sim import BatchBattleSimulator
+    random.seed(7)
+    a = Monster("Flareon", "Fire", 60, [Move("Flame Burst", 10, 10, "Fire"),
+                                        Move("Tackle", 8, 25)])
+    b = Monster("Voltaris", "Electric", 50, [Move("Thunder Shock", 10, 10, "Electric"),
+                                             Move("Tackle", 8, 25)])
+    trials = 3000
+    scalar_wins = sum(BattleEngine(a, b).run(random_attack_policy) == WIN
+                      for _ in range(trials))
+    batch = BatchBattleSimulator([(a, b), (b, a)]).run(trials, seed=1)
+    assert abs(batch[0]["win_rate"] - scalar_wins / trials) < 0.05
+    assert batch[0]["wins"] + batch[0]["losses"] + batch[0]["timeouts"] == trials
+    assert int(batch[1]["turns"].sum()) == batch[1]["wins"] + batch[1]["losses"]
+
+
+# --- Type table tests ---
+
+from move import (
+    TYPE_CHART, TYPE_MATRIX, TYPE_NAMES, type_id, validate_type_chart,
+    type_matrix_array,
+)
+
+
+def test_type_matrix_matches_type_chart():
+    """Every (attacker, defender) cell equals the chart entry or 1.0."""
+    for att in TYPE_NAMES:
+        for dfn in TYPE_NAMES:
+            expected = TYPE_CHART.get(att, {}).get(dfn, 1.0)
+            assert TYPE_MATRIX[type_id(att)][type_id(dfn)] == expected
+    mv = Move("Vine", 5, 5, type_="Grass")
+    assert mv.get_multiplier("Water") == 2.0
+    assert mv.is_type("grass") and not mv.is_type("Fire")
+
+
+def test_unknown_types_are_flagged():
+    """Unknown types raise instead of silently acting as 1.0."""
+    with pytest.raises(ValueError):
+        type_id("Psychic")
+    with pytest.raises(ValueError):
+        Move("Confuse", 5, 5, type_="Psychic")
+    with pytest.raises(ValueError):
+        Move("Ember", 5, 5, type_="Fire").get_multiplier("Psychic")
+    assert validate_type_chart({"Fire": {"Grass": -1}})
+    assert validate_type_chart(TYPE_CHART) == []
+
+
+def test_type_matrix_array_is_shared_numpy_view():
+    """The NumPy variant mirrors TYPE_MATRIX and is cached."""
+    np = pytest.importorskip("numpy")
+    arr = type_matrix_array()
+    assert arr is type_matrix_array()
+    assert np.array_equal(arr, np.array(TYPE_MATRIX))
+
+
+# --- Compact representation tests ---
+
+from monster_store import HP_MAX, LEVEL_MAX, MonsterStore
+
+
+def test_core_classes_use_slots():
+    """Move, Monster and Item carry no per-instance __dict__."""
+    mv = Move("Slot", 5, 5)
+    assert not hasattr(mv, "__dict__")
+    assert not hasattr(Monster("S", "Normal", 10, [mv]), "__dict__")
+    assert not hasattr(Item("Potion", heal=5), "__dict__")
+
+
+def test_monster_store_views_read_and_write_columns():
+    """Views expose the Monster API backed by the store's columns."""
+    proto = Monster("Aqua", "Water", 50, [Move("Bubble", 7, 3, "Water"), Move("T", 4, 10)])
+    store = MonsterStore()
+    store.extend([proto, proto])
+    assert len(store) == 2
+    view = store[0]
+    assert view.name == "Aqua" and view.type == "Water"
+    view.take_damage(20)
+    view.level_up(1)
+    foe = store[1]
+    out = view.attack(foe, view.get_moves()[0], crit_chance=0.0)
+    assert out["damage"] == 3  # Water vs Water is 0.5x
+    assert store[0].get_moves()[0].current_pp == 2
+    assert foe.current_hp == 47 and store[0].current_hp == 30 and view.level == 2
+    # Species data is shared, state is not
+    assert proto.current_hp == 50 and proto.moves[0].current_pp == 3
+    view.add_move(Move("X", 1, 1))
+    assert [mv.name for mv in store[0].moves] == ["Bubble", "T", "X"]
+    assert [mv.name for mv in store[1].moves] == ["Bubble", "T"]
+
+
+def test_monster_store_view_move_edits_and_range_checks():
+    """Views edit their own move set; out-of-range writes raise and leave the store unchanged."""
+    proto = Monster("Aqua", "Water", 50, [Move("Bubble", 7, 3, "Water"), Move("T", 4, 10)])
+    store = MonsterStore()
+    store.extend([proto, proto])
+    view = store[0]
+    view.moves[1].current_pp = 6
+    spare = Move("Spark", 5, 9, "Electric")
+    spare.current_pp = 4
+    view.add_move(spare)
+    assert [(mv.name, mv.current_pp) for mv in view.moves] == [("Bubble", 3), ("T", 6), ("Spark", 4)]
+    assert view.remove_move_by_name("Bubble") and not view.remove_move_by_name("Nope")
+    assert [(mv.name, mv.current_pp) for mv in view.moves] == [("T", 6), ("Spark", 4)]
+    assert [(mv.name, mv.current_pp) for mv in store.materialize(0).moves] == [("T", 6), ("Spark", 4)]
+    assert [(mv.name, mv.current_pp) for mv in store[1].moves] == [("Bubble", 3), ("T", 10)]
+    with pytest.raises(ValueError, match="Level"):
+        view.level = 70000
+    with pytest.raises(ValueError, match="HP"):
+        view.current_hp = -1
+    with pytest.raises(ValueError, match="Level"):
+        store.level_up(LEVEL_MAX)
+    with pytest.raises(ValueError, match="Max HP"):
+        store.level_up(LEVEL_MAX - 1)
+    assert store[0].level == 1 and store[1].level == 1
+    with pytest.raises(ValueError, match="Max HP"):
+        store.append(Monster("Huge", "Rock", HP_MAX + 1, []))
+    assert len(store) == 2 and all(len(col) == 2 for col in store._pp)
+
+
+def test_monster_store_materialize_is_independent():
+    """materialize returns a standalone Monster with the stored state."""
+    store = MonsterStore()
+    idx = store.append(Monster("Rocky", "Rock", 80, [Move("Smash", 12, 8, "Rock")], level=3))
+    store[idx].take_damage(5)
+    mon = store.materialize(idx)
+    assert isinstance(mon, Monster) and mon.current_hp == 75 and mon.level == 3
+    mon.take_damage(10)
+    assert store[idx].current_hp == 75
+
+
+# --- Cloning and species registry tests ---
+
+from species import SpeciesRegistry
+
+
+def test_clone_copies_state_and_spawn_resets_it():
+    """clone keeps current HP/PP; spawn starts fresh; neither shares moves."""
+    mv = Move("Jet", 9, 10, "Water")
+    proto = Monster("Aqua", "Water", 55, [mv], level=4)
+    mv.use_move()
+    proto.take_damage(15)
+    twin = proto.clone()
+    fresh = proto.spawn()
+    assert (twin.current_hp, twin.moves[0].current_pp, twin.level) == (40, 9, 4)
+    assert (fresh.current_hp, fresh.moves[0].current_pp, fresh.level) == (55, 10, 4)
+    assert twin.moves[0] is not mv and fresh.moves[0] is not mv
+    twin.moves[0].use_move()
+    assert mv.current_pp == 9
+
+
+def test_species_registry_spawns_independent_monsters():
+    """Registry spawns full-health copies of registered prototypes."""
+    reg = SpeciesRegistry([Monster("Volt", "Electric", 50, [Move("Shock", 10, 10, "Electric")])])
+    a = reg.spawn("Volt")
+    b = reg.spawn_random()
+    a.take_damage(10)
+    assert b.current_hp == 50 and reg.get("Volt").current_hp == 50
+    assert "Volt" in reg and len(reg) == 1 and reg.names() == ["Volt"]
+    with pytest.raises(KeyError):
+        reg.spawn("Nope")
+
+
+# --- Flyweight spec tests ---
+
+import dataclasses
+
+from move import MoveSpec
+from monster import SpeciesSpec
+
+
+def test_specs_are_shared_and_immutable():
+    """Spawned copies share specs; instances hold only mutable counters."""
+    proto = Monster("Flare", "Fire", 60, [Move("Ember", 10, 10, "Fire")])
+    a, b = proto.spawn(), proto.clone()
+    assert a.spec is proto.spec and b.moves[0].spec is proto.moves[0].spec
+    assert Move("Ember", 10, 10, "Fire").spec is proto.moves[0].spec
+    assert isinstance(proto.spec, SpeciesSpec) and isinstance(proto.moves[0].spec, MoveSpec)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        proto.spec.base_hp = 1
+    fresh = Monster.from_spec(proto.spec, level=2)
+    assert fresh.max_hp == 60 and fresh.level == 2 and fresh.moves[0].current_pp == 10
+
+
+def test_attribute_writes_replace_spec_without_leaking():
+    """Renaming or retyping one instance leaves other sharers untouched."""
+    proto = Monster("Flare", "Fire", 60, [Move("Ember", 10, 10, "Fire")])
+    twin = proto.spawn()
+    twin.name = "Nick"
+    twin.type = "Water"
+    twin.moves[0].power = 20
+    assert (proto.name, proto.type, proto.moves[0].power) == ("Flare", "Fire", 10)
+    assert (twin.name, twin.type, twin.moves[0].power) == ("Nick", "Water", 20)
+    assert copy.deepcopy(twin).get_summary() == twin.get_summary()
+
+
+# --- Save file tests ---
+
+import io
+import json
+
+import savegame
+
+
+def _saved_player():
+    p = Player("Saver")
+    a = Monster("Flare", "Fire", 60, [Move("Ember", 10, 10, "Fire"), Move("Tackle", 8, 25)])
+    a.level_up(2)
+    a.take_damage(7)
+    a.moves[0].use_move()
+    p.add_monster(a)
+    p.add_monster(a.spawn())
+    p.add_item(Item("Super Potion", heal=60, quantity=3))
+    return p
+
+
+def test_save_and_load_round_trip(tmp_path):
+    """Team, moves, PP and inventory survive a save/load round trip."""
+    p = _saved_player()
+    path = tmp_path / "slot1.sav"
+    savegame.save_player(p, path)
+    loaded = savegame.load_player(path)
+    assert loaded.name == "Saver"
+    assert loaded.team_list() == p.team_list()
+    assert loaded.inventory_list() == p.inventory_list()
+    # Shared specs are rebuilt as shared flyweights
+    assert loaded.team[0].spec is loaded.team[1].spec
+    assert loaded.team[0].moves[0].spec is p.team[0].moves[0].spec
+
+
+def test_save_streaming_reader_and_errors():
+    """iter_team yields monsters lazily; bad files raise SaveFormatError."""
+    buf = io.BytesIO()
+    savegame.save_player(_saved_player(), buf)
+    data = buf.getvalue()
+    stream = savegame.iter_team(io.BytesIO(data))
+    first = next(stream)
+    assert first.name == "Flare" and (first.current_hp, first.max_hp) == (53, 72)
+    assert len(list(stream)) == 1
+    with pytest.raises(savegame.SaveFormatError):
+        savegame.load_player(io.BytesIO(b"NOPE" + data[4:]))
+    with pytest.raises(savegame.SaveFormatError):
+        savegame.load_player(io.BytesIO(data[:-3]))
+
+
+def test_save_bad_indices_raise_save_format_error():
+    """Bad species/move indices, undecodable strings and unknown types raise SaveFormatError."""
+    buf = io.BytesIO()
+    savegame.save_player(_saved_player(), buf)
+    data = buf.getvalue()
+    f = io.BytesIO(data)
+    savegame.SaveReader(f)
+    team_at = f.tell()
+    bad = b"\xff\xff\xff\x7f"
+    for offset in (team_at, team_at + savegame._MONSTER.size, len(savegame.MAGIC) + 4 + 4 + 2):
+        corrupt = data[:offset] + bad + data[offset + 4:]
+        with pytest.raises(savegame.SaveFormatError):
+            list(savegame.iter_team(io.BytesIO(corrupt)))
+    with pytest.raises(savegame.SaveFormatError, match="Fyre"):
+        savegame.load_player(io.BytesIO(data.replace(b"Fire", b"Fyre")))
+
+
+# --- PC box tests ---
+
+from pc_box import PCBox
+
+
+def test_pc_box_random_access_and_in_place_updates(tmp_path):
+    """Records are reachable by index and updated without materializing."""
+    path = tmp_path / "box.bin"
+    with PCBox(path, initial_capacity=2) as box:
+        for i in range(5):  # forces growth past the initial capacity
+            m = Monster(f"Mon{i}", "Water", 40 + i, [Move("Jet", 9, 10, "Water")], level=i + 1)
+            box.deposit(m)
+        assert len(box) == 5
+        assert box.name(3) == "Mon3" and box.level(3) == 4 and box.hp(3) == (43, 43)
+        box.set_hp(3, 10)
+        box.set_level(3, 9, max_hp=50)
+    with PCBox(path) as box:
+        assert len(box) == 5 and box.hp(3) == (10, 50) and box.level(-2) == 9
+        mon = box.materialize(3)
+        assert (mon.name, mon.type, mon.level, mon.current_hp) == ("Mon3", "Water", 9, 10)
+        assert mon.moves[0].spec is Move("Jet", 9, 10, "Water").spec
+        with pytest.raises(IndexError):
+            box.hp(5)
+
+
+def test_player_box_deposit_and_withdraw(tmp_path):
+    """Monsters move between the team and the box lazily."""
+    p = Player("Boxer")
+    assert not p.deposit_monster(0)
+    p.box = PCBox(tmp_path / "pc.bin")
+    p.add_monster(Monster("Rocky", "Rock", 80, [Move("Smash", 12, 8, "Rock")]))
+    p.add_monster(Monster("Volt", "Electric", 50, [Move("Shock", 10, 10, "Electric")]))
+    assert p.deposit_monster(0) and p.deposit_monster(0)
+    assert p.get_team_size() == 0 and len(p.box) == 2
+    assert p.withdraw_monster(0)
+    assert p.team[0].name == "Rocky" and p.box.name(0) == "Volt"
+    assert not p.withdraw_monster(3)
+    p.box.close()
+
+
+
+def test_pc_box_withdrawn_summary_follows_pp(tmp_path):
+    """Withdrawn monsters own their moves, so spending PP refreshes the cached summary."""
+    with PCBox(tmp_path / "box.bin") as box:
+        box.deposit(Monster("Volt", "Electric", 50, [Move("Shock", 10, 10, "Electric")]))
+        w = box.withdraw(0)
+        before = w.get_summary()
+        w.moves[0].current_pp -= 1
+        assert w.get_summary() != before and "PP:9/10" in w.get_summary()
+
+# --- Deterministic RNG stream tests ---
+
+from rng import GameRNG, derive_seed
+
+
+def _fight(seed):
+    """Play one auto-battle on a seeded stream and return its event log."""
+    fire = Monster("Flareon", "Fire", 60, [Move("Flame Burst", 10, 10, "Fire"), Move("Tackle", 8, 25)])
+    water = Monster("Aquadrake", "Water", 55, [Move("Aqua Jet", 9, 10, "Water")])
+    log = []
+    engine = BattleEngine(fire, water, rng=GameRNG(seed))
+    engine.run(random_attack_policy, on_events=log.extend)
+    return engine.result, log
+
+
+def test_seeded_battles_are_reproducible():
+    """Same stream seed gives the same battle regardless of global random state."""
+    random.seed(1)
+    first = _fight(42)
+    random.seed(2)
+    assert _fight(42) == first
+    assert any(_fight(s) != first for s in range(43, 48))
+
+
+def test_rng_child_streams_are_stable_and_independent():
+    """Children depend only on parent seed and key, not on prior draws."""
+    parent = GameRNG(7)
+    a, b = parent.spawn(2)
+    assert a.seed != b.seed and a.block(5) != b.block(5)
+    parent.block(100)
+    assert parent.child(1).seed == GameRNG(7).split().seed == derive_seed(7, 1)
+    block = GameRNG(3).block(4)
+    r = GameRNG(3)
+    assert block == [r.random() for _ in range(4)]
+
+
+def test_batch_sim_accepts_rng_stream():
+    """A GameRNG stream seeds the batch simulator reproducibly."""
+    pytest.importorskip("numpy")
+    from batch_sim import simulate_matchup
+    fire = Monster("Flareon", "Fire", 60, [Move("Flame Burst", 10, 10, "Fire")])
+    water = Monster("Aquadrake", "Water", 55, [Move("Aqua Jet", 9, 10, "Water")])
+    r1 = simulate_matchup(fire, water, 200, seed=GameRNG(5))
+    r2 = simulate_matchup(fire, water, 200, seed=GameRNG(5))
+    assert r1["wins"] == r2["wins"] and r1["trials"] == 200
+
+
+# --- Tournament tests ---
+
+from tournament import tournament_entries, run_tournament, iter_tournament
+
+
+def _tournament_roster():
+    return [Monster("Flareon", "Fire", 60, [Move("Flame Burst", 10, 10, "Fire")]),
+            Monster("Aquadrake", "Water", 55, [Move("Aqua Jet", 9, 10, "Water")])]
+
+
+def test_tournament_entries_cover_species_and_levels():
+    """Entries are leveled spawns; prototypes are untouched."""
+    roster = _tournament_roster()
+    entries = tournament_entries(roster, levels=range(1, 4))
+    assert [(m.name, m.level) for m in entries[:3]] == [("Flareon", 1), ("Flareon", 2), ("Flareon", 3)]
+    assert entries[2].max_hp == entries[2].current_hp == 72
+    assert roster[0].level == 1 and roster[0].max_hp == 60
+
+
+def test_tournament_is_deterministic_across_worker_counts():
+    """Shard seeds make the matrix independent of parallelism."""
+    entries = tournament_entries(_tournament_roster(), levels=(1, 5))
+    serial = run_tournament(entries, trials=20, seed=9, workers=1, rows_per_shard=1)
+    parallel = run_tournament(entries, trials=20, seed=9, workers=2, rows_per_shard=1)
+    assert serial["wins"] == parallel["wins"]
+    assert serial["labels"][1] == "Flareon L5" and len(serial["win_rate"]) == 4
+    for row_w, row_l in zip(serial["wins"], serial["losses"]):
+        assert all(w + l <= 20 for w, l in zip(row_w, row_l))
+    shards = list(iter_tournament(entries, trials=5, seed=1, workers=1, rows_per_shard=3))
+    assert [s["rows"] for s in shards] == [(0, 3), (3, 4)]
+
+
+# --- Wild AI tests ---
+
+from ai import ExpectimaxPolicy
+
+
+def test_engine_uses_pluggable_wild_policy():
+    """wild_policy replaces choose_move_random for the wild side."""
+    mine = Monster("Hero", "Normal", 200, [Move("Tackle", 1, 50)])
+    wild = Monster("Foe", "Fire", 200, [Move("Ember", 5, 10, "Fire"), Move("Tackle", 8, 10)])
+    engine = BattleEngine(mine, wild, wild_policy=lambda eng: eng.wild_monster.moves[1])
+    events = engine.step((ATTACK, 0))
+    assert events[-1]["side"] == "wild" and events[-1]["move"] == "Tackle"
+
+
+def test_expectimax_prefers_super_effective_and_lethal_moves():
+    """The search picks the move that wins fastest and stays within budget."""
+    mine = Monster("Hero", "Fire", 60, [Move("Flame Burst", 10, 10, "Fire")])
+    wild = Monster("Foe", "Water", 55, [Move("Ember", 10, 10, "Fire"), Move("Splash", 9, 10, "Water")])
+    policy = ExpectimaxPolicy(time_budget=0.05)
+    engine = BattleEngine(mine, wild, rng=GameRNG(0), wild_policy=policy)
+    assert policy(engine).name == "Splash" and policy.last_depth >= 1 and policy.table
+    mine.current_hp = 9
+    wild.moves[1].current_pp = 0
+    wild.add_move(Move("Nibble", 9, 5, "Normal"))
+    assert policy(engine).name == "Nibble"  # 9 damage is lethal, Ember only deals 5
+    result = engine.run(random_attack_policy)
+    assert result in (WIN, LOSS)
+
+
+# --- Exact solver tests ---
+
+import solver
+from solver import (
+    BattleSolver, solve_matchup, attack_policy, capture_below, capture_policy, run_policy,
+    clear_cache, cache_info,
+)
+
+
+def test_solver_exact_win_and_expected_turns():
+    """Crit one-shots end in one turn, otherwise the second hit wins."""
+    mine = Monster("Hero", "Normal", 100, [Move("Punch", 10, 10)])
+    wild = Monster("Foe", "Normal", 12, [Move("Poke", 1, 10)])
+    result = BattleSolver(mine, wild).solve()
+    assert result["win"] == pytest.approx(1.0)
+    assert result["expected_turns"] == pytest.approx(0.1 * 1 + 0.9 * 2)
+
+
+def test_solver_capture_and_run_policies():
+    """Capture uses calculate_capture_chance; running uses try_to_run odds."""
+    mine = Monster("Hero", "Normal", 100, [Move("Smash", 50, 10)])
+    wild = Monster("Foe", "Normal", 40, [Move("Poke", 1, 10)])
+    ball = Item("Ball", quantity=1, is_capture=True)
+    result = BattleSolver(mine, wild, capture_policy, ball).solve()
+    assert result["captured"] == pytest.approx(0.35)
+    assert result["win"] == pytest.approx(0.65)
+    assert result["expected_turns"] == pytest.approx(0.35 * 1 + 0.65 * 2)
+    ran = BattleSolver(mine, wild, run_policy).solve()
+    assert ran["ran_away"] + ran["loss"] == pytest.approx(1.0) and ran["ran_away"] > 0.99
+
+
+def test_solve_matchup_caches_solvers():
+    """Repeated queries reuse the cached solver and its memo."""
+    clear_cache()
+    fire = Monster("Flareon", "Fire", 60, [Move("Flame Burst", 10, 10, "Fire")])
+    water = Monster("Aquadrake", "Water", 55, [Move("Aqua Jet", 9, 10, "Water")])
+    first = solve_matchup(fire, water)
+    states = cache_info()["states"]
+    assert solve_matchup(fire.spawn(), water.spawn()) == first
+    assert cache_info() == {"solvers": 1, "states": states}
+    assert first["loss"] > 0.9 and first["win"] + first["loss"] == pytest.approx(1.0)
+
+
+def test_split_solver_matches_full_dp():
+    """own_side_only policies take the split path and agree with the full state DP."""
+    mine = Monster("Hero", "Water", 30, [Move("Jet", 9, 4, "Water"), Move("Tackle", 6, 5)])
+    wild = Monster("Foe", "Fire", 28, [Move("Ember", 7, 3, "Fire"), Move("Scratch", 5, 6)])
+    ball = Item("Ball", quantity=2, is_capture=True)
+    for policy in (attack_policy, run_policy, capture_policy, capture_below(0.5)):
+        full = BattleSolver(mine, wild, lambda st, sv, p=policy: p(st, sv), ball)
+        split = BattleSolver(mine, wild, policy, ball)
+        for state in (None, (12, 9, (1, 0), (3, 2), 1)):
+            expected, got = full.solve(state), split.solve(state)
+            assert got == pytest.approx(expected, abs=1e-12)
+        assert len(split.memo) == 2 < len(full.memo)
+
+
+def test_solve_matchup_cache_is_bounded(monkeypatch):
+    """The solver cache evicts the least recently used matchup past its limit."""
+    clear_cache()
+    monkeypatch.setattr(solver, "MAX_CACHED_SOLVERS", 2)
+    mons = [Monster(f"M{i}", "Normal", 20 + i, [Move("Hit", 5, 5)]) for i in range(3)]
+    solve_matchup(mons[0], mons[1])
+    solve_matchup(mons[1], mons[2])
+    solve_matchup(mons[0], mons[1])  # refreshes the first matchup
+    solve_matchup(mons[2], mons[0])
+    assert cache_info()["solvers"] == 2
+    assert list(solver._solvers)[0][0] == solver._monster_key(mons[0])
+    clear_cache()
+
+
+# --- Benchmark suite tests ---
+
+from benchmarks import run as bench_run
+
+
+def test_benchmark_compare_flags_only_large_slowdowns():
+    """Regressions are reported only past the threshold."""
+    baseline = {"a@1": {"ops_per_sec": 100.0}, "b@1": {"ops_per_sec": 100.0}}
+    results = {"a@1": {"ops_per_sec": 80.0}, "b@1": {"ops_per_sec": 60.0},
+               "c@1": {"ops_per_sec": 1.0}}
+    regressions = bench_run.compare(results, baseline, threshold=0.25)
+    assert len(regressions) == 1 and regressions[0].startswith("b@1")
+
+
+def test_benchmark_suite_saves_and_checks_baseline(tmp_path, capsys):
+    """--save writes a JSON baseline; a later run compares against it."""
+    path = str(tmp_path / "baseline.json")
+    args = ["--only", "move.get_multiplier", "--scales", "1,10", "--min-time", "0.01",
+            "--baseline", path]
+    assert bench_run.main(args + ["--save"]) == 0
+    with open(path) as f:
+        saved = json.load(f)
+    assert set(saved) == {"move.get_multiplier@1", "move.get_multiplier@10"}
+    saved["move.get_multiplier@10"]["ops_per_sec"] = 1e15
+    with open(path, "w") as f:
+        json.dump(saved, f)
+    assert bench_run.main(args) == 1
+    assert "REGRESSION move.get_multiplier@10" in capsys.readouterr().out
+
+
+# --- Instrumentation tests ---
+
+import instrumentation
+
+
+def test_instrumentation_counts_and_restores_originals():
+    """Wrappers record counters/histograms and are removed by disable()."""
+    original_attack = Monster.attack
+    stats = instrumentation.Stats()
+    fire = Monster("Flareon", "Fire", 60, [Move("Flame Burst", 10, 10, "Fire")])
+    grass = Monster("Leafy", "Grass", 50, [Move("Leaf", 5, 10, "Grass")])
+    with instrumentation.instrumented(stats):
+        assert Monster.attack is not original_attack and instrumentation.is_enabled()
+        BattleEngine(fire, grass, rng=GameRNG(1), crit_chance=1.0).run(random_attack_policy)
+        Item("Potion", heal=5).apply_effect(fire)
+    assert Monster.attack is original_attack and not instrumentation.is_enabled()
+    c = stats.counters
+    assert c["attacks"] == c["crits"] == c["moves_used"] >= 2
+    assert c["super_effective"] >= 1 and c["items_applied"] == 1
+    assert stats.histograms["battle.turn"].count == c["turns"]
+    assert "monster.attack" in stats.report()
+
+
+def test_stats_reset_while_enabled_keeps_recording():
+    """reset() empties the live histograms instead of orphaning them."""
+    stats = instrumentation.Stats()
+    fire = Monster("Flareon", "Fire", 60, [Move("Flame Burst", 10, 10, "Fire")])
+    grass = Monster("Leafy", "Grass", 50, [Move("Leaf", 5, 10, "Grass")])
+    with instrumentation.instrumented(stats):
+        fire.attack(grass, fire.moves[0])
+        stats.reset()
+        assert stats.counters == {} and stats.histograms["monster.attack"].count == 0
+        fire.attack(grass, fire.moves[0])
+    assert stats.histograms["monster.attack"].count == 1 and stats.counters["attacks"] == 1
+    assert "  monster.attack              1" in stats.report()
+
+
+def test_histogram_percentiles_use_log2_buckets():
+    """Percentiles report the upper edge of the power-of-two bucket."""
+    hist = instrumentation.Histogram()
+    for ns in (100, 100, 100, 5000):
+        hist.record(ns)
+    assert hist.percentile_ns(50) == 128 and hist.percentile_ns(99) == 8192
+    assert hist.mean_ns() == pytest.approx(1325.0)
+
+
+def test_profile_encounter_reports_cprofile_and_tracemalloc(tmp_path):
+    """A single encounter can be profiled to a report file."""
+    fire = Monster("Flareon", "Fire", 60, [Move("Flame Burst", 10, 10, "Fire")])
+    water = Monster("Aquadrake", "Water", 55, [Move("Aqua Jet", 9, 10, "Water")])
+    path = tmp_path / "profile.txt"
+    report = instrumentation.profile_encounter(fire, water, report_path=str(path), rng=GameRNG(2))
+    assert "cProfile" in report and "tracemalloc" in report and "attack" in report
+    assert path.read_text() == report
+
+
+# --- Duel server tests ---
+import asyncio
+
+from duel_server import DuelBattle, DuelServer, run_load_test, WIN, LOSS
+
+
+def test_duel_battle_alternates_first_mover_and_stops_on_faint():
+    """Side 0 acts first on odd turns, side 1 on even turns; a KO ends the duel."""
+    a = Monster("Flareon", "Fire", 100, [Move("Ember", 10, 10, "Fire")])
+    b = Monster("Aquadrake", "Water", 100, [Move("Splash", 1, 10, "Water")])
+    duel = DuelBattle(a, b, rng=GameRNG(0), crit_chance=0.0)
+    assert [e["side"] for e in duel.resolve(0, 0)] == [0, 1]
+    assert [e["side"] for e in duel.resolve(0, 0)] == [1, 0]
+    b.current_hp = 1
+    events = duel.resolve(0, 99)  # out-of-range index becomes Struggle
+    assert events[-1] == {"type": "faint", "side": 1} and duel.over and duel.winner == 0
+    assert duel.resolve(0, 0) == []
+
+
+def test_duel_load_test_finishes_every_battle(tmp_path):
+    """Bots multiplexed over a few connections all receive a win or loss."""
+    stats = asyncio.run(run_load_test(6, connections=2, path=str(tmp_path / "duel.sock")))
+    assert stats["outcomes"].get(WIN, 0) + stats["outcomes"].get(LOSS, 0) == 12
+    assert stats["turns"] > 0 and stats["p99_ms"] >= stats["p50_ms"]
+
+
+def test_duel_server_picks_random_move_after_turn_timeout(tmp_path):
+    """A player who never answers still gets a result once turns time out."""
+    async def scenario():
+        fire = Monster("Flareon", "Fire", 20, [Move("Ember", 10, 40, "Fire")])
+        server = DuelServer(SpeciesRegistry([fire]), turn_timeout=0.01, seed=3)
+        path = str(tmp_path / "idle.sock")
+        listener = await server.start_unix(path)
+        reader, writer = await asyncio.open_unix_connection(path)
+        for pid in (0, 1):
+            writer.write((json.dumps({"op": "join", "pid": pid, "species": "Flareon"}) + "\n").encode())
+        results = {}
+        while len(results) < 2:
+            msg = json.loads(await asyncio.wait_for(reader.readline(), 5))
+            if msg["event"] == "result":
+                results[msg["pid"]] = msg["outcome"]
+        writer.close()
+        await server.close()
+        listener.close()
+        return results
+    assert sorted(asyncio.run(scenario()).values()) == [LOSS, WIN]
+
+
+def test_duel_server_rejects_unhashable_pid_and_species(tmp_path):
+    """Bad pid or species values get an error reply and the connection stays open."""
+    async def scenario():
+        fire = Monster("Flareon", "Fire", 20, [Move("Ember", 10, 40, "Fire")])
+        server = DuelServer(SpeciesRegistry([fire]), seed=3)
+        path = str(tmp_path / "bad.sock")
+        listener = await server.start_unix(path)
+        reader, writer = await asyncio.open_unix_connection(path)
+        replies = []
+        for msg in ({"op": "move", "pid": [1], "turn": 1, "index": 0},
+                    {"op": "join", "pid": {"a": 1}, "species": "Flareon"},
+                    {"op": "join", "pid": 0, "species": ["Flareon"]}):
+            writer.write((json.dumps(msg) + "\n").encode())
+            replies.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+        writer.close()
+        await server.close()
+        listener.close()
+        return replies
+    replies = asyncio.run(scenario())
+    assert [r["event"] for r in replies] == ["error"] * 3
+    assert "pid" in replies[0]["message"] and "species" in replies[2]["message"]
+
+
+def test_duel_server_seats_each_pid_once_per_connection(tmp_path):
+    """A second join with a seated pid is rejected instead of replacing the first seat."""
+    async def scenario():
+        fire = Monster("Flareon", "Fire", 20, [Move("Ember", 10, 40, "Fire")])
+        server = DuelServer(SpeciesRegistry([fire]), seed=3)
+        path = str(tmp_path / "dup.sock")
+        listener = await server.start_unix(path)
+        reader, writer = await asyncio.open_unix_connection(path)
+        for pid in (7, 7):
+            writer.write((json.dumps({"op": "join", "pid": pid, "species": "Flareon"}) + "\n").encode())
+        reply = json.loads(await asyncio.wait_for(reader.readline(), 5))
+        writer.close()
+        await server.close()
+        listener.close()
+        return reply
+    reply = asyncio.run(scenario())
+    assert reply["event"] == "error" and reply["pid"] == 7 and "already joined" in reply["message"]
+
+
+def test_duel_server_forfeits_disconnected_player(tmp_path):
+    """Closing a connection mid-duel ends it at once as a win for the opponent."""
+    async def scenario():
+        fire = Monster("Flareon", "Fire", 200, [Move("Ember", 1, 40, "Fire")])
+        server = DuelServer(SpeciesRegistry([fire]), turn_timeout=30.0, seed=3)
+        path = str(tmp_path / "drop.sock")
+        listener = await server.start_unix(path)
+        clients = [await asyncio.open_unix_connection(path) for _ in range(2)]
+        for pid, (reader, writer) in enumerate(clients):
+            writer.write((json.dumps({"op": "join", "pid": pid, "species": "Flareon"}) + "\n").encode())
+        reader, writer = clients[1]
+        while json.loads(await asyncio.wait_for(reader.readline(), 5))["event"] != "turn":
+            pass
+        clients[0][1].close()
+        result = json.loads(await asyncio.wait_for(reader.readline(), 5))
+        writer.close()
+        await server.close()
+        listener.close()
+        return result, server.battles_finished
+    result, finished = asyncio.run(scenario())
+    assert result["event"] == "result" and result["outcome"] == WIN and finished == 1
+    assert result["events"] == [{"type": "forfeit", "side": 0}]
+
+
+# --- Battle log tests ---
+import io
+
+from battle import ITEM, RUN
+from battle_log import (BattleLogWriter, BattleLogError, ReplayMismatch, encode_varints,
+                        iter_records, read_varint, read_varints, replay, verify_log)
+
+
+def test_varints_round_trip():
+    """Bulk and single varint decoding agree with the encoder."""
+    values = [0, 1, 127, 128, 300, 2 ** 32, 2 ** 64 - 1, 5]
+    data = encode_varints(values)
+    assert read_varints(data) == values
+    assert read_varint(data, 0) == (0, 1) and len(encode_varints([1, 2, 3])) == 3
+    with pytest.raises(BattleLogError):
+        read_varints(data[:-2])
+
+
+def test_battle_log_replays_items_runs_and_attacks(tmp_path):
+    """Every recorded encounter replays through BattleEngine with matching outcomes."""
+    path = tmp_path / "battles.log"
+    rng = GameRNG(11)
+    actions = [(ITEM, 1, 0), (ITEM, 0), (RUN,), ("dance",)]
+    with BattleLogWriter(str(path)) as log:
+        for i in range(30):
+            player = Player("Ash")
+            mon = Monster("Flareon", "Fire", 60, [Move("Flame Burst", 10, 10, "Fire")])
+            player.add_monster(mon)
+            wild = Monster("Aquadrake", "Water", 55, [Move("Aqua Jet", 9, 3, "Water")])
+            engine = BattleEngine(mon, wild, player=player, rng=rng.split())
+            log.record(engine).run(
+                lambda e, i=i: actions[i % 4] if e.turn == 1 else random_attack_policy(e))
+    report = verify_log(str(path))
+    assert report["battles"] == 30 and report["mismatches"] == []
+    record = next(iter_records(str(path)))
+    turns = replay(record)["turns"]
+    # A turn costs a handful of bytes once the starting state is stored
+    assert (len(record) - 150) / turns < 12
+
+
+def test_battle_log_detects_tampering():
+    """Changing a logged HP value makes the replay fail; bad headers are rejected."""
+    buf = io.BytesIO()
+    fire = Monster("Flareon", "Fire", 60, [Move("Flame Burst", 10, 10, "Fire")])
+    grass = Monster("Leafy", "Grass", 50, [Move("Leaf", 5, 10, "Grass")])
+    log = BattleLogWriter(buf)
+    log.record(BattleEngine(fire, grass, rng=GameRNG(4))).run(random_attack_policy)
+    record = bytearray(next(iter_records(io.BytesIO(buf.getvalue()))))
+    record[-2] ^= 1  # wild HP after the last turn
+    with pytest.raises(ReplayMismatch):
+        replay(bytes(record))
+    with pytest.raises(BattleLogError):
+        list(iter_records(io.BytesIO(b"NOPE\x01")))
+    # An unknown type name is a bad record, not a crash
+    report = verify_log(io.BytesIO(buf.getvalue().replace(b"Grass", b"Gxass")))
+    assert report["battles"] == 1 and "Gxass" in report["mismatches"][0][1]
+
+
+# --- Event bus tests ---
+from events import EventBus, JsonLinesSink, NullSink, TerminalRenderer, format_event
+
+
+class _CountingStream(io.StringIO):
+    """StringIO that counts write calls."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+
+def test_terminal_renderer_writes_each_turn_once(monkeypatch):
+    """battle_encounter publishes events and the renderer makes one write per turn."""
+    import main
+    monkeypatch.setattr("builtins.input", lambda prompt="": "1")
+    stream = _CountingStream()
+    player = Player("Ash")
+    fire = Monster("Flareon", "Fire", 60, [Move("Flame Burst", 10, 30, "Fire")])
+    player.add_monster(fire)
+    grass = Monster("Leafy", "Grass", 40, [Move("Leaf", 5, 30, "Grass")])
+    main.battle_encounter(player, fire, grass, GameRNG(8), bus=EventBus([TerminalRenderer(stream)]))
+    text = stream.getvalue()
+    assert text.startswith("\nA wild Leafy appeared!") and "The wild Leafy fainted!" in text
+    assert stream.writes == text.count("--- Turn ") + 1
+
+
+def test_main_closes_log_sinks_on_any_exit(tmp_path, monkeypatch, capsys):
+    """The logs are closed and the instrumentation report printed even when input ends mid-game."""
+    import main
+    opened = []
+
+    def tracked(cls):
+        def open_sink(path):
+            opened.append(cls(path))
+            return opened[-1]
+        return open_sink
+
+    monkeypatch.setattr(main, "BattleLogWriter", tracked(BattleLogWriter))
+    monkeypatch.setattr(main, "JsonLinesSink", tracked(JsonLinesSink))
+    monkeypatch.setenv("MTG_BATTLE_LOG", str(tmp_path / "battles.log"))
+    monkeypatch.setenv("MTG_EVENT_LOG", str(tmp_path / "events.jsonl"))
+    monkeypatch.setenv("MTG_INSTRUMENT", "1")
+    answers = iter(["Ash"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    try:
+        with pytest.raises(StopIteration):
+            main.main()
+    finally:
+        instrumentation.disable()
+    assert len(opened) == 2 and all(sink._file.closed for sink in opened)
+    assert "Counters:" in capsys.readouterr().out
+
+
+def test_json_lines_sink_and_null_sink():
+    """JSON-lines output round-trips; a bus with only NullSinks is disabled."""
+    out = io.StringIO()
+    sink = JsonLinesSink(out)
+    bus = EventBus([sink, NullSink()])
+    bus.publish_many([{"type": "run", "success": False}, {"type": "encounter", "monster": "X"}])
+    assert out.getvalue() == ""
+    bus.flush()
+    assert [json.loads(line)["type"] for line in out.getvalue().splitlines()] == ["run", "encounter"]
+    assert not EventBus([NullSink()]).enabled
+    assert format_event({"type": "run", "success": True}) == ["You successfully ran away!"]
+
+
+# --- Inventory tests ---
+from inventory import Inventory
+
+
+def test_add_item_merges_by_normalized_name_and_kind():
+    """Same name in any case and same kind merges; a different kind stays separate."""
+    p = Player("Merchant")
+    p.add_item(Item("health potion", heal=30, quantity=3))
+    p.add_item(Item("Health Potion", restore_pp=5))
+    assert isinstance(p.inventory, Inventory) and len(p.inventory) == 4
+    assert p.inventory[1].quantity == 5 and p.inventory[3].get_kind() == "PP Restore"
+    assert p.find_item_by_name("HEALTH POTION") == 1
+    assert p.inventory.find("health potion", "PP Restore") is p.inventory[3]
+
+
+def test_inventory_indices_stay_consistent_after_removals():
+    """Index access and name lookups match a plain list through many removals."""
+    items = [Item(f"Item {i}", heal=1) for i in range(200)]
+    inv, ref = Inventory(items), list(items)
+    for i in (0, 57, -1, 10, 10, 120, 3) + tuple(range(60)):
+        i %= len(ref)
+        assert inv.pop(i) is ref.pop(i)
+        assert inv.index_of(ref[-1].name) == len(ref) - 1
+        assert inv[len(ref) // 2] is ref[len(ref) // 2]
+    assert inv == ref and inv.index_of("item 0") == -1
+    last = ref[-1]
+    assert inv.remove_named(last.name.upper()) is last and last not in inv
+
+
+def test_player_inventory_assignment_wraps_lists():
+    """Assigning a plain list still gives an indexed Inventory."""
+    p = Player("Loader")
+    p.inventory = [Item("Ball", is_capture=True), Item("Potion", heal=5)]
+    assert p.find_item_by_name("potion") == 1 and p.remove_item_by_index(0)
+    assert p.find_item_by_name("Potion") == 0 and len(p.inventory) == 1
+
+
+# --- Team aggregate tests ---
+from main import create_default_moves, create_monsters
+from team import Team
+
+
+def test_team_aggregates_stay_consistent_under_random_mutations():
+    """Running aggregates match a full recomputation after every mutation."""
+    r = random.Random(7)
+    protos = create_monsters(create_default_moves())
+    p = Player("Mod")
+    for _ in range(40):
+        p.add_monster(r.choice(protos).spawn())
+    for _ in range(2000):
+        op = r.random()
+        mon = r.choice(p.team) if p.team else None
+        if op < 0.3 and mon:
+            mon.take_damage(r.randrange(0, 40))
+        elif op < 0.45 and mon:
+            mon.heal(r.randrange(1, 30))
+        elif op < 0.5 and mon:
+            mon.level_up(r.randrange(1, 3))
+        elif op < 0.55 and mon:
+            mon.reset_stats()
+        elif op < 0.6 and mon:
+            mon.type = r.choice(["Fire", "Water", "Grass"])
+        elif op < 0.7 and mon:
+            p.remove_monster_by_index(r.randrange(len(p.team)))
+        elif op < 0.75 and mon:
+            p.team[r.randrange(len(p.team))] = r.choice(protos).spawn()
+        elif op < 0.8 and len(p.team) > 3:
+            del p.team[1:3]
+        else:
+            p.add_monster_deepcopy(r.choice(protos))
+        assert p.team.consistency_errors() == []
+        assert p.total_team_health() == sum(m.current_hp for m in p.team)
+        assert p.has_usable_monsters() == any(not m.is_fainted() for m in p.team)
+    counts = {}
+    for m in p.team:
+        counts[m.type] = counts.get(m.type, 0) + 1
+    assert p.team.type_counts() == counts and p.team.count_type("Fire") == counts.get("Fire", 0)
+
+
+def test_team_membership_can_be_shared_and_copies_are_unlinked():
+    """A monster may sit on several teams; deepcopies and pickles carry no team links."""
+    import copy
+    import pickle
+    mon = Monster("Solo", "Normal", 30, [Move("T", 5, 10)])
+    a, b = Player("A"), Player("B")
+    a.add_monster(mon)
+    b.add_monster(mon)
+    a.add_monster(copy.deepcopy(a.team[0]))
+    b.add_monster(pickle.loads(pickle.dumps(mon)))
+    assert a.total_team_health() == b.total_team_health() == 60
+    mon.current_hp = 10  # direct writes reach every team
+    assert a.total_team_health() == b.total_team_health() == 40
+    mon.max_hp = 50
+    assert a.team.total_max_hp == b.team.total_max_hp == 80
+    a.team = [m for m in a.team]
+    assert a.team.consistency_errors() == [] and b.team.consistency_errors() == []
+    a.remove_monster_by_index(0)
+    mon.take_damage(30)
+    assert a.total_team_health() == 30 and b.total_team_health() == 30
+    assert Team([mon]).alive_count == 0 and b.team.alive_count == 1 and mon not in a.team
+
+
+
+@pytest.mark.parametrize("duplicate", [copy.deepcopy, lambda p: pickle.loads(pickle.dumps(p))],
+                         ids=["deepcopy", "pickle"])
+def test_copied_player_team_is_linked_to_its_members(duplicate):
+    """A copied Player's team tracks its own (copied) members when they faint."""
+    p = Player("Ash")
+    p.add_monster(Monster("Flareon", "Fire", 60, [Move("Ember", 10, 5, "Fire")]))
+    q = duplicate(p)
+    assert q.team.consistency_errors() == [] and q.has_usable_monsters()
+    q.team[0].current_hp = 0
+    assert not q.has_usable_monsters() and q.total_team_health() == 0
+    assert q.team.consistency_errors() == []
+    assert p.has_usable_monsters() and p.total_team_health() == 60
+
+# --- Summary cache tests ---
+
+def test_summaries_are_cached_until_state_changes(monkeypatch):
+    """Summary strings are reused until HP, PP, level or quantity change."""
+    mon = Monster("Cachy", "Water", 40, [Move("Splash", 8, 5), Move("Tackle", 6, 10)])
+    first = mon.get_summary()
+    assert mon.get_summary() is first
+    mon.take_damage(5)
+    hurt = mon.get_summary()
+    assert hurt is not first and "HP:35/40" in hurt
+    mon.moves[0].current_pp = 2  # direct writes are noticed too
+    assert "PP:2/5" in mon.get_summary() and "PP:2/5" in mon.moves[0].get_move_summary()
+    mon.level_up()
+    assert "Lvl 2" in mon.get_summary()
+    mon.moves[1].get_move_summary()  # a fresh move summary does not revive the stale one
+    mon.moves[1].use_move()
+    assert "PP:9/10" in mon.get_summary()
+    mon.add_move(Move("Surf", 12, 5, "Water"))
+    assert "Surf" in mon.get_summary()
+    mon.remove_move_by_name("Surf")
+    assert "Surf" not in mon.get_summary()
+    cached = mon.get_summary()
+    monkeypatch.setattr(Move, "get_move_summary", None)  # a clean cache hit builds nothing
+    assert mon.get_summary() is cached
+    monkeypatch.undo()
+    store = MonsterStore()
+    store.extend([mon.clone()])
+    view = store[0]
+    view.get_summary()
+    store.heal_all()
+    assert "HP:44/44" in view.get_summary() and "PP:5/5" in view.get_summary()
+    potion = Item("Health Potion", heal=30, quantity=2)
+    text = potion.get_item_summary()
+    assert potion.get_item_summary() is text
+    potion.quantity = 5
+    assert potion.get_item_summary().startswith("5x ")
+
+
+def test_player_change_diffs_report_only_changed_entries():
+    """team_changes()/inventory_changes() return just what changed since the last call."""
+    p = Player("Diff")
+    for name in ("A", "B", "C"):
+        p.add_monster(Monster(name, "Fire", 30, [Move("Ember", 7, 10)]))
+    assert sorted(p.team_changes()) == [0, 1, 2]
+    assert p.team_changes() == {}
+    p.team[1].take_damage(10)
+    assert p.team_changes() == {1: p.team[1].get_summary()}
+    p.remove_monster_by_index(2)
+    assert p.team_changes() == {2: None}
+    assert len(p.inventory_changes()) == 3
+    p.use_item_on_monster(1, 0)
+    changes = p.inventory_changes()
+    assert list(changes) == [1] and changes[1].startswith("1x Health Potion")
+
+
+# --- Catalog tests ---
+
+import os
+import shutil
+
+from catalog import Catalog, CatalogError, DATA_DIR, SNAPSHOT_NAME, load_catalog
+from monster import STRUGGLE
+from move import TYPE_CHART, TYPE_IDS
+
+
+def test_default_catalog_matches_builtin_content_and_is_lazy():
+    """The shipped data files reproduce the built-in roster; species materialize on spawn."""
+    catalog = load_catalog(DATA_DIR)
+    assert catalog.chart == TYPE_CHART
+    assert catalog.names() == ["Flareon", "Aquarion", "Terrax", "Voltaris"]
+    protos = create_monsters(create_default_moves())
+    assert [(m.name, m.type, m.max_hp, [mv.name for mv in m.moves]) for m in protos][0] == \
+        ("Flareon", "Fire", 60, ["Flame Burst", "Blaze Kick", "Tackle"])
+    fresh = Catalog.load(DATA_DIR)
+    reg = fresh.registry()
+    assert fresh.materialized() == 0 and len(reg) == 4 and "Terrax" in reg
+    rock = reg.spawn("Terrax")
+    assert fresh.materialized() == 1 and rock.max_hp == 80 and rock.moves[0].name == "Rock Smash"
+    assert reg.spawn_random(random.Random(1)).name in reg.names()
+
+
+def test_catalog_snapshot_is_reused_until_sources_change(tmp_path):
+    """A valid snapshot replaces parsing; edited sources or a corrupt snapshot force a rebuild."""
+    for fname in ("types.json", "moves.json", "species.json"):
+        shutil.copy(os.path.join(DATA_DIR, fname), tmp_path / fname)
+    assert Catalog.load(str(tmp_path)).source == "sources"
+    assert Catalog.load(str(tmp_path)).source == "snapshot"
+    species = json.loads((tmp_path / "species.json").read_text())
+    species.append({"name": "Sproutle", "type": "Grass", "base_hp": 45, "moves": ["Tackle"]})
+    (tmp_path / "species.json").write_text(json.dumps(species))
+    cat = Catalog.load(str(tmp_path))
+    assert cat.source == "sources" and cat.prototype("Sproutle").type == "Grass"
+    assert Catalog.load(str(tmp_path)).source == "snapshot"
+    (tmp_path / SNAPSHOT_NAME).write_bytes(b"MTGC\x01garbage")
+    assert Catalog.load(str(tmp_path)).names()[-1] == "Sproutle"
+
+
+def test_catalog_rejects_invalid_sources(tmp_path):
+    """Validation reports unknown moves/types and bad numbers."""
+    for fname in ("types.json", "moves.json"):
+        shutil.copy(os.path.join(DATA_DIR, fname), tmp_path / fname)
+    (tmp_path / "species.json").write_text(json.dumps([
+        {"name": "Glitch", "type": "Shadow", "base_hp": 0, "moves": ["Nope"]}]))
+    with pytest.raises(CatalogError) as err:
+        Catalog.load(str(tmp_path))
+    message = str(err.value)
+    assert "'Shadow'" in message and "base_hp" in message and "'Nope'" in message
+    assert not (tmp_path / SNAPSHOT_NAME).exists()
+
+
+def test_catalog_with_reordered_chart_keeps_type_ids(tmp_path):
+    """A chart in another order with an extra type appends IDs; existing moves keep their type."""
+    import catalog as catalog_mod
+    flame, struggle_type = Move("Flame", 10, 5, "Fire"), STRUGGLE.type
+    ids = dict(TYPE_IDS)
+    chart = dict(reversed(list(TYPE_CHART.items())))
+    chart["Psychic"] = {"Normal": 2.0}
+    for fname in ("moves.json", "species.json"):
+        shutil.copy(os.path.join(DATA_DIR, fname), tmp_path / fname)
+    (tmp_path / "types.json").write_text(json.dumps(chart))
+    try:
+        Catalog.load(str(tmp_path))
+        assert {name: TYPE_IDS[name] for name in ids} == ids and "Psychic" in TYPE_IDS
+        assert flame.type == "Fire" and flame.get_multiplier("Grass") == 2.0
+        assert STRUGGLE.type == struggle_type
+        assert Move("Mind", 5, 5, "Psychic").get_multiplier("Normal") == 2.0
+    finally:
+        catalog_mod._apply_type_chart(TYPE_CHART)
+    assert flame.get_multiplier("Grass") == 2.0 and TYPE_MATRIX[TYPE_IDS["Psychic"]][type_id("Normal")] == 1.0
+
+
+# --- Spawn table tests ---
+
+from monster_store import MonsterStore
+from spawn_table import DEFAULT_ZONE, SpawnEntry, SpawnTable, build_alias_table, load_spawn_tables
+
+
+def _spawn_registry():
+    return SpeciesRegistry([
+        Monster("Common", "Normal", 40, [Move("Tackle", 8, 25)]),
+        Monster("Rare", "Fire", 50, [Move("Ember", 10, 10, "Fire"), Move("Tackle", 8, 25)]),
+    ])
+
+
+def test_alias_sampling_follows_weights_and_level_bands():
+    """Frequencies match weights; levels stay in band with level_up-equivalent HP."""
+    prob, alias = build_alias_table([9, 1])
+    assert prob[1] == pytest.approx(0.2) and alias[1] == 0
+    table = SpawnTable([SpawnEntry("Common", 9, 1, 1), SpawnEntry("Rare", 1, 3, 5)], _spawn_registry())
+    indices, levels = table.sample_many(20_000, GameRNG(5))
+    assert sum(indices) / len(indices) == pytest.approx(0.1, abs=0.01)
+    assert {lvl for i, lvl in zip(indices, levels) if i == 1} == {3, 4, 5}
+    assert table.sample_many(50, GameRNG(5)) == table.sample_many(50, GameRNG(5))
+    rare = next(m for m in table.spawn_many(200, random.Random(2)) if m.name == "Rare")
+    ref = _spawn_registry().spawn("Rare")
+    ref.level_up(rare.level - 1)
+    assert (rare.max_hp, rare.current_hp) == (ref.max_hp, ref.max_hp)
+    with pytest.raises(ValueError):
+        SpawnTable([SpawnEntry("Common", 0)], _spawn_registry())
+    with pytest.raises(ValueError):
+        SpawnTable([SpawnEntry("Missing")], _spawn_registry())
+
+
+def test_spawn_many_into_store_matches_object_spawns():
+    """Column spawns equal what spawn_many would build as Monster objects."""
+    table = SpawnTable([SpawnEntry("Common", 1, 2, 4), SpawnEntry("Rare", 1, 1, 2)], _spawn_registry())
+    mons = table.spawn_many(300, GameRNG(8))
+    store = MonsterStore()
+    assert table.spawn_many(300, GameRNG(8), store=store) == []
+    assert len(store) == 300
+    assert [m.get_summary() for m in mons] == [v.get_summary() for v in store]
+
+
+def test_default_zones_load_and_vectorized_sampling():
+    """zones.json defines the default zone; sample_arrays agrees with the weights."""
+    reg = load_catalog(DATA_DIR).registry()
+    zones = load_spawn_tables(reg, DATA_DIR)
+    meadow = zones[DEFAULT_ZONE]
+    assert sum(meadow.probabilities().values()) == pytest.approx(1.0)
+    assert meadow.spawn(GameRNG(1)).name in reg
+    assert load_spawn_tables(reg, os.path.join(DATA_DIR, "missing.json")) == {}
+    np = pytest.importorskip("numpy")
+    indices, levels = meadow.sample_arrays(50_000, GameRNG(3))
+    shares = np.bincount(indices, minlength=len(meadow)) / 50_000
+    assert shares == pytest.approx([e.weight / 100 for e in meadow.entries], abs=0.01)
+    assert all(meadow.entries[i].min_level <= lvl <= meadow.entries[i].max_level
+               for i, lvl in zip(indices[:500].tolist(), levels[:500].tolist()))
+
+
+# --- Leveling tests ---
+
+import leveling
+from monster import hp_after_levels
+from pc_box import PCBox
+
+
+def _iterative_max_hp(hp, levels):
+    """The original per-level loop of Monster.level_up."""
+    for _ in range(levels):
+        hp = max(1, int(hp * 1.10))
+    return hp
+
+
+def test_hp_tables_match_iterative_level_up_bit_for_bit():
+    """Table lookups, level_up and bulk APIs equal the per-level loop exactly."""
+    for hp in range(1, 2001):
+        assert hp_after_levels(hp, 99) == _iterative_max_hp(hp, 99)
+        assert hp_after_levels(hp, 37) == _iterative_max_hp(hp, 37)
+    grower = Monster("Grower", "Grass", 47, [Move("Vine", 6, 10, "Grass")])
+    leveling.set_level(grower, 100)
+    assert (grower.level, grower.max_hp) == (100, _iterative_max_hp(47, 99))
+    r = random.Random(11)
+    mons = [Monster(f"M{i}", "Fire", r.randint(1, 300), [Move("T", 5, 10)]) for i in range(300)]
+    amounts = [r.randint(0, 99) for _ in mons]
+    expected = [(m.level + a, _iterative_max_hp(m.max_hp, a)) for m, a in zip(mons, amounts)]
+    store = MonsterStore()
+    store.extend(mons)
+    store.level_up(40)
+    assert [v.max_hp for v in store] == [_iterative_max_hp(m.max_hp, 40) for m in mons]
+    leveling.set_levels(mons, [m.level + a for m, a in zip(mons, amounts)])
+    assert [(m.level, m.max_hp) for m in mons] == expected
+
+
+def test_experience_levels_monsters_and_keeps_team_in_sync():
+    """XP totals map onto the cubic curve; leveling updates Team aggregates."""
+    assert leveling.xp_for_level(10) == 1000 and leveling.level_for_xp(999) == 9
+    assert leveling.level_for_xp(10 ** 9) == leveling.MAX_LEVEL
+    p = Player("XP")
+    for hp in (30, 45):
+        p.add_monster(Monster(f"Mon{hp}", "Water", hp, [Move("Splash", 5, 10, "Water")]))
+    xps = leveling.add_experience_many(p.team, [0, 0], leveling.xp_for_level(5))
+    assert xps == [125, 125] and [m.level for m in p.team] == [5, 5]
+    assert p.team[1].max_hp == _iterative_max_hp(45, 4)
+    assert p.team.consistency_errors() == []
+    assert leveling.add_experience(p.team[0], xps[0], 0) == 125 and p.team[0].level == 5
+    assert leveling.xp_reward(p.team[1]) == 45 * 5 // 7
+
+
+def test_level_up_box_updates_records_in_place(tmp_path):
+    """PC box records level up without being materialized."""
+    with PCBox(tmp_path / "box.dat") as box:
+        for hp in (10, 55, 200):
+            box.deposit(Monster("Boxed", "Rock", hp, [Move("Rock Smash", 12, 8, "Rock")]))
+        leveling.level_up_box(box, 25, indices=[0, 2])
+        assert [box.level(i) for i in range(3)] == [26, 1, 26]
+        assert [box.hp(i)[1] for i in range(3)] == [_iterative_max_hp(10, 25), 55, _iterative_max_hp(200, 25)]
+
+
+# --- Healing tests ---
+
+import sys
+
+from healing import heal_all, heal_monsters, heal_player
+
+
+def _hurt(mon, hp=1):
+    mon.current_hp = hp
+    for mv in mon.moves:
+        mv.current_pp = 0
+    return mon
+
+
+def test_heal_monsters_restores_team_and_keeps_aggregates(tmp_path):
+    """Team healing keeps Team totals exact; heal_player also heals the box."""
+    p = Player("Healer")
+    for hp in (20, 35, 50):
+        p.add_monster(Monster(f"H{hp}", "Grass", hp, [Move("Leaf", 6, 10, "Grass"), Move("T", 5, 30)]))
+    p.team[0].take_damage(20)
+    p.team[1].take_damage(10)
+    p.team[2].moves[1].use_move()
+    assert heal_monsters(p.team) == 3
+    assert p.team.consistency_errors() == [] and p.total_team_health() == 105
+    assert all(mv.current_pp == mv.max_pp for m in p.team for mv in m.moves)
+    p.box = PCBox(tmp_path / "center.dat")
+    p.box.deposit(_hurt(p.team[0].clone()))
+    assert heal_player(p) == 4 and p.box.hp(0) == (20, 20)
+    assert p.box.materialize(0).moves[0].current_pp == 10
+    p.box.close()
+
+
+@pytest.mark.parametrize("numpy_available", [True, False])
+def test_store_heal_all_matches_reset_stats(monkeypatch, numpy_available):
+    """Column healing equals per-monster reset_stats, with and without NumPy."""
+    if numpy_available:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setitem(sys.modules, "numpy", None)
+    protos = [Monster("One", "Fire", 30, [Move("Ember", 7, 10, "Fire")]),
+              Monster("Three", "Water", 44, [Move("A", 5, 5), Move("B", 6, 7), Move("C", 7, 9)])]
+    mons = [_hurt(protos[i % 2].spawn(), hp=i % 5) for i in range(50)]
+    store = MonsterStore()
+    store.extend(mons)
+    assert heal_all(store) == 50
+    for m in mons:
+        m.reset_stats()
+    assert [v.get_summary() for v in store] == [m.get_summary() for m in mons]
+
+
+# --- Team builder tests ---
+
+import itertools
+
+from team_builder import TeamBuilder, opponents_from_table, outcome_score, profile_of
+
+
+def _builder_box():
+    kinds = [("Fire", "Ember", "Fire"), ("Water", "Splash", "Water"), ("Grass", "Vine", "Grass"),
+             ("Electric", "Zap", "Electric"), ("Rock", "Smash", "Rock"), ("Normal", "Tackle", "Normal")]
+    r = random.Random(4)
+    return [Monster(f"{t}{i}", t, r.randint(20, 90), [Move(mv, r.randint(4, 14), 10, mt)])
+            for i in range(3) for t, mv, mt in kinds]
+
+
+def test_team_builder_matches_brute_force():
+    """Branch and bound finds the same coverage as trying every lineup."""
+    box = _builder_box()
+    opponents = [(Monster("F", "Fire", 60, [Move("Ember", 10, 10, "Fire")]), 3.0),
+                 (Monster("W", "Water", 55, [Move("Jet", 9, 10, "Water")]), 2.0),
+                 (Monster("R", "Rock", 80, [Move("Smash", 12, 8, "Rock")]), 1.0),
+                 (Monster("E", "Electric", 50, [Move("Zap", 10, 10, "Electric")]), 1.0)]
+    builder = TeamBuilder(box)
+    result = builder.best_team(opponents, size=3)
+    opp = [(profile_of(m), w / 7.0) for m, w in opponents]
+
+    def coverage(team):
+        return sum(w * max(outcome_score(profile_of(a), d) for a in team) for d, w in opp)
+
+    best = max(coverage(team) for team in itertools.combinations(box, 3))
+    assert len(result["team"]) == 3 and len(set(map(id, result["team"]))) == 3
+    assert result["value"] == pytest.approx(best) == pytest.approx(coverage(result["team"]))
+    assert builder.best_team(opponents, size=3)["value"] == result["value"]
+    capped = builder.best_team(opponents, size=3, max_nodes=1)
+    assert capped["value"] <= result["value"] + 1e-12 and len(capped["team"]) == 3
+    assert result["optimal"] and (capped["optimal"] or capped["nodes"] == 1)
+
+
+def test_outcome_score_and_zone_query_on_player_box(tmp_path):
+    """Type advantage drives s(a, d); players' boxes feed the builder and fill the team."""
+    fire = profile_of(Monster("F", "Fire", 50, [Move("Ember", 10, 10, "Fire")]))
+    grass = profile_of(Monster("G", "Grass", 50, [Move("Vine", 10, 10, "Grass")]))
+    assert outcome_score(fire, grass) > 0.5 > outcome_score(grass, fire)
+    assert outcome_score(fire, grass) + outcome_score(grass, fire) == pytest.approx(1.0)
+    reg = load_catalog(DATA_DIR).registry()
+    p = Player("Builder")
+    p.add_monster(reg.spawn("Flareon"))
+    p.box = PCBox(tmp_path / "builder.dat")
+    for name in ("Terrax", "Aquarion", "Voltaris", "Aquarion"):
+        p.box.deposit(reg.spawn(name))
+    zone = load_spawn_tables(reg, DATA_DIR)["quarry"]
+    result = TeamBuilder.for_player(p).best_team(opponents_from_table(zone))
+    assert sorted(m.name for m in result["team"]) == ["Aquarion", "Aquarion", "Flareon", "Terrax", "Voltaris"]
+    assert result["team"][result["counters"][0]].name == "Aquarion"  # Water counters the Rock-heavy zone
+    p.box.close()
+
+
+def test_main_starter_comes_from_the_catalog(tmp_path, monkeypatch, capsys):
+    """The starter is the catalog's first species; a catalog without species exits cleanly."""
+    import main
+    for fname in ("types.json", "moves.json"):
+        shutil.copy(os.path.join(DATA_DIR, fname), tmp_path / fname)
+    species = json.loads(open(os.path.join(DATA_DIR, "species.json")).read())
+    (tmp_path / "species.json").write_text(json.dumps([sp for sp in species if sp["name"] != "Flareon"]))
+    monkeypatch.setenv("MTG_CATALOG_DIR", str(tmp_path))
+    answers = iter(["Ash", "4"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    main.main()
+    assert "You received a starter: Aquarion." in capsys.readouterr().out
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    for fname in ("types.json", "moves.json"):
+        shutil.copy(tmp_path / fname, empty / fname)
+    (empty / "species.json").write_text("[]")
+    monkeypatch.setenv("MTG_CATALOG_DIR", str(empty))
+    with pytest.raises(SystemExit, match="no species"):
+        main.main()
@@ -0,0 +1,246 @@
+# tournament.py
+
+"""
+Round-robin tournament runner for species balancing.
+
+Every entry (a species prototype at a given level) plays every entry,
+trials times, using the headless battle rules with random_attack_policy
+on both sides. Work is split into shards of player rows that run on a
+ProcessPoolExecutor; each shard draws from its own GameRNG child stream
+keyed by shard index, so results depend only on the seed and shard size,
+not on the number of workers or completion order.
+
+Shards use BatchBattleSimulator when NumPy is available and loop
+BattleEngine otherwise. Partial results are streamed as shards finish.
+
+Usage:
+    python tournament.py [--trials N] [--levels 1-100] [--workers N] [--out FILE]
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import argparse
+import csv
+import os
+import sys
+import time
+
+from monster import Monster
+from battle import BattleEngine, WIN, LOSS, random_attack_policy
+from batch_sim import BatchBattleSimulator, DEFAULT_MAX_TURNS, np
+from rng import GameRNG
+
+# Roster shared by the shard functions of one process (set by _init_worker)
+_entries: List[Monster] = []
+
+
+def tournament_entries(prototypes: Iterable[Monster],
+                       levels: Iterable[int] = range(1, 101)) -> List[Monster]:
+    """
+    Build one entry per (species, level), leveled up from the prototype.
+
+    Args:
+        prototypes (Iterable[Monster]): Level-1 species prototypes.
+        levels (Iterable[int]): Levels to include for every species.
+
+    Returns:
+        List[Monster]: Entries in species-major, level-minor order.
+    """
+    levels = list(levels)
+    entries = []
+    for proto in prototypes:
+        for level in levels:
+            mon = proto.spawn()
+            mon.level_up(level - mon.level)
+            mon.reset_stats()
+            entries.append(mon)
+    return entries
+
+
+def entry_label(monster: Monster) -> str:
+    """Return the matrix label of an entry, e.g. 'Flareon L5'."""
+    return f"{monster.name} L{monster.level}"
+
+
+def _init_worker(entries: List[Monster]):
+    """Install the roster in a worker process."""
+    global _entries
+    _entries = entries
+
+
+def _run_shard(task: Tuple[int, int, int, int, int]) -> Dict:
+    """
+    Play rows [start, stop) of the tournament against every column.
+
+    Args:
+        task (Tuple): (start, stop, trials, seed, max_turns); seed is the
+            shard's child seed.
+
+    Returns:
+        Dict: Shard result (see iter_tournament).
+    """
+    start, stop, trials, seed, max_turns = task
+    entries = _entries
+    n = len(entries)
+    rng = GameRNG(seed)
+    wins: List[List[int]] = []
+    losses: List[List[int]] = []
+    if np is not None:
+        pairs = [(entries[i], entries[j]) for i in range(start, stop) for j in range(n)]
+        results = BatchBattleSimulator(pairs).run(trials, seed=rng, max_turns=max_turns)
+        for r in range(stop - start):
+            row = results[r * n:(r + 1) * n]
+            wins.append([res["wins"] for res in row])
+            losses.append([res["losses"] for res in row])
+    else:
+        for i in range(start, stop):
+            win_row, loss_row = [], []
+            for j in range(n):
+                player_mon, wild_mon = entries[i].spawn(), entries[j].spawn()
+                w = l = 0
+                for _ in range(trials):
+                    result = BattleEngine(player_mon, wild_mon, rng=rng).run(
+                        random_attack_policy, max_turns=max_turns)
+                    w += result == WIN
+                    l += result == LOSS
+                win_row.append(w)
+                loss_row.append(l)
+            wins.append(win_row)
+            losses.append(loss_row)
+    return {"rows": (start, stop), "wins": wins, "losses": losses}
+
+
+def iter_tournament(entries: Sequence[Monster], trials: int, seed: Optional[int] = None,
+                    workers: Optional[int] = None, rows_per_shard: Optional[int] = None,
+                    max_turns: int = DEFAULT_MAX_TURNS) -> Iterator[Dict]:
+    """
+    Run the tournament and yield shard results as they complete.
+
+    Args:
+        entries (Sequence[Monster]): Tournament entries (rows and columns).
+        trials (int): Encounters per ordered pair.
+        seed (int): Tournament seed; random if None.
+        workers (int): Worker processes (default os.cpu_count()); 1 runs
+            in the calling process.
+        rows_per_shard (int): Player rows per shard (default: about 256
+            shards in total).
+        max_turns (int): Turn cap; capped encounters count as timeouts.
+
+    Yields:
+        Dict: Shard result with keys:
+            - rows (Tuple[int, int]): [start, stop) row range
+            - wins, losses (List[List[int]]): counts per row and column
+    """
+    entries = list(entries)
+    n = len(entries)
+    if not n:
+        return
+    root = GameRNG(seed)
+    if rows_per_shard is None:
+        rows_per_shard = max(1, n // 256)
+    tasks = [(start, min(n, start + rows_per_shard), int(trials),
+              root.child(start // rows_per_shard).seed, max_turns)
+             for start in range(0, n, rows_per_shard)]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        _init_worker(entries)
+        for task in tasks:
+            yield _run_shard(task)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(entries,)) as pool:
+        futures = [pool.submit(_run_shard, task) for task in tasks]
+        for fut in as_completed(futures):
+            yield fut.result()
+
+
+def run_tournament(entries: Sequence[Monster], trials: int, seed: Optional[int] = None,
+                   workers: Optional[int] = None, rows_per_shard: Optional[int] = None,
+                   max_turns: int = DEFAULT_MAX_TURNS,
+                   on_shard: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """
+    Run a full round robin and assemble the win-rate matrix.
+
+    Args:
+        entries (Sequence[Monster]): Tournament entries.
+        trials (int): Encounters per ordered pair.
+        seed (int): Tournament seed.
+        workers (int): Worker processes (see iter_tournament).
+        rows_per_shard (int): Player rows per shard.
+        max_turns (int): Turn cap per encounter.
+        on_shard (Callable): Optional callback receiving each shard result.
+
+    Returns:
+        Dict: Tournament result with keys:
+            - labels (List[str]): entry labels, row/column order
+            - trials (int)
+            - wins, losses (List[List[int]]): row entry's wins/losses vs column
+            - win_rate (List[List[float]]): wins / trials
+    """
+    entries = list(entries)
+    n = len(entries)
+    wins = [[0] * n for _ in range(n)]
+    losses = [[0] * n for _ in range(n)]
+    for shard in iter_tournament(entries, trials, seed=seed, workers=workers,
+                                 rows_per_shard=rows_per_shard, max_turns=max_turns):
+        start, stop = shard["rows"]
+        wins[start:stop] = shard["wins"]
+        losses[start:stop] = shard["losses"]
+        if on_shard is not None:
+            on_shard(shard)
+    trials = int(trials)
+    return {
+        "labels": [entry_label(m) for m in entries],
+        "trials": trials,
+        "wins": wins,
+        "losses": losses,
+        "win_rate": [[w / max(1, trials) for w in row] for row in wins],
+    }
+
+
+def write_matrix_csv(result: Dict, path: str):
+    """Write the win-rate matrix of a tournament result as CSV."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([""] + result["labels"])
+        for label, row in zip(result["labels"], result["win_rate"]):
+            writer.writerow([label] + [f"{x:.4f}" for x in row])
+
+
+def _parse_levels(text: str) -> range:
+    lo, _, hi = text.partition("-")
+    return range(int(lo), int(hi or lo) + 1)
+
+
+def main():
+    """Run a tournament over main.create_monsters and write the matrix."""
+    from main import create_default_moves, create_monsters
+
+    parser = argparse.ArgumentParser(description="All-pairs species tournament")
+    parser.add_argument("--trials", type=int, default=100, help="encounters per ordered pair")
+    parser.add_argument("--levels", type=_parse_levels, default=range(1, 101), help="e.g. 1-100")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", default="win_rates.csv")
+    args = parser.parse_args()
+
+    entries = tournament_entries(create_monsters(create_default_moves()), args.levels)
+    total_rows = len(entries)
+    done = 0
+    start = time.perf_counter()
+
+    def progress(shard):
+        nonlocal done
+        done += shard["rows"][1] - shard["rows"][0]
+        rate = done * total_rows * args.trials / (time.perf_counter() - start)
+        print(f"\r{done}/{total_rows} rows, {rate:,.0f} encounters/s", end="", file=sys.stderr)
+
+    result = run_tournament(entries, args.trials, seed=args.seed, workers=args.workers,
+                            on_shard=progress)
+    print(file=sys.stderr)
+    write_matrix_csv(result, args.out)
+    print(f"Wrote {len(entries)}x{len(entries)} win-rate matrix to {args.out}")
+
+
+if __name__ == "__main__":
+    main()